@@ -19,13 +19,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from array import array
+from .csr_graph import CSRGraph
+
 def BFS(g, s, discovered):
   """Perform BFS of the undiscovered portion of Graph g starting at Vertex s.
 
   discovered is a dictionary mapping each vertex to the edge that was used to
   discover it during the BFS (s should be mapped to None prior to the call).
   Newly discovered vertices will be added to the dictionary as a result.
+
+  g may also be a CSRGraph snapshot, in which case s is a vertex id.
   """
+  if isinstance(g, CSRGraph):
+    return _BFS_csr(g, s, discovered)
   level = [s]                        # first level includes only s
   while len(level) > 0:
     next_level = []                  # prepare to gather newly found vertices
@@ -37,6 +44,20 @@ def BFS(g, s, discovered):
           next_level.append(v)       # v will be further considered in next pass
     level = next_level               # relabel 'next' level to become current
 
+def _BFS_csr(g, s, discovered):
+  """BFS over the arrays of CSRGraph g (same contract as BFS)."""
+  offsets, targets, _ = g.arrays()
+  level = [s]
+  while len(level) > 0:
+    next_level = []
+    for u in level:
+      for k in range(offsets[u], offsets[u+1]):
+        v = targets[k]
+        if v not in discovered:
+          discovered[v] = g.edge_at(u, k)  # edge objects only built for tree edges
+          next_level.append(v)
+    level = next_level
+
 def BFS_complete(g):
   """Perform BFS for entire graph and return forest as a dictionary.
 
@@ -49,3 +70,74 @@ def BFS_complete(g):
       forest[u] = None            # u will be a root of a tree
       BFS(g, u, forest)
   return forest
+
+def BFS_levels(g, sources, mode='auto', alpha=14, beta=24):
+  """Perform a direction-optimizing BFS of CSRGraph g from one or more sources.
+
+  sources is a vertex id or an iterable of vertex ids, all placed at level 0.
+  Return a pair (level, parent) of arrays indexed by vertex id: level[v] is
+  the number of edges on a shortest path from the nearest source to v, and
+  parent[v] the vertex that discovered v; both are -1 for unreached vertices
+  and parent is also -1 for the sources.
+
+  With mode 'auto' each level is expanded either top-down (frontier vertices
+  scan their outgoing edges) or bottom-up (unvisited vertices scan their
+  incoming edges for a parent in the frontier), switching to bottom-up when
+  the edges out of the frontier exceed 1/alpha of the edges into unvisited
+  vertices, and back to top-down when the frontier holds fewer than 1/beta
+  of the vertices. Modes 'top-down' and 'bottom-up' force a single strategy.
+  """
+  if not isinstance(g, CSRGraph):
+    raise TypeError('g must be a CSRGraph snapshot (see Graph.freeze)')
+  if mode not in ('auto', 'top-down', 'bottom-up'):
+    raise ValueError('mode must be auto, top-down or bottom-up')
+  if isinstance(sources, int):
+    sources = [sources]
+  n = g.vertex_count()
+  offsets, targets, _ = g.arrays()
+  in_offsets, in_sources, _ = g.arrays(outgoing=False)
+  level = array('q', [-1]) * n
+  parent = array('q', [-1]) * n
+  frontier = []
+  for s in sources:
+    g._validate_vertex(s)
+    if level[s] < 0:
+      level[s] = 0
+      frontier.append(s)
+
+  unexplored = len(in_sources)            # edges into vertices not yet visited
+  for s in frontier:
+    unexplored -= in_offsets[s+1] - in_offsets[s]
+  bottom_up = mode == 'bottom-up'
+  depth = 0
+  while len(frontier) > 0:
+    if mode == 'auto':
+      if not bottom_up:
+        scout = sum(offsets[u+1] - offsets[u] for u in frontier)
+        bottom_up = scout > unexplored / alpha
+      else:
+        bottom_up = len(frontier) >= n / beta
+    next_level = []
+    if bottom_up:
+      for v in range(n):
+        if level[v] < 0:
+          for k in range(in_offsets[v], in_offsets[v+1]):
+            u = in_sources[k]
+            if level[u] == depth:         # u is in the frontier
+              level[v] = depth + 1
+              parent[v] = u
+              next_level.append(v)
+              break                       # a single parent is enough
+    else:
+      for u in frontier:
+        for k in range(offsets[u], offsets[u+1]):
+          v = targets[k]
+          if level[v] < 0:
+            level[v] = depth + 1
+            parent[v] = u
+            next_level.append(v)
+    for v in next_level:
+      unexplored -= in_offsets[v+1] - in_offsets[v]
+    frontier = next_level
+    depth += 1
+  return level, parent
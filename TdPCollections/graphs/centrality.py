@@ -0,0 +1,362 @@
+import math
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from ..priority_queue.heap_priority_queue import HeapPriorityQueue
+from .csr_graph import CSRGraph
+
+try:
+  import numpy as np                   # optional: vectorized sparse matrix-vector products
+except ImportError:
+  np = None
+
+#------------------------- sparse matrix helpers -------------------------
+def _edge_arrays(csr, weighted):
+  """Return (sources, targets, weights) of every edge slot u->v of csr.
+
+  weights is None when the edges count as 1. The arrays are NumPy arrays
+  if NumPy is available and typed arrays otherwise.
+  """
+  offsets, targets, weights = csr.arrays()
+  if weighted and weights is None:
+    raise ValueError('graph must be weighted')
+  n = csr.vertex_count()
+  if np is not None:
+    counts = np.diff(np.frombuffer(offsets, dtype=np.int64))
+    sources = np.repeat(np.arange(n, dtype=np.int64), counts)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    if weighted:
+      weights = np.frombuffer(weights, dtype=csr.weight_type()).astype(np.float64)
+    return sources, targets, weights if weighted else None
+  sources = array('q')
+  for u in range(n):
+    sources.extend([u] * (offsets[u+1] - offsets[u]))
+  return sources, targets, weights if weighted else None
+
+def _propagate(edges, x, n):
+  """Return y with y[v] = sum of weight * x[u] over the edges u->v."""
+  sources, targets, weights = edges
+  if np is not None:
+    values = x[sources] if weights is None else x[sources] * weights
+    return np.bincount(targets, weights=values, minlength=n)
+  y = [0.0] * n
+  if weights is None:
+    for u, v in zip(sources, targets):
+      y[v] += x[u]
+  else:
+    for u, v, w in zip(sources, targets, weights):
+      y[v] += w * x[u]
+  return y
+
+def _out_strength(edges, n):
+  """Return the total weight (or number) of the outgoing edges of each vertex."""
+  sources, targets, weights = edges
+  if np is not None:
+    return np.bincount(sources, weights=weights, minlength=n).astype(np.float64)
+  s = [0.0] * n
+  for k, u in enumerate(sources):
+    s[u] += 1 if weights is None else weights[k]
+  return s
+
+def _vector(csr, g, values, default):
+  """Return a list of n floats from a dict or sequence of values (None: default for all)."""
+  n = csr.vertex_count()
+  if values is None:
+    return [default] * n
+  x = [0.0] * n
+  if isinstance(values, dict):
+    for v, value in values.items():
+      x[v if csr is g else csr.index(v)] = float(value)
+  else:
+    if len(values) != n:
+      raise ValueError('vector must have one entry per vertex')
+    x = [float(value) for value in values]
+  return x
+
+def _normalized(x, norm=1):
+  """Return x scaled to unit L1 (norm=1) or L2 (norm=2) length."""
+  if np is not None:
+    x = np.asarray(x, dtype=np.float64)
+    total = np.abs(x).sum() if norm == 1 else np.sqrt((x * x).sum())
+    if total == 0:
+      raise ValueError('vector must not be zero')
+    return x / total
+  total = sum(abs(a) for a in x) if norm == 1 else sum(a * a for a in x) ** 0.5
+  if total == 0:
+    raise ValueError('vector must not be zero')
+  return [a / total for a in x]
+
+def _result(csr, g, x):
+  """Return x as an array indexed by id for a CSRGraph, else as a dict keyed by vertex."""
+  scores = array('d', x.tolist() if np is not None else x)
+  if csr is g:
+    return scores
+  return {csr.vertex(i): scores[i] for i in range(len(scores))}
+
+#------------------------- public functions -------------------------
+def pagerank(g, damping=0.85, personalization=None, start=None, weighted=False,
+             tol=1e-8, max_iter=100, residuals=None):
+  """Return the PageRank score of each vertex of graph g by power iteration.
+
+  g may be a Graph (or a view) or a CSRGraph snapshot; an undirected edge
+  links both ways. Each iteration is one sparse matrix-vector product over
+  the CSR arrays, vectorized with NumPy when it is available. With damping
+  d, a random surfer follows an outgoing edge (chosen in proportion to its
+  weight if weighted is True) with probability d, and otherwise, or at a
+  vertex without outgoing edges, jumps to a vertex chosen according to
+  personalization (uniformly if None).
+
+  personalization and start (a warm-start vector, e.g. a previous result)
+  are dictionaries keyed by vertex, or sequences indexed by id for a
+  CSRGraph; both are normalized to sum 1. Iteration stops when the L1 change
+  of the scores falls below tol, or after max_iter iterations. If residuals
+  is a list, the L1 change of every iteration is appended to it, which also
+  shows whether the iteration converged.
+
+  The scores sum to 1. For a CSRGraph they are returned as an array indexed
+  by id; for a Graph, as a dictionary mapping each vertex to its score.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  n = csr.vertex_count()
+  if n == 0:
+    return _result(csr, g, np.zeros(0) if np is not None else [])
+  if not 0 <= damping < 1:
+    raise ValueError('damping must be in [0, 1)')
+  edges = _edge_arrays(csr, weighted)
+  teleport = _normalized(_vector(csr, g, personalization, 1.0))
+  x = _normalized(_vector(csr, g, start, 1.0))
+  strength = _out_strength(edges, n)
+  if np is not None:
+    dangling = strength == 0
+    inverse = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, strength))
+  else:
+    inverse = [1.0 / s if s > 0 else 0.0 for s in strength]
+    dangling = [u for u in range(n) if strength[u] == 0]
+
+  for _ in range(max_iter):
+    if np is not None:
+      y = damping * _propagate(edges, x * inverse, n)
+      jump = damping * x[dangling].sum() + (1 - damping)
+      y += jump * teleport
+      change = float(np.abs(y - x).sum())
+    else:
+      y = _propagate(edges, [a * b for a, b in zip(x, inverse)], n)
+      jump = damping * sum(x[u] for u in dangling) + (1 - damping)
+      y = [damping * a + jump * t for a, t in zip(y, teleport)]
+      change = sum(abs(a - b) for a, b in zip(y, x))
+    x = y
+    if residuals is not None:
+      residuals.append(change)
+    if change < tol:
+      break
+  return _result(csr, g, x)
+
+def personalized_pagerank(g, sources, **options):
+  """Return PageRank scores with every jump going back to the given source vertices.
+
+  sources is a vertex (an id for a CSRGraph) or an iterable of vertices, all
+  equally likely targets of a jump; options are passed to pagerank.
+  """
+  if not hasattr(sources, '__iter__'):
+    sources = [sources]
+  return pagerank(g, personalization={s: 1.0 for s in sources}, **options)
+
+def degree_centrality(g, outgoing=True):
+  """Return the degree of each vertex divided by n-1 (incoming degree if outgoing is False).
+
+  Results are returned as pagerank returns them.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  n = csr.vertex_count()
+  offsets = csr.arrays(outgoing)[0]
+  scale = 1.0 / (n - 1) if n > 1 else 1.0
+  scores = [(offsets[u+1] - offsets[u]) * scale for u in range(n)]
+  return _result(csr, g, np.array(scores) if np is not None else scores)
+
+def eigenvector_centrality(g, start=None, weighted=False, tol=1e-8, max_iter=100,
+                           residuals=None):
+  """Return the eigenvector centrality of each vertex of graph g by power iteration.
+
+  The score of a vertex is proportional to the sum of the scores of the
+  vertices with edges into it (weighted if weighted is True). Each step
+  computes x + A^T x, which has the same dominant eigenvector as A^T but
+  also converges on bipartite graphs, and scales the result to unit L2
+  norm. start, tol, max_iter and residuals act as in pagerank, with the
+  change measured in the L2 norm.
+
+  Results are returned as pagerank returns them.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  n = csr.vertex_count()
+  if n == 0:
+    return _result(csr, g, np.zeros(0) if np is not None else [])
+  edges = _edge_arrays(csr, weighted)
+  x = _normalized(_vector(csr, g, start, 1.0), 2)
+  for _ in range(max_iter):
+    if np is not None:
+      y = _normalized(x + _propagate(edges, x, n), 2)
+      change = float(np.sqrt(((y - x) ** 2).sum()))
+    else:
+      y = _normalized([a + b for a, b in zip(x, _propagate(edges, x, n))], 2)
+      change = sum((a - b) ** 2 for a, b in zip(y, x)) ** 0.5
+    x = y
+    if residuals is not None:
+      residuals.append(change)
+    if change < tol:
+      break
+  return _result(csr, g, x)
+
+#------------------------- betweenness worker side -------------------------
+_shared = None                 # (offsets, targets, weights) inherited by worker processes
+
+def _init_worker(offsets, targets, weights):
+  global _shared
+  _shared = (offsets, targets, weights)
+
+def _shortest_path_dag(offsets, targets, weights, s):
+  """Return (order, preds, sigma) of the shortest paths from s.
+
+  order lists the reached vertices by nondecreasing distance, preds[v] the
+  predecessors of v on shortest paths and sigma[v] their number. Levels are
+  found by BFS when weights is None and by Dijkstra's algorithm otherwise.
+  """
+  n = len(offsets) - 1
+  sigma = [0] * n
+  sigma[s] = 1
+  preds = {s: []}
+  order = []
+  if weights is None:
+    d = {s: 0}
+    level = [s]
+    while len(level) > 0:          # BFS, one level at a time
+      order.extend(level)
+      next_level = []
+      for u in level:
+        du = d[u] + 1
+        for k in range(offsets[u], offsets[u+1]):
+          v = targets[k]
+          if v not in d:
+            d[v] = du
+            preds[v] = []
+            next_level.append(v)
+          if d[v] == du:           # u precedes v on a shortest path
+            sigma[v] += sigma[u]
+            preds[v].append(u)
+      level = next_level
+    return order, preds, sigma
+  d = {s: 0}
+  settled = bytearray(n)
+  pq = HeapPriorityQueue()
+  pq.add(0, s)
+  while not pq.is_empty():         # Dijkstra with lazy deletion
+    key, u = pq.remove_min()
+    if settled[u]:
+      continue
+    settled[u] = 1
+    order.append(u)
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      wgt = key + weights[k]
+      if v not in d or wgt < d[v]:
+        d[v] = wgt
+        sigma[v] = sigma[u]
+        preds[v] = [u]
+        pq.add(wgt, v)
+      elif wgt == d[v] and not settled[v]:
+        sigma[v] += sigma[u]
+        preds[v].append(u)
+  return order, preds, sigma
+
+def _dependencies(offsets, targets, weights, sources):
+  """Return the sum over the given sources of the dependency of each vertex (Brandes)."""
+  total = array('d', [0.0]) * (len(offsets) - 1)
+  for s in sources:
+    order, preds, sigma = _shortest_path_dag(offsets, targets, weights, s)
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):      # accumulate from the farthest vertices back
+      coeff = (1 + delta[w]) / sigma[w]
+      for v in preds[w]:
+        delta[v] += sigma[v] * coeff
+      if w != s:
+        total[w] += delta[w]
+  return total
+
+def _dependencies_shared(sources):
+  offsets, targets, weights = _shared
+  return _dependencies(offsets, targets, weights, sources)
+
+def betweenness_sample_size(n, epsilon, delta=0.1):
+  """Return how many sampled sources give normalized betweenness within epsilon.
+
+  With that many sources, every normalized score of an n-vertex graph is
+  within epsilon of its exact value with probability at least 1-delta
+  (Hoeffding's inequality with a union bound over the vertices).
+  """
+  spread = n / (n - 1) if n > 1 else 1.0      # range of one sample of a normalized score
+  return math.ceil(spread * spread * math.log(2 * n / delta) / (2 * epsilon * epsilon))
+
+def betweenness_centrality(g, weighted=False, normalized=True, k=None, epsilon=None,
+                           delta=0.1, seed=None, workers=1, chunks=None, stats=None):
+  """Return the betweenness centrality of each vertex of graph g (Brandes' algorithm).
+
+  The betweenness of v sums, over all pairs s != t of other vertices, the
+  fraction of shortest s-t paths that pass through v (each unordered pair
+  once if g is undirected). One BFS, or Dijkstra search if weighted is
+  True, is run from every source and the dependencies are accumulated
+  backwards. If normalized is True, scores are divided by the number of
+  pairs, so they lie between 0 and 1.
+
+  The sources are split into chunks processed by a pool of worker
+  processes (the default workers=1 runs everything in the calling process
+  and None uses one per CPU; chunks defaults to 4 per worker), each returning a partial dependency vector.
+
+  For an approximation, give k (a number of sources sampled uniformly with
+  the given random seed) or epsilon (k is then chosen by
+  betweenness_sample_size so that every normalized score is within epsilon
+  of the exact one with probability 1-delta); sampled dependencies are
+  scaled by n/k. If stats is a dictionary, it is filled with the number of
+  sources used and that error bound for normalized scores (0 when exact).
+
+  Results are returned as pagerank returns them.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  offsets, targets, weights = csr.arrays()
+  if weighted and weights is None:
+    raise ValueError('graph must be weighted')
+  weights = weights if weighted else None
+  n = csr.vertex_count()
+  if k is None and epsilon is not None:
+    k = betweenness_sample_size(n, epsilon, delta)
+  if k is None or k >= n:
+    sources = list(range(n))
+    bound = 0.0
+  else:
+    sources = random.Random(seed).sample(range(n), k)
+    spread = n / (n - 1) if n > 1 else 1.0
+    bound = spread * math.sqrt(math.log(2 * n / delta) / (2 * k))
+
+  if workers is None:
+    workers = os.cpu_count() or 1
+  if chunks is None:
+    chunks = 4 * workers
+  chunks = max(1, min(chunks, len(sources)))
+  parts = [sources[i::chunks] for i in range(chunks)]
+  if workers > 1 and len(parts) > 1:
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(offsets, targets, weights)) as pool:
+      partial = list(pool.map(_dependencies_shared, parts))
+  else:
+    partial = [_dependencies(offsets, targets, weights, part) for part in parts]
+
+  scale = n / len(sources) if len(sources) > 0 else 0.0
+  if not csr.is_directed():
+    scale /= 2                     # every pair was counted from both ends
+  if normalized:
+    pairs = (n - 1) * (n - 2) / (1 if csr.is_directed() else 2)
+    scale = scale / pairs if pairs > 0 else 0.0
+  scores = [scale * sum(column) for column in zip(*partial)] if partial else [0.0] * n
+  if stats is not None:
+    stats['sources'] = len(sources)
+    stats['error_bound'] = bound
+  return _result(csr, g, np.array(scores) if np is not None else scores)
@@ -0,0 +1,108 @@
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import RawArray
+from .csr_graph import CSRGraph
+from .partition import ArrayPartition
+
+def _shared_copy(typecode, a):
+  """Return a RawArray holding a copy of a, filled with a single buffer copy."""
+  shared = RawArray(typecode, len(a))        # zeroed; filling it item by item is slow
+  memoryview(shared).cast('B')[:] = memoryview(a).cast('B')
+  return shared
+
+#------------------------- worker side -------------------------
+_shared = None                 # (offsets, targets, directed) views of the shared arrays
+
+def _init_worker(offsets, targets, directed):
+  global _shared
+  # view the shared ctypes arrays as 'q' memoryviews, which index faster
+  _shared = (memoryview(offsets).cast('B').cast('q'),
+             memoryview(targets).cast('B').cast('q'), directed)
+
+def _forest_edges(offsets, targets, directed, lo, hi):
+  """Return a spanning forest, as flat (u,v) pairs, of the edges in rows lo..hi-1."""
+  parent = {}                  # sparse union-find over the vertices seen so far
+  forest = array('q')
+  for u in range(lo, hi):
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if not directed and v <= u:
+        continue               # undirected edge also appears in the row of v
+      roots = []
+      for x in (u, v):         # find with path halving
+        while True:
+          p = parent.get(x, x)
+          if p == x:
+            break
+          gp = parent.get(p, p)
+          parent[x] = gp
+          x = gp
+        roots.append(x)
+      if roots[0] != roots[1]:
+        parent[roots[0]] = roots[1]
+        forest.append(u)
+        forest.append(v)
+  return forest
+
+def _forest_edges_shared(lo, hi):
+  offsets, targets, directed = _shared
+  return _forest_edges(offsets, targets, directed, lo, hi)
+
+#------------------------- public function -------------------------
+def connected_components(g, workers=1, chunks=None):
+  """Label the connected components of graph g using a pool of processes.
+
+  g may be a Graph or a CSRGraph snapshot; for a directed graph the weakly
+  connected components are computed. The rows of the graph are split into
+  chunks holding about the same number of edges; each worker process reduces
+  its chunk to a spanning forest with union-find, and the forests are then
+  merged in the calling process. The CSR arrays are copied once into shared
+  memory, which every worker maps instead of receiving its own copy.
+
+  workers is the number of processes (the default 1 runs everything in the
+  calling process; None uses one per CPU) and chunks the number of pieces
+  the graph is split into (default: 4 per worker).
+
+  Return a pair (component, sizes). Components are numbered 0..c-1 in order
+  of their first vertex and sizes[c] is the number of vertices of component
+  c. For a CSRGraph, component is an array indexed by vertex id; for a
+  Graph, it is a dictionary mapping each vertex to its component.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  offsets, targets, _ = csr.arrays()
+  directed = csr.is_directed()
+  n = csr.vertex_count()
+  if workers is None:
+    workers = os.cpu_count() or 1
+  if chunks is None:
+    chunks = 4 * workers
+  chunks = max(1, min(chunks, n))
+
+  # split rows into ranges holding about the same number of edge slots
+  bounds = [0]
+  for i in range(1, chunks):
+    row = bisect_left(offsets, i * len(targets) // chunks)
+    bounds.append(max(bounds[-1], min(row, n)))
+  bounds.append(n)
+  ranges = [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+  if workers == 1 or len(ranges) <= 1:
+    forests = [_forest_edges(offsets, targets, directed, lo, hi) for lo, hi in ranges]
+  else:
+    shared = (_shared_copy('q', offsets), _shared_copy('q', targets), directed)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=shared) as pool:
+      forests = list(pool.map(_forest_edges_shared, *zip(*ranges)))
+
+  # merge the partial forests with a flat union-find
+  forest = ArrayPartition(n)
+  for pairs in forests:
+    forest.union_many(zip(pairs[0::2], pairs[1::2]))
+  component = forest.labels()
+  sizes = [0] * forest.group_count()
+  for c in component:
+    sizes[c] += 1
+  if csr is g:
+    return component, sizes
+  return {csr.vertex(v): component[v] for v in range(n)}, sizes
@@ -0,0 +1,299 @@
+import os
+import pickle
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from ..priority_queue.heap_priority_queue import HeapPriorityQueue
+from .csr_graph import CSRGraph
+
+#------------------------- contraction helpers -------------------------
+def _adjacency(csr, outgoing):
+  """Return {u: {v: (weight, middle)}} maps of the edges of csr (middle -1: original edge)."""
+  offsets, targets, weights = csr.arrays(outgoing)
+  adj = []
+  for u in range(csr.vertex_count()):
+    row = {}
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if v != u and (v not in row or weights[k] < row[v][0]):   # self-loops never help
+        row[v] = (weights[k], -1)
+    adj.append(row)
+  return adj
+
+def _witness_search(out_adj, src, skip, limit, max_settle):
+  """Return distances from src found without passing through skip, up to limit."""
+  d = {src: 0}
+  cloud = set()
+  pq = HeapPriorityQueue()
+  pq.add(0, src)
+  while not pq.is_empty() and len(cloud) < max_settle:
+    key, u = pq.remove_min()
+    if u in cloud:
+      continue
+    if key > limit:
+      break
+    cloud.add(u)
+    for v, (wgt, mid) in out_adj[u].items():
+      if v != skip and v not in cloud:
+        if v not in d or key + wgt < d[v]:
+          d[v] = key + wgt
+          pq.add(d[v], v)
+  return d
+
+def _shortcuts(out_adj, in_adj, v, max_settle):
+  """Return the (u, x, length) shortcuts needed to contract v."""
+  result = []
+  if len(out_adj[v]) == 0:
+    return result
+  longest = max(w for w, mid in out_adj[v].values())
+  for u, (wu, midu) in in_adj[v].items():
+    d = _witness_search(out_adj, u, v, wu + longest, max_settle)
+    for x, (wx, midx) in out_adj[v].items():
+      if x != u and d.get(x, float('inf')) > wu + wx:
+        result.append((u, x, wu + wx))     # no witness: path u-v-x must be kept
+  return result
+
+def _priority(out_adj, in_adj, deleted, v, max_settle):
+  """Edge difference of v plus the number of its already contracted neighbors."""
+  added = len(_shortcuts(out_adj, in_adj, v, max_settle))
+  return added - len(out_adj[v]) - len(in_adj[v]) + deleted[v]
+
+_shared = None                 # (out_adj, in_adj, max_settle) inherited by worker processes
+
+def _init_worker(offsets, targets, weights, directed, max_settle):
+  global _shared
+  csr = CSRGraph(offsets, targets, weights, directed)
+  _shared = (_adjacency(csr, True), _adjacency(csr, False), max_settle)
+
+def _initial_priorities(lo, hi):
+  out_adj, in_adj, max_settle = _shared
+  deleted = [0] * len(out_adj)
+  return [_priority(out_adj, in_adj, deleted, v, max_settle) for v in range(lo, hi)]
+
+def _csr_rows(rows):
+  """Pack a list of [(target, weight, middle)] rows into CSR arrays."""
+  offsets = array('q', [0])
+  targets = array('q')
+  weights = []
+  middles = array('q')
+  for row in rows:
+    for v, w, mid in row:
+      targets.append(v)
+      weights.append(w)
+      middles.append(mid)
+    offsets.append(len(targets))
+  typecode = 'd' if any(isinstance(w, float) for w in weights) else 'q'
+  return offsets, targets, array(typecode, weights), middles
+
+
+class ContractionHierarchy:
+  """Contraction hierarchy index answering repeated shortest-path queries.
+
+  Vertices are contracted one at a time in order of importance (edge
+  difference, lazily updated); shortcuts preserve the shortest paths among
+  the remaining vertices. A query runs two Dijkstra searches that only climb
+  the hierarchy, one over the upward graph from the source and one over the
+  reversed downward graph from the target, so it settles few vertices.
+  """
+
+  #------------------------- construction -------------------------
+  def __init__(self, g, workers=1, max_settle=500):
+    """Build the hierarchy of weighted graph g (a Graph or a CSRGraph).
+
+    workers is the number of processes used to compute the initial vertex
+    priorities (1 computes them in the calling process and None uses one
+    per CPU). max_settle bounds
+    each witness search; a smaller value builds faster but adds more
+    (harmless) shortcuts.
+    """
+    csr = g if isinstance(g, CSRGraph) else g.freeze()
+    if not csr.is_weighted():
+      raise ValueError('graph must be weighted')
+    n = csr.vertex_count()
+    self._n = n
+    self._vertices = None if csr is g else [csr.vertex(v) for v in range(n)]
+    self._index = None
+    out_adj = _adjacency(csr, True)
+    in_adj = _adjacency(csr, False)
+    deleted = [0] * n                        # contracted neighbors of each vertex
+
+    if workers is None:
+      workers = os.cpu_count() or 1
+    if workers > 1 and n > 1:
+      offsets, targets, weights = csr.arrays()
+      step = -(-n // (4 * workers))
+      ranges = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+      with ProcessPoolExecutor(workers, initializer=_init_worker,
+                               initargs=(offsets, targets, weights, csr.is_directed(),
+                                         max_settle)) as pool:
+        priority = [p for part in pool.map(_initial_priorities, *zip(*ranges)) for p in part]
+    else:
+      priority = [_priority(out_adj, in_adj, deleted, v, max_settle) for v in range(n)]
+
+    pq = HeapPriorityQueue()
+    for v in range(n):
+      pq.add(priority[v], v)
+    rank = array('q', [-1]) * n
+    up = [None] * n                          # upward edges v->x kept when v is contracted
+    down = [None] * n                        # upward edges u->v, stored at v for backward search
+    self._shortcut_count = 0
+    order = 0
+    while not pq.is_empty():
+      key, v = pq.remove_min()
+      if rank[v] >= 0:
+        continue
+      current = _priority(out_adj, in_adj, deleted, v, max_settle)
+      if not pq.is_empty() and current > pq.min()[0]:
+        pq.add(current, v)                   # lazy update: v is no longer the least important
+        continue
+      rank[v] = order
+      order += 1
+      for u, x, length in _shortcuts(out_adj, in_adj, v, max_settle):
+        if x not in out_adj[u] or length < out_adj[u][x][0]:
+          out_adj[u][x] = (length, v)
+          in_adj[x][u] = (length, v)
+          self._shortcut_count += 1
+      up[v] = [(x, w, mid) for x, (w, mid) in out_adj[v].items()]
+      down[v] = [(u, w, mid) for u, (w, mid) in in_adj[v].items()]
+      for x in out_adj[v]:
+        del in_adj[x][v]
+        deleted[x] += 1
+      for u in in_adj[v]:
+        del out_adj[u][v]
+        deleted[u] += 1
+      out_adj[v] = in_adj[v] = None
+    self._rank = rank
+    self._up = _csr_rows(up)
+    self._down = _csr_rows(down)
+
+  #------------------------- nonpublic utilities -------------------------
+  def _id(self, v):
+    """Return the vertex id of v (an id, or an original vertex of the graph)."""
+    if isinstance(v, int):
+      if not 0 <= v < self._n:
+        raise ValueError('Vertex does not belong to this graph.')
+      return v
+    if self._index is None:
+      if self._vertices is None:
+        raise TypeError('Vertex id expected')
+      self._index = {x: i for i, x in enumerate(self._vertices)}
+    return self._index[v]
+
+  def _middle(self, a, b):
+    """Return the middle vertex of the hierarchy edge a->b (-1 for an original edge)."""
+    if self._rank[a] < self._rank[b]:
+      offsets, targets, weights, middles = self._up
+      row, other = a, b
+    else:
+      offsets, targets, weights, middles = self._down
+      row, other = b, a
+    for k in range(offsets[row], offsets[row+1]):
+      if targets[k] == other:
+        return middles[k]
+    raise ValueError('no hierarchy edge between a and b')
+
+  def _search(self, s, t):
+    """Return (cost, (forward tree, backward tree), meeting vertex) of a query."""
+    graphs = (self._up, self._down)
+    d = ({s: 0}, {t: 0})
+    tree = ({}, {})                          # vertex -> (previous vertex, middle)
+    cloud = (set(), set())
+    pq = (HeapPriorityQueue(), HeapPriorityQueue())
+    pq[0].add(0, s)
+    pq[1].add(0, t)
+    best = float('inf')
+    meet = None
+    active = [True, True]
+    while active[0] or active[1]:
+      for side in (0, 1):
+        if not active[side]:
+          continue
+        while not pq[side].is_empty() and pq[side].min()[1] in cloud[side]:
+          pq[side].remove_min()              # drop outdated entries
+        if pq[side].is_empty() or pq[side].min()[0] >= best:
+          active[side] = False               # this side cannot improve best anymore
+          continue
+        key, u = pq[side].remove_min()
+        cloud[side].add(u)
+        if u in d[1-side] and key + d[1-side][u] < best:
+          best = key + d[1-side][u]
+          meet = u
+        offsets, targets, weights, middles = graphs[side]
+        for k in range(offsets[u], offsets[u+1]):
+          v = targets[k]
+          wgt = key + weights[k]
+          if v not in d[side] or wgt < d[side][v]:
+            d[side][v] = wgt
+            tree[side][v] = (u, middles[k])
+            pq[side].add(wgt, v)
+    return best, tree, meet
+
+  #------------------------- public methods -------------------------
+  def vertex_count(self):
+    """Return the number of vertices of the indexed graph."""
+    return self._n
+
+  def shortcut_count(self):
+    """Return the number of shortcuts added during preprocessing."""
+    return self._shortcut_count
+
+  def vertex(self, u):
+    """Return the original vertex with id u (or u itself if unknown)."""
+    return self._vertices[u] if self._vertices is not None else u
+
+  def distance(self, s, t):
+    """Return the length of a shortest path from s to t (infinite if unreachable).
+
+    s and t are vertex ids or, for an index built from a Graph, its vertices.
+    """
+    return self._search(self._id(s), self._id(t))[0]
+
+  def path(self, s, t):
+    """Return (path, cost) for a shortest path from s to t.
+
+    path lists the vertices from s to t (as original vertices if known, else
+    ids) and is empty if t is not reachable from s.
+    """
+    s, t = self._id(s), self._id(t)
+    cost, tree, meet = self._search(s, t)
+    if meet is None:
+      return [], cost
+    hops = []                                # hierarchy edges (a, b, middle) from s to t
+    walk = meet
+    while walk != s:
+      prev, mid = tree[0][walk]
+      hops.append((prev, walk, mid))
+      walk = prev
+    hops.reverse()
+    walk = meet
+    while walk != t:
+      nxt, mid = tree[1][walk]
+      hops.append((walk, nxt, mid))
+      walk = nxt
+    path = [s]
+    for hop in hops:
+      stack = [hop]                          # unpack shortcuts into original edges
+      while len(stack) > 0:
+        a, b, mid = stack.pop()
+        if mid < 0:
+          path.append(b)
+        else:
+          stack.append((mid, b, self._middle(mid, b)))
+          stack.append((a, mid, self._middle(a, mid)))
+    return [self.vertex(v) for v in path], cost
+
+  def save(self, filename):
+    """Write the index to a file (the original vertices are not saved)."""
+    state = (self._n, self._rank, self._up, self._down, self._shortcut_count)
+    with open(filename, 'wb') as f:
+      pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+
+  @classmethod
+  def load(cls, filename):
+    """Read an index written by save; its queries take vertex ids."""
+    with open(filename, 'rb') as f:
+      n, rank, up, down, shortcuts = pickle.load(f)
+    ch = cls.__new__(cls)
+    ch._n, ch._rank, ch._up, ch._down, ch._shortcut_count = n, rank, up, down, shortcuts
+    ch._vertices = None
+    ch._index = None
+    return ch
@@ -0,0 +1,491 @@
+import mmap
+import struct
+import sys
+from array import array
+
+FILE_VERSION = 1                        # version of the binary format written by save
+_MAGIC = b'TDPCSR\x00\x00'
+_HEADER = struct.Struct('<8sIIIIqqqq8x') # magic, version, flags, weight code, label kind,
+                                        # n, slots, edge count, label bytes (64 bytes)
+_DIRECTED, _BIG_ENDIAN = 1, 2           # flag bits
+_WEIGHT_CODES = (None, 'q', 'd')
+_INTEGER_CODES = 'bBhHiIlLqQ'           # typecodes saved as 'q'; 'f' and 'd' are saved as 'd'
+_NO_LABELS, _INT_LABELS, _STR_LABELS = 0, 1, 2
+
+def _stored(section, typecode):
+  """Return section as a sequence of 8-byte typecode items, converting it if needed."""
+  current = section.format if isinstance(section, memoryview) else section.typecode
+  if current == typecode:
+    return section
+  try:
+    return array(typecode, section)
+  except OverflowError:
+    raise ValueError("values of typecode '{0}' do not fit the saved typecode '{1}'".format(
+                     current, typecode)) from None
+
+class _LabelTable:
+  """Read-only sequence of string labels decoded on demand from a buffer."""
+  __slots__ = '_offsets', '_blob'
+
+  def __init__(self, offsets, blob):
+    self._offsets = offsets             # label i is blob[offsets[i]:offsets[i+1]]
+    self._blob = blob
+
+  def __len__(self):
+    return len(self._offsets) - 1
+
+  def __getitem__(self, i):
+    if not 0 <= i < len(self._offsets) - 1:
+      raise IndexError('label index out of range')
+    return bytes(self._blob[self._offsets[i]:self._offsets[i+1]]).decode('utf-8')
+
+class CSRGraph:
+  """Read-only snapshot of a graph in compressed sparse row (CSR) form.
+
+  Vertices are renumbered with dense integer ids 0..n-1. The outgoing
+  neighbors of vertex u are targets[offsets[u]:offsets[u+1]], and the
+  parallel weights array (if any) holds the weight of each of those edges.
+  A directed snapshot also keeps the transposed arrays for incoming edges;
+  an undirected snapshot lists every edge in the rows of both endpoints.
+
+  The snapshot supports the read-only part of the Graph interface (using
+  integer ids as vertices), so the graph algorithms of this package can
+  run on it directly.
+  """
+
+  #------------------------- nested Edge class -------------------------
+  class Edge:
+    """Lightweight edge of a CSRGraph, created on demand."""
+    __slots__ = '_origin', '_destination', '_element', '_original'
+
+    def __init__(self, u, v, x, original=None):
+      """Do not call constructor directly. Edges are produced by the CSRGraph."""
+      self._origin = u
+      self._destination = v
+      self._element = x
+      self._original = original     # Graph.Edge this edge was frozen from
+
+    def endpoints(self):
+      """Return (u,v) tuple for vertex ids u and v."""
+      return (self._origin, self._destination)
+
+    def opposite(self, v):
+      """Return the vertex id that is opposite v on this edge."""
+      if v == self._origin:
+        return self._destination
+      elif v == self._destination:
+        return self._origin
+      raise ValueError('v not incident to edge')
+
+    def element(self):
+      """Return element associated with this edge."""
+      return self._element
+
+    def original(self):
+      """Return the Graph.Edge this edge was frozen from (or None)."""
+      return self._original
+
+    def __eq__(self, other):        # edges are rebuilt on demand, so compare by value
+      return (isinstance(other, type(self)) and
+              self._origin == other._origin and
+              self._destination == other._destination)
+
+    def __hash__(self):
+      return hash( (self._origin, self._destination) )
+
+    def __str__(self):
+      return '({0},{1},{2})'.format(self._origin,self._destination,self._element)
+
+  #------------------------- nonpublic utilities -------------------------
+  @staticmethod
+  def _weight_array(elements):
+    """Return a typed array of the given edge elements, or None if not numeric."""
+    typecode = 'q'
+    for x in elements:
+      if isinstance(x, bool) or not isinstance(x, (int, float)):
+        return None                     # unweighted (or non-numeric) edges
+      if isinstance(x, float):
+        typecode = 'd'
+    try:
+      return array(typecode, elements)
+    except OverflowError:               # integers too large for 64 bits
+      return array('d', elements)
+
+  @staticmethod
+  def _transpose(offsets, targets):
+    """Return (offsets, sources, slots) of the transposed CSR arrays.
+
+    slots[j] is the index in targets of the edge stored at position j.
+    """
+    n = len(offsets) - 1
+    in_offsets = array('q', [0]) * (n + 1)
+    for v in targets:                   # count incoming edges of each vertex
+      in_offsets[v + 1] += 1
+    for v in range(n):                  # prefix sums give the row offsets
+      in_offsets[v + 1] += in_offsets[v]
+    fill = in_offsets[:-1]              # next free position of each row
+    sources = array('q', [0]) * len(targets)
+    slots = array('q', [0]) * len(targets)
+    for u in range(n):
+      for k in range(offsets[u], offsets[u+1]):
+        v = targets[k]
+        j = fill[v]
+        sources[j] = u
+        slots[j] = k
+        fill[v] = j + 1
+    return in_offsets, sources, slots
+
+  def _validate_vertex(self, u):
+    """Verify that u is a vertex id of this graph."""
+    if not isinstance(u, int):
+      raise TypeError('Vertex id expected')
+    if not 0 <= u < self._n:
+      raise ValueError('Vertex does not belong to this graph.')
+
+  #------------------------- CSRGraph construction -------------------------
+  def __init__(self, offsets, targets, weights=None, directed=False,
+               vertices=None, edges=None):
+    """Create a snapshot from CSR arrays.
+
+    offsets has length n+1 and targets lists the outgoing neighbors of each
+    vertex; weights (optional) is parallel to targets. For an undirected
+    graph each edge must appear in the rows of both endpoints. vertices is an
+    optional sequence mapping each id back to its original vertex and edges
+    an optional sequence, parallel to targets, of the original edges.
+
+    Raise a ValueError if the arrays are inconsistent.
+    """
+    if not isinstance(offsets, (array, memoryview)):
+      offsets = array('q', offsets)
+    if not isinstance(targets, (array, memoryview)):
+      targets = array('q', targets)
+    if weights is not None and not isinstance(weights, (array, memoryview)):
+      weights = self._weight_array(list(weights))
+    n = len(offsets) - 1
+    if n < 0 or offsets[0] != 0 or offsets[n] != len(targets):
+      raise ValueError('offsets do not match targets')
+    if weights is not None and len(weights) != len(targets):
+      raise ValueError('weights must be parallel to targets')
+    if vertices is not None and len(vertices) != n:
+      raise ValueError('vertices must have one entry per vertex id')
+    if edges is not None and len(edges) != len(targets):
+      raise ValueError('edges must be parallel to targets')
+    self._n = n
+    self._directed = directed
+    self._offsets = offsets
+    self._targets = targets
+    self._weights = weights
+    self._vertices = vertices
+    self._index = None                  # vertex-to-id map, built on first use
+    self._edges = edges
+    self._mmap = None                   # mapped file holding the arrays, if loaded
+    self._filename = None
+    if directed:
+      self._in_offsets, self._in_targets, self._in_slots = self._transpose(offsets, targets)
+      if weights is not None:
+        self._in_weights = array(self.weight_type(), (weights[k] for k in self._in_slots))
+      else:
+        self._in_weights = None
+      self._edge_count = len(targets)
+    else:                               # incoming arrays are aliases of outgoing ones
+      self._in_offsets, self._in_targets, self._in_weights = offsets, targets, weights
+      self._in_slots = None
+      loops = sum(1 for u in range(n) for k in range(offsets[u], offsets[u+1])
+                  if targets[k] == u)   # a self-loop is listed only once
+      self._edge_count = (len(targets) - loops) // 2 + loops
+
+  @classmethod
+  def from_graph(cls, g):
+    """Return a CSRGraph snapshot of Graph g (or of any object with its interface).
+
+    Ids are assigned in the iteration order of g.vertices(). Edge weights are
+    stored in a typed array when every edge element is numeric.
+    """
+    verts = list(g.vertices())
+    index = {v: i for i, v in enumerate(verts)}
+    outgoing = getattr(g, '_outgoing', None)  # adjacency maps of a Graph, read directly
+    offsets = array('q', [0])
+    targets = array('q')
+    edges = []
+    for v in verts:
+      if outgoing is not None:
+        row = outgoing[v].items()
+      else:
+        row = ((e.opposite(v), e) for e in g.incident_edges(v))
+      for w, e in row:
+        targets.append(index[w])
+        edges.append(e)
+      offsets.append(len(targets))
+    weights = cls._weight_array([e.element() for e in edges])
+    csr = cls(offsets, targets, weights, g.is_directed(), verts, edges)
+    csr._index = index
+    return csr
+
+  #------------------------- public CSRGraph methods -------------------------
+  def is_directed(self):
+    """Return True if this is a directed graph; False if undirected."""
+    return self._directed
+
+  def is_weighted(self):
+    """Return True if every edge has a numeric weight."""
+    return self._weights is not None
+
+  def weight_type(self):
+    """Return the typecode of the weights ('q' or 'd'), or None if not weighted."""
+    if self._weights is None:
+      return None
+    if isinstance(self._weights, memoryview):
+      return self._weights.format
+    return self._weights.typecode
+
+  def version(self):
+    """Return the mutation version, always 0 since a snapshot never changes."""
+    return 0
+
+  def vertex_count(self):
+    """Return the number of vertices in the graph."""
+    return self._n
+
+  def vertices(self):
+    """Return an iteration of all vertex ids of the graph."""
+    return range(self._n)
+
+  def edge_count(self):
+    """Return the number of edges in the graph."""
+    return self._edge_count
+
+  def edges(self):
+    """Return a set of all edges of the graph."""
+    result = set()
+    for u in range(self._n):
+      for k in range(self._offsets[u], self._offsets[u+1]):
+        if self._directed or u <= self._targets[k]:   # report undirected edges once
+          result.add(self.edge_at(u, k))
+    return result
+
+  def get_edge(self, u, v):
+    """Return the edge from u to v, or None if not adjacent."""
+    self._validate_vertex(u)
+    self._validate_vertex(v)
+    for k in range(self._offsets[u], self._offsets[u+1]):
+      if self._targets[k] == v:
+        return self.edge_at(u, k)
+    return None
+
+  def degree(self, u, outgoing=True):
+    """Return number of (outgoing) edges incident to vertex u in the graph.
+
+    If graph is directed, optional parameter used to count incoming edges.
+    """
+    self._validate_vertex(u)
+    offsets = self._offsets if outgoing else self._in_offsets
+    return offsets[u+1] - offsets[u]
+
+  def incident_edges(self, u, outgoing=True):
+    """Return all (outgoing) edges incident to vertex u in the graph.
+
+    If graph is directed, optional parameter used to request incoming edges.
+    """
+    self._validate_vertex(u)
+    offsets = self._offsets if outgoing else self._in_offsets
+    for k in range(offsets[u], offsets[u+1]):
+      yield self.edge_at(u, k, outgoing)
+
+  def arrays(self, outgoing=True):
+    """Return the (offsets, targets, weights) arrays of the snapshot.
+
+    With outgoing=False, targets holds the sources of incoming edges.
+    weights is None if the graph is not weighted. The arrays must not be
+    modified.
+    """
+    if outgoing:
+      return self._offsets, self._targets, self._weights
+    return self._in_offsets, self._in_targets, self._in_weights
+
+  def edge_at(self, u, k, outgoing=True):
+    """Return the edge stored at position k of the (outgoing) row of vertex u."""
+    if outgoing or not self._directed:
+      v = self._targets[k]
+      slot = k
+    else:
+      v = self._in_targets[k]
+      slot = self._in_slots[k]          # position of the same edge among outgoing rows
+    original = self._edges[slot] if self._edges is not None else None
+    if self._weights is not None:
+      x = self._weights[slot]
+    else:
+      x = original.element() if original is not None else None
+    if not self._directed:
+      return self.Edge(min(u,v), max(u,v), x, original)   # canonical orientation
+    if outgoing:
+      return self.Edge(u, v, x, original)
+    return self.Edge(v, u, x, original)
+
+  #------------------------- mapping back to the original graph -------------------------
+  def vertex(self, u):
+    """Return the original vertex with id u (or u itself if unknown)."""
+    return self._vertices[u] if self._vertices is not None else u
+
+  def index(self, v):
+    """Return the integer id of original vertex v.
+
+    A snapshot without original vertices (such as one of an IntGraph) uses
+    the ids themselves, so v is then returned after being validated.
+    """
+    if self._vertices is None:
+      self._validate_vertex(v)
+      return v
+    if self._index is None:
+      self._index = {x: i for i, x in enumerate(self._vertices)}
+    return self._index[v]
+
+  def translate(self, result):
+    """Map a result computed on this snapshot back to original vertices and edges.
+
+    A dictionary has its integer keys mapped to vertices and its edge values
+    mapped to the original edges (other values, such as distances, are kept).
+    Any other iterable is returned as a list with ids mapped to vertices and
+    edges mapped to the original edges.
+    """
+    def original(x):
+      if isinstance(x, self.Edge) and x._original is not None:
+        return x._original
+      return x
+    if isinstance(result, dict):
+      return {self.vertex(k): original(x) for k, x in result.items()}
+    return [self.vertex(x) if isinstance(x, int) and not isinstance(x, bool)
+            else original(x) for x in result]
+
+  #------------------------- binary file format -------------------------
+  def _labels(self):
+    """Return (label kind, label section) describing the original vertices."""
+    if self._vertices is None:
+      return _NO_LABELS, []
+    labels = [v.element() if hasattr(v, 'element') else v for v in self._vertices]
+    if all(type(x) is int and -(1 << 63) <= x < (1 << 63) for x in labels):
+      return _INT_LABELS, [array('q', labels)]
+    if all(x is None for x in labels):
+      return _NO_LABELS, []
+    blobs = [str(x).encode('utf-8') for x in labels]
+    offsets = array('q', [0])
+    for b in blobs:
+      offsets.append(offsets[-1] + len(b))
+    return _STR_LABELS, [offsets, b''.join(blobs)]
+
+  def save(self, filename):
+    """Write the snapshot to a binary file that load can memory-map.
+
+    The file holds a versioned header, the CSR arrays (and, for a directed
+    graph, the transposed arrays), the weights and the vertex labels: the
+    element of each original vertex, kept as an integer if all of them are
+    integers and otherwise as its string form. Original edges are not saved.
+    Arrays of other typecodes are stored as 8-byte integers ('q') or floats
+    ('d'). Raise a ValueError if some values cannot be stored that way.
+    """
+    kind, labels = self._labels()
+    code = self.weight_type()
+    if code is not None:
+      if code in _INTEGER_CODES:
+        code = 'q'
+      elif code in 'fd':
+        code = 'd'
+      else:
+        raise ValueError("weights of typecode '{0}' cannot be saved".format(code))
+    sections = [_stored(self._offsets, 'q'), _stored(self._targets, 'q')]
+    if self._weights is not None:
+      sections.append(_stored(self._weights, code))
+    if self._directed:
+      sections += [_stored(self._in_offsets, 'q'), _stored(self._in_targets, 'q'),
+                   _stored(self._in_slots, 'q')]
+      if self._weights is not None:
+        sections.append(_stored(self._in_weights, code))
+    sections += labels
+    flags = (_DIRECTED if self._directed else 0) | (_BIG_ENDIAN if sys.byteorder == 'big' else 0)
+    label_bytes = len(labels[-1]) if kind == _STR_LABELS else 0
+    with open(filename, 'wb') as f:
+      f.write(_HEADER.pack(_MAGIC, FILE_VERSION, flags, _WEIGHT_CODES.index(code),
+                           kind, self._n, len(self._targets), self._edge_count, label_bytes))
+      for section in sections:
+        f.write(memoryview(section).cast('B'))
+
+  @classmethod
+  def load(cls, filename, memory_map=True):
+    """Return the snapshot stored in a file written by save.
+
+    With memory_map, the arrays are read-only views of a memory-mapped file:
+    loading takes constant time, pages are read on first use, and processes
+    that load (or are forked with) the same file share those pages. Pickling
+    such a snapshot stores only the file name. Otherwise the file is read
+    into private arrays.
+
+    Raise a ValueError if the file is not in a supported format.
+    """
+    with open(filename, 'rb') as f:
+      if memory_map:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      else:
+        data = f.read()
+    if len(data) < _HEADER.size:
+      raise ValueError('not a graph file')
+    magic, version, flags, code, kind, n, m, edge_count, label_bytes = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+      raise ValueError('not a graph file')
+    if version != FILE_VERSION:
+      raise ValueError('unsupported graph file version {0}'.format(version))
+    if bool(flags & _BIG_ENDIAN) != (sys.byteorder == 'big'):
+      raise ValueError('graph file was written with a different byte order')
+    directed = bool(flags & _DIRECTED)
+    typecode = _WEIGHT_CODES[code]
+    view = memoryview(data)
+    position = _HEADER.size
+    def section(count, typecode='q'):
+      nonlocal position
+      end = position + 8 * count
+      if end > len(data):
+        raise ValueError('graph file is truncated')
+      part = view[position:end].cast(typecode)
+      position = end
+      return part if memory_map else array(typecode, part)
+    offsets, targets = section(n + 1), section(m)
+    weights = section(m, typecode) if typecode is not None else None
+    if directed:
+      in_offsets, in_targets, in_slots = section(n + 1), section(m), section(m)
+      in_weights = section(m, typecode) if typecode is not None else None
+    vertices = None
+    if kind == _INT_LABELS:
+      vertices = section(n)
+    elif kind == _STR_LABELS:
+      label_offsets = section(n + 1)
+      if position + label_bytes > len(data):
+        raise ValueError('graph file is truncated')
+      blob = view[position:position + label_bytes]
+      vertices = _LabelTable(label_offsets, blob if memory_map else bytes(blob))
+
+    g = cls.__new__(cls)
+    g._n, g._directed, g._edge_count = n, directed, edge_count
+    g._offsets, g._targets, g._weights = offsets, targets, weights
+    g._vertices, g._index, g._edges = vertices, None, None
+    if directed:
+      g._in_offsets, g._in_targets, g._in_slots = in_offsets, in_targets, in_slots
+      g._in_weights = in_weights
+    else:
+      g._in_offsets, g._in_targets, g._in_weights = offsets, targets, weights
+      g._in_slots = None
+    g._mmap = data if memory_map else None
+    g._filename = filename if memory_map else None
+    return g
+
+  def __reduce_ex__(self, protocol):
+    """Pickle a memory-mapped snapshot as its file name, and others by value."""
+    if self._filename is not None:
+      return (type(self).load, (self._filename,))
+    return super().__reduce_ex__(protocol)
+
+  def __getstate__(self):
+    state = dict(self.__dict__)
+    for name, value in state.items():
+      if isinstance(value, memoryview):           # arrays viewing another buffer
+        state[name] = array(value.format.lstrip('@'), value)
+    if self._vertices is not None:
+      state['_vertices'] = list(self._vertices)   # label tables may view a buffer
+    return state
@@ -19,18 +19,129 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .csr_graph import CSRGraph
+
+# events reported by DFS_events
+PRE_VISIT = 'pre'          # vertex is discovered
+POST_VISIT = 'post'        # vertex is finished (all its edges explored)
+TREE_EDGE = 'tree'         # edge discovers a new vertex
+BACK_EDGE = 'back'         # edge leads to an ancestor still being explored
+FORWARD_EDGE = 'forward'   # directed edge to an already finished descendant
+CROSS_EDGE = 'cross'       # directed edge to a finished vertex that is not a descendant
+
 def DFS(g, u, discovered):
   """Perform DFS of the undiscovered portion of Graph g starting at Vertex u.
 
   discovered is a dictionary mapping each vertex to the edge that was used to
   discover it during the DFS. (u should be "discovered" prior to the call.)
   Newly discovered vertices will be added to the dictionary as a result.
+
+  The search uses an explicit stack rather than recursion, so it is not
+  limited by the depth of the DFS tree.
+
+  g may also be a CSRGraph snapshot, in which case u is a vertex id.
+  """
+  if isinstance(g, CSRGraph):
+    return _DFS_csr(g, u, discovered)
+  stack = [(u, g.incident_edges(u))]        # vertices being explored, with their edges
+  while len(stack) > 0:
+    w, edges = stack[-1]
+    for e in edges:                          # resume the outgoing edges of w
+      v = e.opposite(w)
+      if v not in discovered:                # v is an unvisited vertex
+        discovered[v] = e                    # e is the tree edge that discovered v
+        stack.append((v, g.incident_edges(v)))  # explore from v before finishing w
+        break
+    else:
+      stack.pop()                            # all edges of w explored
+
+def _DFS_csr(g, u, discovered):
+  """DFS over the arrays of CSRGraph g (same contract as DFS)."""
+  offsets, targets, _ = g.arrays()
+  stack = [u]                                # vertices being explored
+  position = [offsets[u]]                    # next edge slot of each of them
+  while len(stack) > 0:
+    w = stack[-1]
+    k = position[-1]
+    end = offsets[w+1]
+    while k < end:
+      v = targets[k]
+      k += 1
+      if v not in discovered:
+        discovered[v] = g.edge_at(w, k-1)
+        position[-1] = k
+        stack.append(v)
+        position.append(offsets[v])
+        break
+    else:
+      stack.pop()
+      position.pop()
+
+def DFS_events(g, u, discovered, discovery=None, finish=None):
+  """Generate the events of a DFS of Graph g starting at Vertex u.
+
+  Yield (vertex, event) pairs for PRE_VISIT and POST_VISIT events and
+  (edge, event) pairs for TREE_EDGE, BACK_EDGE, FORWARD_EDGE and CROSS_EDGE
+  events. Each edge of a directed graph is reported once; an undirected edge
+  is reported once as a tree or back edge.
+
+  discovered has the same meaning as for DFS, with u "discovered" prior to the
+  call. If given, discovery and finish are dictionaries that are filled with
+  the discovery and finish time of each vertex; times continue from the
+  entries already present, so they can be shared by successive searches.
   """
-  for e in g.incident_edges(u):    # for every outgoing edge from u
-    v = e.opposite(u)
-    if v not in discovered:        # v is an unvisited vertex
-      discovered[v] = e            # e is the tree edge that discovered v
-      DFS(g, v, discovered)        # recursively explore from v
+  if discovery is None:
+    discovery = {}
+  if finish is None:
+    finish = {}
+  clock = len(discovery) + len(finish)      # one tick per discovery or finish
+  directed = g.is_directed()
+  discovery[u] = clock
+  clock += 1
+  yield u, PRE_VISIT
+  stack = [(u, g.incident_edges(u))]
+  while len(stack) > 0:
+    w, edges = stack[-1]
+    for e in edges:
+      v = e.opposite(w)
+      if v not in discovered:
+        discovered[v] = e
+        yield e, TREE_EDGE
+        discovery[v] = clock
+        clock += 1
+        yield v, PRE_VISIT
+        stack.append((v, g.incident_edges(v)))
+        break
+      if v in finish or v not in discovery:  # v is no longer on the stack
+        if directed:
+          if v in discovery and discovery[v] > discovery[w]:
+            yield e, FORWARD_EDGE
+          else:
+            yield e, CROSS_EDGE
+        # an undirected edge to a finished vertex was reported as its back edge
+      elif directed or e != discovered[w]:   # skip the tree edge leading to w
+        yield e, BACK_EDGE
+    else:
+      stack.pop()
+      finish[w] = clock
+      clock += 1
+      yield w, POST_VISIT
+
+def DFS_events_complete(g, discovery=None, finish=None):
+  """Generate the events of a DFS of the entire graph g.
+
+  Events are those of DFS_events; each tree of the DFS forest starts with
+  the PRE_VISIT event of its root.
+  """
+  if discovery is None:
+    discovery = {}
+  if finish is None:
+    finish = {}
+  forest = {}
+  for u in g.vertices():
+    if u not in forest:
+      forest[u] = None
+      yield from DFS_events(g, u, forest, discovery, finish)
 
 def construct_path(u, v, discovered):
   """
@@ -44,7 +155,7 @@ def construct_path(u, v, discovered):
     # we build list from v to u and then reverse it at the end
     path.append(v)
     walk = v
-    while walk is not u:
+    while walk != u:                # ids of a CSRGraph are compared by value
       e = discovered[walk]         # find edge leading to walk
       parent = e.opposite(walk)
       path.append(parent)
@@ -57,6 +168,7 @@ def DFS_complete(g):
 
   Result maps each vertex v to the edge that was used to discover it.
   (Vertices that are roots of a DFS tree are mapped to None.)
+  The search is iterative, so deep graphs do not exhaust the recursion limit.
   """
   forest = {}
   for u in g.vertices():
@@ -64,3 +176,34 @@ def DFS_complete(g):
       forest[u] = None             # u will be the root of a tree
       DFS(g, u, forest)
   return forest
+
+def find_cycle(g):
+  """Return a list of vertices forming a cycle of g, or None if g has no cycle.
+
+  The cycle [v0, v1, ..., vk] uses the edges (v0,v1), ..., (vk-1,vk) and
+  (vk,v0), followed in their direction if g is directed; a self-loop is
+  reported as [v0].
+  """
+  forest = {}
+  discovery = {}
+  finish = {}
+  for s in g.vertices():
+    if s not in forest:
+      forest[s] = None
+      active = []                            # vertices on the DFS stack
+      for x, event in DFS_events(g, s, forest, discovery, finish):
+        if event == PRE_VISIT:
+          active.append(x)
+        elif event == POST_VISIT:
+          active.pop()
+        elif event == BACK_EDGE:
+          u = active[-1]                     # the edge was found scanning u
+          v = x.opposite(u)                  # v is an ancestor of u in the DFS tree
+          cycle = [u]
+          walk = u
+          while walk != v:
+            walk = forest[walk].opposite(walk)
+            cycle.append(walk)
+          cycle.reverse()                    # v ... u, closed by the back edge
+          return cycle
+  return None
@@ -0,0 +1,111 @@
+from .dfs import find_cycle
+from .topological_sort import topological_sort
+
+class CycleError(ValueError):
+  """Raised when an edge would close a directed cycle.
+
+  The cycle attribute lists the vertices [v0, ..., vk] of the cycle, which
+  uses the edges (v0,v1), ..., (vk-1,vk) and (vk,v0).
+  """
+  def __init__(self, cycle):
+    super().__init__('edge would close a cycle through {0} vertices'.format(len(cycle)))
+    self.cycle = cycle
+
+
+class DynamicTopologicalOrder:
+  """Topological order of a directed acyclic graph maintained under edge insertions.
+
+  Edges are inserted through this structure, which updates the order with
+  the Pearce-Kelly algorithm: an edge (u,v) that already agrees with the
+  order costs O(1); otherwise only the vertices whose positions lie between
+  those of v and u, and that are reachable from v or reach u, are searched
+  and moved. An edge that would close a cycle is rejected.
+  """
+
+  def __init__(self, g):
+    """Start maintaining the order of directed Graph g.
+
+    Raise a CycleError if g already contains a cycle.
+    """
+    if not g.is_directed():
+      raise ValueError('graph must be directed')
+    order = topological_sort(g)
+    if len(order) != g.vertex_count():
+      raise CycleError(find_cycle(g))
+    self._graph = g
+    self._order = order                       # vertex at each position
+    self._position = {v: i for i, v in enumerate(order)}
+
+  #------------------------- nonpublic utilities -------------------------
+  def _search(self, start, outgoing, inside):
+    """Return {vertex: tree edge} for vertices reachable from start through inside(v)."""
+    found = {start: None}
+    stack = [start]
+    while len(stack) > 0:
+      u = stack.pop()
+      for e in self._graph.incident_edges(u, outgoing):
+        w = e.opposite(u)
+        if w not in found and inside(w):
+          found[w] = e
+          stack.append(w)
+    return found
+
+  #------------------------- public methods -------------------------
+  def graph(self):
+    """Return the underlying graph."""
+    return self._graph
+
+  def __len__(self):
+    """Return the number of vertices in the order."""
+    return len(self._order)
+
+  def __iter__(self):
+    """Generate the vertices in topological order."""
+    return iter(self._order)
+
+  def order(self):
+    """Return a list of the vertices in topological order."""
+    return list(self._order)
+
+  def position(self, v):
+    """Return the position of vertex v in the order."""
+    return self._position[v]
+
+  def insert_vertex(self, x=None):
+    """Insert and return a new vertex with element x, placed last in the order."""
+    v = self._graph.insert_vertex(x)
+    self._position[v] = len(self._order)
+    self._order.append(v)
+    return v
+
+  def insert_edge(self, u, v, x=None):
+    """Insert and return a new edge from u to v, updating the order.
+
+    Raise a CycleError (listing the cycle) if the edge would close a cycle,
+    and a ValueError as Graph.insert_edge does; the graph is then unchanged.
+    """
+    if self._graph.get_edge(u, v) is not None:       # includes error checking
+      raise ValueError('u and v are already adjacent')
+    lower, upper = self._position[v], self._position[u]
+    if lower == upper:
+      raise CycleError([u])                           # self-loop
+    if lower < upper:
+      position = self._position
+      # vertices after v (and up to u) reachable from v
+      forward = self._search(v, True, lambda w: position[w] <= upper)
+      if u in forward:                                # v reaches u: new edge closes a cycle
+        cycle = [u]
+        walk = u
+        while walk != v:
+          walk = forward[walk].opposite(walk)
+          cycle.append(walk)
+        cycle.reverse()
+        raise CycleError(cycle)
+      # vertices before u (and after v) that reach u
+      backward = self._search(u, False, lambda w: position[w] > lower)
+      moved = sorted(backward, key=position.get) + sorted(forward, key=position.get)
+      slots = sorted(position[w] for w in moved)
+      for w, i in zip(moved, slots):                  # reuse the same positions
+        position[w] = i
+        self._order[i] = w
+    return self._graph.insert_edge(u, v, x)
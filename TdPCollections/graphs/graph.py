@@ -19,8 +19,18 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import time
+import weakref
+
 class Graph:
-  """Representation of a simple graph using an adjacency map."""
+  """Representation of a simple graph using an adjacency map.
+
+  edge_count and average_degree take O(1) time. max_degree and
+  degree_histogram are not maintained incrementally: their first call after
+  a change rebuilds the degree histograms in O(n) time, and later calls
+  reuse them until the next change. Updating them on every insert_edge and
+  remove_edge instead made edge insertion measurably slower.
+  """
 
   #------------------------- nested Vertex class -------------------------
   class Vertex:
@@ -85,6 +95,11 @@ class Graph:
     self._outgoing = {}
     # only create second map for directed graph; use alias for undirected
     self._incoming = {} if directed else self._outgoing
+    self._edge_count = 0
+    self._loops = 0                  # undirected self-loops, which add 1 to the degree total
+    self._histograms = None          # degree histograms, recomputed after a change
+    self._version = 0                # incremented by every insertion or removal
+    self._observers = []             # weak references to objects told of each change
 
   def _validate_vertex(self, v):
     """Verify that v is a Vertex of this graph."""
@@ -93,6 +108,74 @@ class Graph:
     if v not in self._outgoing:
       raise ValueError('Vertex does not belong to this graph.')
 
+  def _changed(self):
+    """Record a mutation: increment the version and notify the observers.
+
+    Every public mutator calls this once, after the graph is consistent.
+    """
+    self._version += 1
+    if self._observers:
+      alive = []
+      for ref in self._observers:
+        observer = ref()
+        if observer is not None:
+          observer._graph_changed(self)
+          alive.append(ref)
+      self._observers = alive
+
+  def _observe(self, observer):
+    """Register observer, whose _graph_changed(g) method is called after each mutation.
+
+    Only a weak reference is kept, so the graph does not keep observer alive.
+    """
+    self._observers.append(weakref.ref(observer))
+
+  def __getstate__(self):
+    state = dict(self.__dict__)
+    state['_observers'] = []         # copies and pickles start without observers
+    return state
+
+  def _link(self, u, v, e):
+    """Store edge e from u to v in the adjacency maps and update the counters.
+
+    The caller reports the change with _changed once the graph is consistent.
+    """
+    self._outgoing[u][v] = e
+    self._incoming[v][u] = e
+    self._edge_count += 1
+    if u is v and self._incoming is self._outgoing:
+      self._loops += 1                          # an undirected self-loop is stored once
+    self._histograms = None
+
+  def _unlink(self, u, v):
+    """Remove the edge from u to v from the adjacency maps and update the counters.
+
+    The caller reports the change with _changed once the graph is consistent.
+    """
+    del self._outgoing[u][v]
+    if self._incoming is self._outgoing and u is v:
+      self._loops -= 1                          # a self-loop is stored once
+    else:
+      del self._incoming[v][u]
+    self._edge_count -= 1
+    self._histograms = None
+
+  def _degree_histograms(self):
+    """Return the (outgoing, incoming) degree histograms, recomputing them if stale."""
+    if self._histograms is None:
+      histograms = []
+      for adj in (self._outgoing, self._incoming):
+        histogram = {}
+        for secondary_map in adj.values():
+          d = len(secondary_map)
+          histogram[d] = histogram.get(d, 0) + 1
+        histograms.append(histogram)
+        if not self.is_directed():
+          histograms.append(histogram)          # incoming degrees are the same
+          break
+      self._histograms = tuple(histograms)
+    return self._histograms
+
   def is_directed(self):
     """Return True if this is a directed graph; False if undirected.
 
@@ -100,6 +183,13 @@ class Graph:
     """
     return self._incoming is not self._outgoing # directed if maps are distinct
 
+  def version(self):
+    """Return the mutation version, which changes whenever a vertex or edge is inserted or removed.
+
+    Changing the element of an existing vertex or edge does not change the version.
+    """
+    return self._version
+
   def vertex_count(self):
     """Return the number of vertices in the graph."""
     return len(self._outgoing)
@@ -109,17 +199,20 @@ class Graph:
     return self._outgoing.keys()
 
   def edge_count(self):
-    """Return the number of edges in the graph."""
-    total = sum(len(self._outgoing[v]) for v in self._outgoing)
-    # for undirected graphs, make sure not to double-count edges
-    return total if self.is_directed() else total // 2
+    """Return the number of edges in the graph (in O(1) time)."""
+    return self._edge_count
 
   def edges(self):
     """Return a set of all edges of the graph."""
-    result = set()       # avoid double-reporting edges of undirected graph
-    for secondary_map in self._outgoing.values():
-      result.update(secondary_map.values())    # add edges to resulting set
-    return result
+    return set(self.iter_edges())
+
+  def iter_edges(self):
+    """Generate every edge of the graph once, without building a set."""
+    directed = self.is_directed()
+    for u, secondary_map in self._outgoing.items():
+      for e in secondary_map.values():
+        if directed or e._origin is u:          # undirected edges are stored twice
+          yield e
 
   def get_edge(self, u, v):
     """Return the edge from u to v, or None if not adjacent."""
@@ -136,6 +229,31 @@ class Graph:
     adj = self._outgoing if outgoing else self._incoming
     return len(adj[v])
 
+  def max_degree(self, outgoing=True):
+    """Return the largest (outgoing) degree of a vertex, or 0 for an empty graph.
+
+    If graph is directed, optional parameter used to consider incoming edges.
+    The degree histograms are recomputed in O(n) time after each change.
+    """
+    histogram = self._degree_histograms()[0 if outgoing else 1]
+    return max(histogram) if len(histogram) > 0 else 0
+
+  def average_degree(self, outgoing=True):
+    """Return the average (outgoing) degree of the vertices, or 0 for an empty graph (O(1) time)."""
+    n = len(self._outgoing)
+    if n == 0:
+      return 0
+    if self.is_directed():
+      return self._edge_count / n             # every edge adds 1 to each direction
+    return (2 * self._edge_count - self._loops) / n
+
+  def degree_histogram(self, outgoing=True):
+    """Return a dictionary mapping each (outgoing) degree to its number of vertices.
+
+    The histograms are recomputed in O(n) time after each change.
+    """
+    return dict(self._degree_histograms()[0 if outgoing else 1])
+
   def incident_edges(self, v, outgoing=True):
     """Return all (outgoing) edges incident to vertex v in the graph.
 
@@ -152,8 +270,31 @@ class Graph:
     self._outgoing[v] = {}
     if self.is_directed():
       self._incoming[v] = {}        # need distinct map for incoming edges
+    self._histograms = None
+    self._changed()
     return v
 
+  def insert_vertices(self, elements):
+    """Insert a new Vertex for each element of an iterable; return the list of them.
+
+    Observers are notified once for the batch.
+    """
+    Vertex = self.Vertex
+    directed = self.is_directed()
+    result = []
+    try:
+      for x in elements:
+        v = Vertex(x)
+        self._outgoing[v] = {}
+        if directed:
+          self._incoming[v] = {}    # need distinct map for incoming edges
+        result.append(v)
+    finally:                        # account for the vertices inserted so far
+      if len(result) > 0:
+        self._histograms = None
+        self._changed()
+    return result
+
   def insert_edge(self, u, v, x=None):
     """Insert and return a new Edge from u to v with auxiliary element x.
 
@@ -163,5 +304,220 @@ class Graph:
     if self.get_edge(u, v) is not None:      # includes error checking
       raise ValueError('u and v are already adjacent')
     e = self.Edge(u, v, x)
-    self._outgoing[u][v] = e
-    self._incoming[v][u] = e
+    self._link(u, v, e)
+    self._changed()
+    return e
+
+  def insert_edges(self, records):
+    """Insert an Edge for each (u,v) or (u,v,x) tuple of an iterable; return the list of them.
+
+    Each record is checked as in insert_edge, but with a single dictionary
+    lookup per endpoint, and the counters are updated once for the batch.
+    If a record is invalid, a ValueError (or TypeError) is raised and the
+    edges of the earlier records remain inserted.
+    """
+    outgoing = self._outgoing
+    incoming = self._incoming
+    undirected = incoming is outgoing
+    Vertex = self.Vertex
+    Edge = self.Edge
+    result = []
+    loops = 0
+    try:
+      for record in records:
+        u, v = record[0], record[1]
+        x = record[2] if len(record) > 2 else None
+        if not isinstance(u, Vertex) or not isinstance(v, Vertex):
+          raise TypeError('Vertex expected')
+        row = outgoing.get(u)
+        if row is None or v not in outgoing:
+          raise ValueError('Vertex does not belong to this graph.')
+        if v in row:
+          raise ValueError('u and v are already adjacent')
+        e = Edge(u, v, x)
+        row[v] = e
+        incoming[v][u] = e
+        if u is v and undirected:
+          loops += 1
+        result.append(e)
+    finally:                                  # account for the edges inserted so far
+      if len(result) > 0:
+        self._edge_count += len(result)
+        self._loops += loops
+        self._histograms = None
+        self._changed()
+    return result
+
+  def remove_edge(self, u, v=None):
+    """Remove the edge from u to v from the graph and return its element.
+
+    As IntGraph.remove_edge, this takes the endpoints u and v; an Edge may
+    also be given alone as u. Raise a ValueError if there is no such edge,
+    and a TypeError if u is given alone but is not an Edge.
+    """
+    if v is None:                              # u is an Edge
+      if not isinstance(u, self.Edge):
+        raise TypeError('Edge expected when v is omitted')
+      e = u
+      u, v = e.endpoints()
+      if u not in self._outgoing or self._outgoing[u].get(v) is not e:
+        raise ValueError('Edge does not belong to this graph.')
+    else:
+      e = self.get_edge(u, v)                  # includes error checking
+      if e is None:
+        raise ValueError('u and v are not adjacent')
+    self._unlink(u, v)
+    self._changed()
+    return e.element()
+
+  def remove_vertex(self, v):
+    """Remove Vertex v and all its incident edges from the graph; return its element."""
+    self._validate_vertex(v)
+    for w in list(self._outgoing[v]):
+      self._unlink(v, w)
+    if self.is_directed():
+      for w in list(self._incoming[v]):
+        self._unlink(w, v)
+    del self._outgoing[v]
+    if self.is_directed():
+      del self._incoming[v]
+    self._histograms = None
+    self._changed()
+    return v.element()
+
+  def freeze(self):
+    """Return a read-only CSRGraph snapshot of the graph.
+
+    The snapshot renumbers vertices as 0..n-1 and can be passed to the
+    algorithms of this package in place of the graph; its translate method
+    maps their results back to the vertices and edges of this graph.
+    """
+    from .csr_graph import CSRGraph        # imported lazily; graph.py is also run as a script
+    return CSRGraph.from_graph(self)
+
+  #------------------------- views -------------------------
+  def subgraph(self, vertices):
+    """Return a read-only view of the subgraph induced by the given vertices."""
+    from .graph_views import SubgraphView
+    return SubgraphView(self, vertices)
+
+  def edge_filter(self, predicate):
+    """Return a read-only view keeping only the edges e for which predicate(e) is true."""
+    from .graph_views import EdgeFilterView
+    return EdgeFilterView(self, predicate)
+
+  def reversed(self):
+    """Return a read-only view of this directed graph with every edge reversed."""
+    from .graph_views import ReversedView
+    return ReversedView(self)
+
+  #------------------------- bulk loading -------------------------
+  @staticmethod
+  def _read_lines(source, chunk_size):
+    """Generate the lines of a file path (read in large chunks) or of an iterable."""
+    if not isinstance(source, (str, bytes)) and not hasattr(source, '__fspath__'):
+      yield from source                  # already an iterable of lines or records
+      return
+    with open(source) as f:
+      tail = ''
+      while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+          break
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()               # last line may continue in next chunk
+        yield from lines
+      if tail:
+        yield tail
+
+  @classmethod
+  def from_edge_list(cls, source, directed=False, weighted=False,
+                     duplicates='reject', labels=None, stats=None,
+                     chunk_size=1 << 22):
+    """Build and return a new graph from an edge list.
+
+    source is either a path to a text file or an iterable of lines; each line
+    holds "u v" (or "u v weight" if weighted is True), blank lines and lines
+    starting with '#' are skipped. The iterable may also yield (u, v) or
+    (u, v, weight) tuples. Vertex labels are interned so every distinct label
+    becomes a single vertex, and edges are inserted without the per-edge
+    validation of insert_edge.
+
+    duplicates selects what to do with an edge whose endpoints are already
+    adjacent: 'reject' raises a ValueError, 'first' keeps the first edge and
+    'min' keeps the smallest weight.
+
+    If labels is given, it must be an empty dictionary; it is filled with
+    the label-to-vertex map.
+    If stats is a dictionary, it is filled with the number of lines, edges,
+    vertices and duplicates, the elapsed seconds and the lines per second.
+    """
+    if duplicates not in ('reject', 'first', 'min'):
+      raise ValueError('duplicates must be one of reject, first, min')
+    start = time.perf_counter()
+    if labels is None:
+      labels = {}
+    elif len(labels) > 0:                # prefilled vertices may belong to another graph
+      raise ValueError('labels must be an empty dictionary')
+    g = cls(directed)
+    outgoing = g._outgoing
+    incoming = g._incoming
+    Vertex = cls.Vertex
+    Edge = cls.Edge
+    lineno = count = dups = loops = 0
+    for lineno, record in enumerate(cls._read_lines(source, chunk_size), 1):
+      if isinstance(record, str):
+        record = record.split()
+        if not record or record[0].startswith('#'):
+          continue                       # blank line or comment
+      if len(record) < (3 if weighted else 2):
+        raise ValueError('line {0}: expected {1} fields'.format(lineno, 3 if weighted else 2))
+      a, b = record[0], record[1]
+      x = None
+      if weighted:
+        x = record[2]
+        if isinstance(x, str):
+          try:
+            x = int(x)
+          except ValueError:
+            try:
+              x = float(x)
+            except ValueError:
+              raise ValueError('line {0}: invalid weight {1!r}'.format(lineno, x)) from None
+      u = labels.get(a)
+      if u is None:
+        u = labels[a] = Vertex(a)
+        outgoing[u] = {}
+        if directed:
+          incoming[u] = {}
+      v = labels.get(b)
+      if v is None:
+        v = labels[b] = Vertex(b)
+        outgoing[v] = {}
+        if directed:
+          incoming[v] = {}
+      row = outgoing[u]
+      e = row.get(v)
+      if e is None:
+        row[v] = incoming[v][u] = Edge(u, v, x)
+        count += 1
+        if u is v:
+          loops += 1
+      else:
+        dups += 1
+        if duplicates == 'reject':
+          raise ValueError('line {0}: {1} and {2} are already adjacent'.format(lineno, a, b))
+        if duplicates == 'min' and x is not None and x < e._element:
+          e._element = x                 # shared by both maps, so one update suffices
+    g._edge_count = count                # counters are set once for the whole file
+    g._loops = 0 if directed else loops
+    g._changed()
+    if stats is not None:
+      elapsed = time.perf_counter() - start
+      stats['lines'] = lineno
+      stats['edges'] = count
+      stats['vertices'] = len(labels)
+      stats['duplicates'] = dups
+      stats['seconds'] = elapsed
+      stats['lines_per_second'] = lineno / elapsed if elapsed > 0 else float('inf')
+    return g
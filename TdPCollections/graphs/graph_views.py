@@ -0,0 +1,208 @@
+class GraphView:
+  """Read-only view of a graph that hides some of its vertices or edges.
+
+  A view keeps a reference to the underlying graph (a Graph, an IntGraph or
+  another view) and filters its answers on the fly; nothing is copied, so
+  later changes to the graph show through the view. Vertices and edges of
+  the view are those of the graph, and the view supports the read-only part
+  of the Graph interface, so the algorithms of this package run on it
+  directly. vertex_count, edge_count and degree are computed by iteration.
+  """
+
+  #------------------------- nonpublic utilities -------------------------
+  def _has_vertex(self, v):
+    """Return True if vertex v of the graph is part of the view."""
+    return True
+
+  def _has_edge(self, e, v):
+    """Return True if edge e, incident to visible vertex v, is part of the view."""
+    return True
+
+  def _validate_vertex(self, v):
+    """Verify that v is a vertex of this view."""
+    if not self._has_vertex(v):
+      raise ValueError('Vertex does not belong to this view.')
+
+  #------------------------- public methods -------------------------
+  def __init__(self, g):
+    """Create a view showing all of graph g."""
+    self._graph = g
+
+  def graph(self):
+    """Return the underlying graph."""
+    return self._graph
+
+  def is_directed(self):
+    """Return True if this is a directed graph; False if undirected."""
+    return self._graph.is_directed()
+
+  def version(self):
+    """Return the mutation version of the underlying graph.
+
+    A change to the predicate of an edge-filter view is not detected.
+    """
+    return self._graph.version()
+
+  def _observe(self, observer):
+    """Register observer with the underlying graph, if it reports its changes."""
+    observe = getattr(self._graph, '_observe', None)
+    if observe is not None:
+      observe(observer)
+
+  def vertex_count(self):
+    """Return the number of vertices in the view."""
+    return sum(1 for v in self.vertices())
+
+  def vertices(self):
+    """Return an iteration of all vertices of the view."""
+    return (v for v in self._graph.vertices() if self._has_vertex(v))
+
+  def edge_count(self):
+    """Return the number of edges in the view."""
+    return len(self.edges())
+
+  def edges(self):
+    """Return a set of all edges of the view."""
+    result = set()
+    for v in self.vertices():
+      result.update(self.incident_edges(v))
+    return result
+
+  def get_edge(self, u, v):
+    """Return the edge from u to v, or None if not adjacent in the view."""
+    self._validate_vertex(u)
+    self._validate_vertex(v)
+    e = self._graph.get_edge(u, v)
+    return e if e is not None and self._has_edge(e, u) else None
+
+  def degree(self, v, outgoing=True):
+    """Return number of (outgoing) edges incident to vertex v in the view.
+
+    If graph is directed, optional parameter used to count incoming edges.
+    """
+    return sum(1 for e in self.incident_edges(v, outgoing))
+
+  def incident_edges(self, v, outgoing=True):
+    """Return all (outgoing) edges incident to vertex v in the view.
+
+    If graph is directed, optional parameter used to request incoming edges.
+    """
+    self._validate_vertex(v)
+    for e in self._graph.incident_edges(v, outgoing):
+      if self._has_edge(e, v):
+        yield e
+
+  def freeze(self):
+    """Return a read-only CSRGraph snapshot of the view."""
+    from .csr_graph import CSRGraph
+    return CSRGraph.from_graph(self)
+
+  def subgraph(self, vertices):
+    """Return a view of the subgraph of this view induced by the given vertices."""
+    return SubgraphView(self, vertices)
+
+  def edge_filter(self, predicate):
+    """Return a view of this view keeping only the edges e for which predicate(e) is true."""
+    return EdgeFilterView(self, predicate)
+
+  def reversed(self):
+    """Return a view of this directed view with every edge reversed."""
+    return ReversedView(self)
+
+
+class SubgraphView(GraphView):
+  """View of the subgraph induced by a set of vertices."""
+
+  def __init__(self, g, vertices):
+    """Create the view of g induced by an iterable of its vertices."""
+    super().__init__(g)
+    self._vertices = dict.fromkeys(vertices)   # ordered set of vertex references
+    for v in self._vertices:
+      g.degree(v)                         # raises an error if v is not a vertex of g
+
+  def _has_vertex(self, v):
+    return v in self._vertices
+
+  def _has_edge(self, e, v):
+    return e.opposite(v) in self._vertices
+
+  def vertex_count(self):
+    """Return the number of vertices in the view."""
+    return len(self._vertices)
+
+  def vertices(self):
+    """Return an iteration of all vertices of the view."""
+    return iter(self._vertices)
+
+
+class EdgeFilterView(GraphView):
+  """View keeping every vertex and only the edges accepted by a predicate."""
+
+  def __init__(self, g, predicate):
+    """Create the view of g with the edges e for which predicate(e) is true.
+
+    The predicate is called each time an edge is examined, so it should be
+    cheap and must not change its answer while an algorithm runs.
+    """
+    super().__init__(g)
+    self._predicate = predicate
+
+  def _has_edge(self, e, v):
+    return self._predicate(e)
+
+  def _validate_vertex(self, v):
+    pass                                  # left to the underlying graph
+
+  def vertex_count(self):
+    """Return the number of vertices in the view."""
+    return self._graph.vertex_count()
+
+  def vertices(self):
+    """Return an iteration of all vertices of the view."""
+    return self._graph.vertices()
+
+
+class ReversedView(GraphView):
+  """View of a directed graph with every edge reversed.
+
+  The edges are those of the underlying graph, so their endpoints method
+  still reports the original direction; incident_edges, degree and
+  get_edge follow the reversed direction.
+  """
+
+  def __init__(self, g):
+    """Create the reversed view of directed graph g."""
+    if not g.is_directed():
+      raise ValueError('graph must be directed')
+    super().__init__(g)
+
+  def _validate_vertex(self, v):
+    pass                                  # left to the underlying graph
+
+  def vertex_count(self):
+    """Return the number of vertices in the view."""
+    return self._graph.vertex_count()
+
+  def vertices(self):
+    """Return an iteration of all vertices of the view."""
+    return self._graph.vertices()
+
+  def edge_count(self):
+    """Return the number of edges in the view."""
+    return self._graph.edge_count()
+
+  def edges(self):
+    """Return a set of all edges of the view."""
+    return self._graph.edges()
+
+  def get_edge(self, u, v):
+    """Return the edge from u to v in the view (the edge from v to u of the graph)."""
+    return self._graph.get_edge(v, u)
+
+  def degree(self, v, outgoing=True):
+    """Return number of (outgoing) edges incident to vertex v in the view."""
+    return self._graph.degree(v, not outgoing)
+
+  def incident_edges(self, v, outgoing=True):
+    """Return all (outgoing) edges incident to vertex v in the view."""
+    return self._graph.incident_edges(v, not outgoing)
@@ -0,0 +1,255 @@
+from array import array
+from .csr_graph import CSRGraph
+
+class IntGraph:
+  """Mutable graph with integer vertices 0..n-1 and typed-array adjacency.
+
+  The neighbors of each vertex are kept in a growable array('q') row, with
+  an optional parallel array of weights ('q' for integers, 'd' for floats).
+  An undirected edge is listed in the rows of both endpoints; a directed
+  edge is listed in the outgoing row of its origin and the incoming row of
+  its destination. Either way an edge takes two 8-byte slots, plus two
+  8-byte weights if the graph is weighted: 16 bytes per edge unweighted and
+  32 bytes weighted, against several hundred for a Graph. Rows grow
+  geometrically, so up to about 1/8 extra may be allocated, and each vertex
+  costs a fixed 64 to 80 bytes per row (memory_usage reports the total).
+
+  Rows are not sorted, so get_edge, insert_edge (which rejects parallel
+  edges) and remove_edge scan a row in O(deg) time; building a vertex of
+  degree d edge by edge costs O(d^2).
+
+  Edges are not stored as objects: incident_edges, get_edge and edges create
+  lightweight IntGraph.Edge objects on demand, which compare equal when they
+  join the same vertices. The graph supports the traversal interface of
+  Graph, so the algorithms of this package can run on it, and freeze
+  returns a CSRGraph snapshot for their array-based variants.
+  """
+
+  #------------------------- nested Edge class -------------------------
+  class Edge(CSRGraph.Edge):
+    """Lightweight edge of an IntGraph, created on demand."""
+    __slots__ = ()
+
+    def __init__(self, u, v, x):
+      """Do not call constructor directly. Edges are produced by the IntGraph."""
+      super().__init__(u, v, x)
+
+  #------------------------- nonpublic utilities -------------------------
+  def _validate_vertex(self, u):
+    """Verify that u is a vertex of this graph."""
+    if not isinstance(u, int):
+      raise TypeError('Vertex id expected')
+    if not 0 <= u < len(self._out):
+      raise ValueError('Vertex does not belong to this graph.')
+
+  def _make_edge(self, u, v, x):
+    """Return the Edge from u to v (canonical orientation if undirected)."""
+    if not self._directed and v < u:
+      u, v = v, u
+    return self.Edge(u, v, x)
+
+  def _slot(self, u, v):
+    """Return the position of v in the outgoing row of u, or None if not adjacent."""
+    self._validate_vertex(u)
+    self._validate_vertex(v)
+    try:
+      return self._out[u].index(v)           # a single scan of the row
+    except ValueError:
+      return None
+
+  @staticmethod
+  def _remove_slot(row, weights, k):
+    """Remove position k of row (and weights) by moving the last entry into it."""
+    last = len(row) - 1
+    row[k] = row[last]
+    del row[last]
+    if weights is not None:
+      weights[k] = weights[last]
+      del weights[last]
+
+  #------------------------- IntGraph methods -------------------------
+  def __init__(self, n=0, directed=False, weights=None):
+    """Create a graph with vertices 0..n-1 and no edges (undirected, by default).
+
+    weights is None for an unweighted graph, or the typecode of the weight
+    arrays: 'q' for integer weights or 'd' for float weights.
+    """
+    if weights not in (None, 'q', 'd'):
+      raise ValueError("weights must be None, 'q' or 'd'")
+    self._directed = directed
+    self._typecode = weights
+    self._out = []                           # row of neighbors of each vertex
+    self._out_weights = [] if weights is not None else None
+    # only create incoming rows for directed graph; use alias for undirected
+    self._in = [] if directed else self._out
+    self._in_weights = [] if directed and weights is not None else self._out_weights
+    self._edge_count = 0
+    self._version = 0                        # incremented by every insertion or removal
+    for _ in range(n):
+      self.insert_vertex()
+
+  def is_directed(self):
+    """Return True if this is a directed graph; False if undirected."""
+    return self._directed
+
+  def is_weighted(self):
+    """Return True if the edges carry numeric weights."""
+    return self._typecode is not None
+
+  def version(self):
+    """Return the mutation version, which changes whenever a vertex or edge is inserted or removed."""
+    return self._version
+
+  def vertex_count(self):
+    """Return the number of vertices in the graph."""
+    return len(self._out)
+
+  def vertices(self):
+    """Return an iteration of all vertices of the graph."""
+    return range(len(self._out))
+
+  def edge_count(self):
+    """Return the number of edges in the graph."""
+    return self._edge_count
+
+  def edges(self):
+    """Return a set of all edges of the graph."""
+    return set(self.iter_edges())
+
+  def iter_edges(self):
+    """Generate every edge of the graph once."""
+    for u, row in enumerate(self._out):
+      weights = self._out_weights[u] if self._out_weights is not None else None
+      for k, v in enumerate(row):
+        if self._directed or u <= v:         # report undirected edges once
+          yield self._make_edge(u, v, weights[k] if weights is not None else None)
+
+  def get_edge(self, u, v):
+    """Return the edge from u to v, or None if not adjacent.
+
+    Rows are unsorted, so this scans the row of u in O(deg(u)) time.
+    """
+    k = self._slot(u, v)
+    if k is None:
+      return None
+    return self._make_edge(u, v, self._out_weights[u][k] if self._out_weights is not None else None)
+
+  def degree(self, u, outgoing=True):
+    """Return number of (outgoing) edges incident to vertex u in the graph.
+
+    If graph is directed, optional parameter used to count incoming edges.
+    """
+    self._validate_vertex(u)
+    return len(self._out[u] if outgoing else self._in[u])
+
+  def neighbors(self, u, outgoing=True):
+    """Return the array of (outgoing) neighbors of vertex u; it must not be modified."""
+    self._validate_vertex(u)
+    return self._out[u] if outgoing else self._in[u]
+
+  def incident_edges(self, u, outgoing=True):
+    """Return all (outgoing) edges incident to vertex u in the graph.
+
+    If graph is directed, optional parameter used to request incoming edges.
+    """
+    self._validate_vertex(u)
+    row = self._out[u] if outgoing else self._in[u]
+    weights = self._out_weights if outgoing else self._in_weights
+    weights = weights[u] if weights is not None else None
+    for k, v in enumerate(row):
+      x = weights[k] if weights is not None else None
+      yield self._make_edge(u, v, x) if outgoing else self._make_edge(v, u, x)
+
+  def insert_vertex(self, x=None):
+    """Insert and return a new vertex (the next integer id).
+
+    Vertices carry no element; x is accepted, as None only, for
+    compatibility with Graph.insert_vertex.
+    """
+    if x is not None:
+      raise ValueError('IntGraph vertices have no element')
+    self._out.append(array('q'))
+    if self._out_weights is not None:
+      self._out_weights.append(array(self._typecode))
+    if self._directed:
+      self._in.append(array('q'))            # need distinct row for incoming edges
+      if self._in_weights is not None:
+        self._in_weights.append(array(self._typecode))
+    self._version += 1
+    return len(self._out) - 1
+
+  def insert_edge(self, u, v, x=None):
+    """Insert and return a new edge from u to v with weight x.
+
+    Raise a ValueError if u and v are not vertices of the graph, if they are
+    already adjacent, if x is missing in a weighted graph or given in an
+    unweighted one, and a TypeError or OverflowError if x does not fit the
+    weight typecode; the graph is unchanged on error. Checking for an
+    existing edge scans the row of u, so the insertion takes O(deg(u)) time
+    and giving a single vertex d neighbors costs O(d^2) overall.
+    """
+    if self._slot(u, v) is not None:         # includes error checking
+      raise ValueError('u and v are already adjacent')
+    if self._typecode is None:
+      if x is not None:
+        raise ValueError('unweighted graph takes no edge weight')
+    elif x is None:
+      raise ValueError('weighted graph requires an edge weight')
+    else:
+      x = array(self._typecode, [x])[0]      # convert (or reject) before any row changes
+    self._out[u].append(v)
+    if self._out_weights is not None:
+      self._out_weights[u].append(x)
+    if self._directed or u != v:             # a self-loop is listed only once
+      self._in[v].append(u)
+      if self._in_weights is not None:
+        self._in_weights[v].append(x)
+    self._edge_count += 1
+    self._version += 1
+    return self._make_edge(u, v, x)
+
+  def remove_edge(self, u, v=None):
+    """Remove the edge from u to v and return its weight (None if unweighted).
+
+    As Graph.remove_edge, an Edge may also be given alone as u. The order of
+    the remaining neighbors of u and v may change. This takes
+    O(deg(u) + deg(v)) time. Raise a ValueError if u and v are not adjacent,
+    and a TypeError if u is given alone but is not an Edge.
+    """
+    if v is None:                            # u is an Edge
+      if not isinstance(u, CSRGraph.Edge):
+        raise TypeError('Edge expected when v is omitted')
+      u, v = u.endpoints()
+    k = self._slot(u, v)
+    if k is None:
+      raise ValueError('u and v are not adjacent')
+    x = self._out_weights[u][k] if self._out_weights is not None else None
+    self._remove_slot(self._out[u], self._out_weights[u] if self._out_weights is not None else None, k)
+    if self._directed or u != v:
+      row = self._in[v]
+      self._remove_slot(row, self._in_weights[v] if self._in_weights is not None else None,
+                        row.index(u))
+    self._edge_count -= 1
+    self._version += 1
+    return x
+
+  def memory_usage(self):
+    """Return the number of bytes held by the adjacency arrays and their lists."""
+    rows = [self._out, self._out_weights]
+    if self._directed:
+      rows += [self._in, self._in_weights]
+    return sum(r.__sizeof__() + sum(a.__sizeof__() for a in r) for r in rows if r is not None)
+
+  def freeze(self):
+    """Return a read-only CSRGraph snapshot of the graph (with the same vertex ids)."""
+    offsets = array('q', [0])
+    targets = array('q')
+    for row in self._out:
+      targets.extend(row)
+      offsets.append(len(targets))
+    weights = None
+    if self._out_weights is not None:
+      weights = array(self._typecode)
+      for row in self._out_weights:
+        weights.extend(row)
+    return CSRGraph(offsets, targets, weights, self._directed)
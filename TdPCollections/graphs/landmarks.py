@@ -0,0 +1,194 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from .csr_graph import CSRGraph
+from .shortest_paths import shortest_path_lengths, astar_shortest_path
+
+try:
+  import numpy as np                   # optional: distance matrix and vectorized bounds
+except ImportError:
+  np = None
+
+INF = float('inf')
+
+#------------------------- worker side -------------------------
+_shared = None                 # (forward, backward) snapshots built in each worker process
+
+def _init_worker(forward, backward):
+  global _shared
+  _shared = tuple(CSRGraph(*arrays, directed=True) if arrays is not None else None
+                  for arrays in (forward, backward))
+
+def _distances(csr, landmark):
+  """Return an array('d') of the distances from landmark to every vertex of csr."""
+  lengths = shortest_path_lengths(csr, landmark)
+  row = array('d', [INF]) * csr.vertex_count()
+  for v, d in lengths.items():
+    row[v] = d
+  return row
+
+def _distances_shared(landmark, backward):
+  return _distances(_shared[1 if backward else 0], landmark)
+
+
+class LandmarkIndex:
+  """Landmark (ALT) distance oracle for a weighted graph.
+
+  Shortest-path distances from (and, for a directed graph, to) k landmark
+  vertices are computed once. By the triangle inequality they give, in O(k)
+  time, a lower and an upper bound on the distance between any two
+  vertices, and the lower bounds form an admissible A* heuristic for exact
+  queries. The distances are kept in an n-by-k NumPy matrix of float64
+  (8k bytes per vertex and direction) when NumPy is available, and in
+  typed arrays otherwise.
+  """
+
+  #------------------------- construction -------------------------
+  def __init__(self, g, k=16, strategy='farthest', workers=1, seed=None):
+    """Build the index of weighted graph g (a Graph or a CSRGraph) with k landmarks.
+
+    strategy 'degree' takes the k vertices of largest degree; 'farthest'
+    starts from a random vertex (chosen with seed) and repeatedly adds the
+    vertex farthest from the landmarks chosen so far, preferring vertices
+    they do not reach at all. workers is the number of processes running
+    the searches (None uses one per CPU); with 'farthest', landmarks are
+    then added in rounds of workers, each round using the distances of the
+    previous ones.
+    """
+    if strategy not in ('farthest', 'degree'):
+      raise ValueError("strategy must be 'farthest' or 'degree'")
+    csr = g if isinstance(g, CSRGraph) else g.freeze()
+    if not csr.is_weighted():
+      raise ValueError('graph must be weighted')
+    self._graph = g
+    self._csr = csr
+    n = csr.vertex_count()
+    k = min(k, n)
+    directed = csr.is_directed()
+    backward = csr.arrays(False) if directed else None
+    self._reverse = CSRGraph(*backward, directed=True) if directed else None
+
+    if workers is None:
+      workers = os.cpu_count() or 1
+    pool = None
+    if workers > 1 and k > 1:
+      pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(csr.arrays(), backward))
+    try:
+      landmarks = []
+      rows = []                                        # distances from each landmark
+      reverse_rows = []                                # distances to each landmark
+      nearest = array('d', [INF]) * n                  # distance from the closest landmark
+      while len(landmarks) < k:
+        if strategy == 'degree':
+          batch = sorted(range(n), key=lambda v: -(csr.degree(v) + (csr.degree(v, False)
+                                                                   if directed else 0)))[:k]
+        elif len(landmarks) == 0:
+          batch = [random.Random(seed).randrange(n)]
+        else:
+          chosen = set(landmarks)
+          candidates = [v for v in range(n) if v not in chosen]
+          candidates.sort(key=lambda v: -nearest[v])   # unreached vertices (inf) first
+          batch = candidates[:min(workers, k - len(landmarks))]
+        new_rows = self._search(pool, batch, False)
+        if directed:
+          reverse_rows.extend(self._search(pool, batch, True))
+        for row in new_rows:
+          for v in range(n):
+            if row[v] < nearest[v]:
+              nearest[v] = row[v]
+        landmarks.extend(batch)
+        rows.extend(new_rows)
+    finally:
+      if pool is not None:
+        pool.shutdown()
+    self._landmarks = landmarks
+    self._from = self._matrix(rows)
+    self._to = self._matrix(reverse_rows) if directed else self._from
+
+  def _search(self, pool, batch, backward):
+    """Return the distance rows of the landmarks in batch (to them if backward)."""
+    if pool is not None:
+      return list(pool.map(_distances_shared, batch, [backward] * len(batch)))
+    csr = self._reverse if backward else self._csr
+    return [_distances(csr, v) for v in batch]
+
+  def _matrix(self, rows):
+    """Store rows (one per landmark) as an n-by-k matrix, or as per-vertex arrays."""
+    n = self._csr.vertex_count()
+    if np is not None:
+      if len(rows) == 0:
+        return np.zeros((n, 0))
+      return np.ascontiguousarray(np.array(rows, dtype=np.float64).T)
+    return [array('d', (row[v] for row in rows)) for v in range(n)]
+
+  #------------------------- nonpublic utilities -------------------------
+  def _id(self, v):
+    """Return the vertex id of v (an id, or a vertex of the indexed Graph or IntGraph)."""
+    return v if self._csr is self._graph else self._csr.index(v)
+
+  def _lower(self, u, v):
+    """Return the landmark lower bound on the distance from id u to id v."""
+    fu, fv, tu, tv = self._from[u], self._from[v], self._to[u], self._to[v]
+    if np is not None:
+      # d(u,v) >= d(L,v) - d(L,u) and d(u,v) >= d(u,L) - d(v,L); inf - inf gives nan
+      with np.errstate(invalid='ignore'):
+        bound = np.fmax(fv - fu, tu - tv)
+      return float(np.nanmax(bound, initial=0.0))
+    best = 0.0
+    for i in range(len(fu)):
+      for a, b in ((fv[i], fu[i]), (tu[i], tv[i])):
+        if a == INF and b == INF:
+          continue                                     # no information from this landmark
+        if a - b > best:
+          best = a - b
+    return best
+
+  #------------------------- public methods -------------------------
+  def landmarks(self):
+    """Return the list of landmarks (vertices of the indexed Graph, or ids)."""
+    return [self._csr.vertex(v) if self._csr is not self._graph else v for v in self._landmarks]
+
+  def landmark_count(self):
+    """Return the number of landmarks."""
+    return len(self._landmarks)
+
+  def memory_usage(self):
+    """Return the number of bytes of the distance tables."""
+    tables = [self._from] if self._to is self._from else [self._from, self._to]
+    if np is not None:
+      return sum(t.nbytes for t in tables)
+    return sum(len(row) * row.itemsize for t in tables for row in t)
+
+  def lower_bound(self, u, v):
+    """Return a lower bound on the distance from u to v in O(k) time (inf: unreachable)."""
+    return self._lower(self._id(u), self._id(v))
+
+  def upper_bound(self, u, v):
+    """Return an upper bound on the distance from u to v in O(k) time.
+
+    The bound is the length of the best path through a landmark; it is
+    infinite if no landmark lies on a path from u to v.
+    """
+    u, v = self._id(u), self._id(v)
+    if u == v:
+      return 0
+    if np is not None:
+      total = self._to[u] + self._from[v]
+      return float(total.min()) if len(total) > 0 else INF
+    return min((a + b for a, b in zip(self._to[u], self._from[v])), default=INF)
+
+  def heuristic(self, dst):
+    """Return a function giving, for each vertex v, a lower bound on its distance to dst.
+
+    The function is admissible and consistent, as astar_shortest_path requires.
+    """
+    target = self._id(dst)
+    lower = self._lower
+    index = self._id
+    return lambda v: lower(index(v), target)
+
+  def shortest_path(self, src, dst):
+    """Return (path, cost, settled) of an exact A* search guided by the landmarks."""
+    return astar_shortest_path(self._graph, src, dst, self.heuristic(dst))
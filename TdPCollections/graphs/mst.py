@@ -19,15 +19,40 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import RawArray
 from ..priority_queue.heap_priority_queue import HeapPriorityQueue
 from ..priority_queue.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
-from .partition import Partition
+from .partition import Partition, ArrayPartition
+from .csr_graph import CSRGraph
+
+try:
+  import numpy as np                   # optional: vectorized sorting and dense Prim
+except ImportError:
+  np = None
+
+DENSE_PRIM_DENSITY = 0.25              # MST_PrimJarnik uses the matrix variant at this density
 
 def MST_PrimJarnik(g):
   """Compute a minimum spanning tree of weighted graph g.
 
   Return a list of edges that comprise the MST (in arbitrary order).
+
+  g may also be a weighted CSRGraph snapshot. If at least DENSE_PRIM_DENSITY
+  of all vertex pairs are adjacent and the weights are plain numbers, the
+  O(n^2) MST_PrimJarnik_dense is used instead of the priority queue; other
+  weights (such as Decimal or Fraction) always use the priority queue.
   """
+  n = g.vertex_count()
+  if n > 1 and 2 * g.edge_count() >= DENSE_PRIM_DENSITY * n * (n - 1):
+    csr = g if isinstance(g, CSRGraph) else g.freeze()
+    if csr.is_weighted():                           # numeric typed-array weights
+      tree = MST_PrimJarnik_dense(csr)
+      return tree if csr is g else csr.translate(tree)
+  if isinstance(g, CSRGraph):
+    return _MST_PrimJarnik_csr(g)
   d = {}                               # d[v] is bound on distance to tree
   tree = []                            # list of edges in spanning tree
   pq = AdaptableHeapPriorityQueue()   # d[v] maps to value (v, e=(u,v))
@@ -59,12 +84,130 @@ def MST_PrimJarnik(g):
 
   return tree
 
+def _MST_PrimJarnik_csr(g):
+  """Prim-Jarnik algorithm over the arrays of CSRGraph g."""
+  offsets, targets, weights = g.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  n = g.vertex_count()
+  d = [float('inf')] * n
+  tree = []
+  pq = AdaptableHeapPriorityQueue()   # d[v] maps to value (v, (u,k)) for edge slot k of u
+  if n > 0:
+    d[0] = 0
+  pqlocator = [pq.add(d[v], (v,None)) for v in range(n)]
+
+  while not pq.is_empty():
+    key,value = pq.remove_min()
+    u,slot = value
+    pqlocator[u] = None
+    if slot is not None:
+      tree.append(g.edge_at(*slot))
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if pqlocator[v] is not None:
+        wgt = weights[k]
+        if wgt < d[v]:
+          d[v] = wgt
+          pq.update(pqlocator[v], wgt, (v, (u,k)))
+
+  return tree
+
+def _weight_matrix(csr):
+  """Return the n-by-n matrix of least edge weights of csr (infinite if not adjacent)."""
+  offsets, targets, weights = csr.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  n = csr.vertex_count()
+  if np is not None:
+    w = np.full((n, n), np.inf)
+    source = np.repeat(np.arange(n), np.diff(np.frombuffer(offsets, dtype=np.int64)))
+    target = np.frombuffer(targets, dtype=np.int64)
+    values = np.frombuffer(weights, dtype=csr.weight_type()).astype(np.float64)
+    np.minimum.at(w, (source, target), values)
+    np.minimum.at(w, (target, source), values)       # edges are used in both directions
+    return w
+  w = [[float('inf')] * n for _ in range(n)]
+  for u in range(n):
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if weights[k] < w[u][v]:
+        w[u][v] = w[v][u] = weights[k]
+  return w
+
+def _prim_dense(w):
+  """Return the (parent, child) pairs of a minimum spanning forest of square matrix w."""
+  n = len(w)
+  pairs = []
+  if np is not None:
+    w = np.asarray(w, dtype=np.float64)
+    d = np.full(n, np.inf)                           # d[v] is bound on distance to tree
+    parent = np.full(n, -1, dtype=np.int64)
+    outside = np.ones(n, dtype=bool)                 # vertices not yet in the tree
+    for _ in range(n):
+      v = int(np.argmin(d))                          # vertices in the tree have d = inf
+      if d[v] == np.inf:                             # start a new tree of the forest
+        v = int(np.argmax(outside))
+      elif parent[v] >= 0:
+        pairs.append((int(parent[v]), v))
+      outside[v] = False
+      d[v] = np.inf
+      better = outside & (w[v] < d)                  # vectorized relaxation
+      d[better] = w[v][better]
+      parent[better] = v
+    return pairs
+  inf = float('inf')
+  d = [inf] * n
+  parent = [-1] * n
+  outside = set(range(n))
+  for _ in range(n):
+    v = min(outside, key=d.__getitem__)
+    if d[v] != inf:
+      pairs.append((parent[v], v))
+    outside.remove(v)
+    row = w[v]
+    for x in outside:
+      if row[x] < d[x]:
+        d[x] = row[x]
+        parent[x] = v
+  return pairs
+
+def MST_PrimJarnik_dense(g):
+  """Compute a minimum spanning forest with the O(n^2) array form of Prim-Jarnik.
+
+  g may be a weighted Graph or CSRGraph, or a square weight matrix (a NumPy
+  array or a list of lists, infinite where vertices are not adjacent). With
+  NumPy the next vertex is chosen by argmin over a distance vector, which is
+  then lowered with a single vectorized comparison against its matrix row;
+  this suits near-complete graphs, where a priority queue would handle
+  almost every edge.
+
+  Return the list of forest edges: the graph's edges for a Graph or
+  CSRGraph, and (u, v, weight) tuples of indices for a matrix.
+  """
+  if not hasattr(g, 'vertex_count'):                 # a weight matrix
+    return [(u, v, g[u][v]) for u, v in _prim_dense(g)]
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  offsets, targets, weights = csr.arrays()
+  tree = []
+  for u, v in _prim_dense(_weight_matrix(csr)):
+    best = None                                      # least edge slot joining u and v
+    for a, b in ((u, v), (v, u)):
+      for k in range(offsets[a], offsets[a+1]):
+        if targets[k] == b and (best is None or weights[k] < weights[best[1]]):
+          best = (a, k)
+    tree.append(csr.edge_at(*best))
+  if csr is not g:
+    tree = csr.translate(tree)
+  return tree
+
 def MST_Kruskal(g):
   """Compute a minimum spanning tree of a graph using Kruskal's algorithm.
 
   Return a list of edges that comprise the MST.
 
   The elements of the graph's edges are assumed to be weights.
+  g may also be a CSRGraph snapshot.
   """
   tree = []                   # list of edges in spanning tree
   pq = HeapPriorityQueue()    # entries are edges in G, with weights as key
@@ -89,3 +232,166 @@ def MST_Kruskal(g):
       forest.union(a,b)
 
   return tree
+
+def MST_Kruskal_sorted(g):
+  """Compute a minimum spanning forest of weighted graph g with a sort-based Kruskal.
+
+  g may be a Graph or a CSRGraph snapshot. The edge weights are sorted once
+  (with NumPy's argsort when available, otherwise list.sort) and the edges
+  are then scanned in order, joining integer vertex ids in an ArrayPartition.
+
+  Return a pair (tree, total): the list of edges of the forest and their
+  total weight. For a Graph the edges are the original ones.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  offsets, targets, weights = csr.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  n = csr.vertex_count()
+  if np is not None:
+    source = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.frombuffer(offsets, dtype=np.int64)))
+    target = np.frombuffer(targets, dtype=np.int64)
+    slots = np.arange(len(targets), dtype=np.int64)
+    if not csr.is_directed():
+      slots = slots[source <= target]              # each undirected edge once
+    slots = slots[np.argsort(np.frombuffer(weights, dtype=csr.weight_type())[slots], kind='stable')]
+    source = source[slots].tolist()
+    slots = slots.tolist()
+  else:
+    source = array('q')
+    for u in range(n):
+      source.extend([u] * (offsets[u+1] - offsets[u]))
+    if csr.is_directed():
+      slots = list(range(len(targets)))
+    else:
+      slots = [k for k in range(len(targets)) if source[k] <= targets[k]]
+    slots.sort(key=weights.__getitem__)
+    source = [source[k] for k in slots]
+
+  forest = ArrayPartition(n)
+  union = forest.union
+  tree = []
+  total = 0
+  for u, k in zip(source, slots):
+    if union(u, targets[k]):
+      tree.append((u, k))
+      total += weights[k]
+      if len(tree) == n - 1:
+        break                                      # spanning tree complete
+  edges = [csr.edge_at(u, k) for u, k in tree]
+  if csr is not g:
+    edges = csr.translate(edges)
+  return edges, total
+
+#------------------------- Boruvka worker side -------------------------
+_shared = None                 # (source, target, weight, component) inherited by worker processes
+
+def _shared_copy(typecode, a):
+  """Return a RawArray holding a copy of a, filled with a single buffer copy."""
+  shared = RawArray(typecode, len(a))        # zeroed; filling it item by item is slow
+  memoryview(shared).cast('B')[:] = memoryview(a).cast('B')
+  return shared
+
+def _init_worker(source, target, weight, component, weight_type):
+  global _shared
+  # view the shared ctypes arrays as typed memoryviews, which index faster
+  _shared = tuple(memoryview(a).cast('B').cast(code) for a, code in
+                  ((source, 'q'), (target, 'q'), (weight, weight_type), (component, 'q')))
+
+def _cheapest_edges(source, target, weight, component, lo, hi):
+  """Return {component: edge} with the cheapest edge leaving each component among edges lo..hi-1.
+
+  Ties are broken by edge index, so that all chunks agree on a single order.
+  """
+  best = {}
+  for k in range(lo, hi):
+    a = component[source[k]]
+    b = component[target[k]]
+    if a != b:                                     # edge leaves its component
+      w = weight[k]
+      for c in (a, b):
+        j = best.get(c)
+        if j is None or w < weight[j] or (w == weight[j] and k < j):
+          best[c] = k
+  return best
+
+def _cheapest_edges_shared(lo, hi):
+  return _cheapest_edges(*_shared, lo, hi)
+
+def MST_Boruvka(g, workers=1, chunks=None):
+  """Compute a minimum spanning forest of weighted graph g with Boruvka's algorithm.
+
+  g may be a Graph or a CSRGraph snapshot. Each round finds the cheapest
+  edge leaving every component and adds them all to the forest, at least
+  halving the number of components. The edge list is split into chunks that
+  a pool of processes scans in parallel over shared arrays; the calling
+  process merges their answers and contracts the components.
+
+  workers is the number of processes (the default 1 runs everything in the
+  calling process; None uses one per CPU) and chunks the number of pieces
+  the edges are split into (default: 4 per worker).
+
+  Return a pair (tree, total) as MST_Kruskal_sorted does.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  offsets, targets, weights = csr.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  n = csr.vertex_count()
+  if workers is None:
+    workers = os.cpu_count() or 1
+  if chunks is None:
+    chunks = 4 * workers
+
+  # one entry per edge (undirected edges once), kept in shared memory
+  slots = array('q')
+  source = array('q')
+  for u in range(n):
+    for k in range(offsets[u], offsets[u+1]):
+      if csr.is_directed() or u <= targets[k]:
+        slots.append(k)
+        source.append(u)
+  m = len(slots)
+  target = array('q', (targets[k] for k in slots))
+  weight = array(csr.weight_type(), (weights[k] for k in slots))
+  chunks = max(1, min(chunks, m))
+  step = -(-m // chunks) if m > 0 else 1
+  ranges = [(lo, min(lo + step, m)) for lo in range(0, m, step)]
+
+  forest = ArrayPartition(n)
+  tree = []
+  total = 0
+  pool = None
+  if workers > 1 and len(ranges) > 1:
+    component = RawArray('q', n)
+    shared = (_shared_copy('q', source), _shared_copy('q', target),
+              _shared_copy(weight.typecode, weight), component, weight.typecode)
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=shared)
+  else:
+    component = array('q', range(n))
+  try:
+    while len(tree) < n - 1:
+      component[:] = forest.find_many(range(n))    # contract the current components
+      if pool is not None:
+        parts = pool.map(_cheapest_edges_shared, *zip(*ranges))
+      else:
+        parts = [_cheapest_edges(source, target, weight, component, lo, hi) for lo, hi in ranges]
+      best = {}
+      for part in parts:                           # merge answers with the same tie-breaking
+        for c, k in part.items():
+          j = best.get(c)
+          if j is None or weight[k] < weight[j] or (weight[k] == weight[j] and k < j):
+            best[c] = k
+      if len(best) == 0:
+        break                                      # remaining components are disconnected
+      for k in best.values():
+        if forest.union(source[k], target[k]):     # an edge may be cheapest for both sides
+          tree.append(k)
+          total += weight[k]
+  finally:
+    if pool is not None:
+      pool.shutdown()
+  edges = [csr.edge_at(source[k], slots[k]) for k in tree]
+  if csr is not g:
+    edges = csr.translate(edges)
+  return edges, total
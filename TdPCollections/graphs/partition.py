@@ -19,6 +19,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from array import array
+
 class Partition:
   """Union-find structure for maintaining disjoint sets."""
 
@@ -52,9 +54,12 @@ class Partition:
   def find(self, p):
     """Finds the group containging p and return the position of its leader."""
     self._validate(p)
-    if p._parent != p:
-      p._parent = self.find(p._parent)    # overwrite p._parent after recursion
-    return p._parent
+    leader = p
+    while leader._parent is not leader:   # first pass: locate the leader
+      leader = leader._parent
+    while p is not leader:                # second pass: compress the path
+      p._parent, p = leader, p._parent
+    return leader
 
   def union(self, p, q):
     """Merges the groups containg elements p and q (if distinct)."""
@@ -67,3 +72,108 @@ class Partition:
       else:
         a._parent = b
         b._size += a._size
+
+
+class ArrayPartition:
+  """Union-find structure over the integers 0..n-1, stored in flat arrays.
+
+  Each element is its own id; parent and size live in typed arrays, find uses
+  path halving (no recursion) and union merges the smaller group into the
+  larger one.
+  """
+
+  def __init__(self, n=0):
+    """Create n singleton groups 0..n-1."""
+    self._parent = array('q', range(n))
+    self._size = array('q', [1]) * n
+    self._groups = n
+
+  def __len__(self):
+    """Return the number of elements."""
+    return len(self._parent)
+
+  def group_count(self):
+    """Return the number of disjoint groups."""
+    return self._groups
+
+  def make_group(self):
+    """Add a new singleton group and return its element id."""
+    self._parent.append(len(self._parent))
+    self._size.append(1)
+    self._groups += 1
+    return len(self._parent) - 1
+
+  def find(self, i):
+    """Return the leader of the group containing element i."""
+    parent = self._parent
+    while parent[i] != i:
+      parent[i] = parent[parent[i]]       # path halving
+      i = parent[i]
+    return i
+
+  def union(self, i, j):
+    """Merge the groups containing i and j; return True if they were distinct."""
+    a = self.find(i)
+    b = self.find(j)
+    if a == b:
+      return False
+    if self._size[a] > self._size[b]:
+      a, b = b, a
+    self._parent[a] = b                   # smaller group a joins b
+    self._size[b] += self._size[a]
+    self._groups -= 1
+    return True
+
+  def group_size(self, i):
+    """Return the number of elements in the group containing i."""
+    return self._size[self.find(i)]
+
+  def union_many(self, pairs):
+    """Merge the groups of every (i, j) pair; return the number of merges."""
+    parent = self._parent
+    size = self._size
+    merges = 0
+    for i, j in pairs:                    # find and union inlined for bulk speed
+      while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+      while parent[j] != j:
+        parent[j] = parent[parent[j]]
+        j = parent[j]
+      if i != j:
+        if size[i] > size[j]:
+          i, j = j, i
+        parent[i] = j
+        size[j] += size[i]
+        merges += 1
+    self._groups -= merges
+    return merges
+
+  def find_many(self, ids):
+    """Return an array with the leader of each element of ids."""
+    find = self.find
+    return array('q', (find(i) for i in ids))
+
+  def labels(self):
+    """Return an array labelling each element with its group number.
+
+    Groups are numbered 0..c-1 in order of their smallest element.
+    """
+    find = self.find
+    label = array('q', [-1]) * len(self._parent)
+    count = 0
+    for i in range(len(self._parent)):
+      leader = find(i)
+      if label[leader] < 0:               # first element seen of this group
+        label[leader] = count
+        count += 1
+      label[i] = label[leader]
+    return label
+
+  def size_histogram(self):
+    """Return a dictionary mapping each group size to the number of groups of that size."""
+    histogram = {}
+    for i in range(len(self._parent)):
+      if self._parent[i] == i:            # one leader per group
+        histogram[self._size[i]] = histogram.get(self._size[i], 0) + 1
+    return histogram
@@ -0,0 +1,124 @@
+import sys
+from collections import OrderedDict
+from .bfs import BFS
+from .shortest_paths import shortest_path_lengths, shortest_path_tree
+from .topological_sort import topological_sort
+
+def _result_size(result):
+  """Estimate the bytes held by a cached result (vertices and edges are shared with the graph)."""
+  size = sys.getsizeof(result)
+  values = result.values() if isinstance(result, dict) else result
+  for x in values:
+    if isinstance(x, (int, float)) and not isinstance(x, bool):
+      size += sys.getsizeof(x)        # distances are owned by the result
+  return size
+
+
+class QueryCache:
+  """Memoizing layer over repeated queries on one graph.
+
+  Results of shortest_path_lengths, shortest_path_tree, BFS and
+  topological_sort are kept in least-recently-used order, keyed by the
+  query, its source and the graph version, so the graph must have a
+  version method (Graph, IntGraph, the graph views and CSRGraph, whose
+  version never changes, all do). A Graph, or a view of one, is also
+  observed: as soon as a vertex or edge is inserted or removed every entry
+  is dropped; for an IntGraph stale entries are simply never hit again.
+  Changing an edge element in place is not detected; call clear.
+
+  Results are shared between callers and must not be modified.
+  """
+
+  def __init__(self, g, max_entries=128, max_bytes=None):
+    """Create an empty cache for graph g.
+
+    At most max_entries results are kept and, if max_bytes is given, their
+    estimated total size stays below max_bytes; the least recently used
+    results are evicted first.
+    """
+    if max_entries < 1:
+      raise ValueError('max_entries must be positive')
+    if not hasattr(g, 'version'):
+      raise TypeError('graph must have a version method')
+    self._graph = g
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._entries = OrderedDict()     # key -> (result, size), least recent first
+    self._bytes = 0
+    self._hits = self._misses = self._evictions = self._invalidations = 0
+    if hasattr(g, '_observe'):
+      g._observe(self)
+
+  #------------------------- nonpublic utilities -------------------------
+  def _graph_changed(self, g):
+    """Drop every entry; called by the graph after each mutation."""
+    if self._entries:
+      self._entries.clear()
+      self._bytes = 0
+      self._invalidations += 1
+
+  def _lookup(self, query, source, compute):
+    """Return the cached result of (query, source), computing it on a miss."""
+    key = (query, source, self._graph.version())
+    entry = self._entries.get(key)
+    if entry is not None:
+      self._hits += 1
+      self._entries.move_to_end(key)
+      return entry[0]
+    self._misses += 1
+    result = compute()
+    size = _result_size(result)
+    self._entries[key] = (result, size)
+    self._bytes += size
+    while len(self._entries) > self._max_entries or (
+        self._max_bytes is not None and self._bytes > self._max_bytes and len(self._entries) > 1):
+      _, (_, old_size) = self._entries.popitem(last=False)
+      self._bytes -= old_size
+      self._evictions += 1
+    return result
+
+  #------------------------- cached queries -------------------------
+  def shortest_path_lengths(self, src):
+    """Return the cached result of shortest_path_lengths(g, src)."""
+    return self._lookup('lengths', src, lambda: shortest_path_lengths(self._graph, src))
+
+  def shortest_path_tree(self, src):
+    """Return the cached shortest-path tree from src (built from the cached lengths)."""
+    return self._lookup('tree', src,
+                        lambda: shortest_path_tree(self._graph, src, self.shortest_path_lengths(src)))
+
+  def bfs(self, src):
+    """Return the cached BFS forest {vertex: discovery edge} of the vertices reachable from src."""
+    def compute():
+      discovered = {src: None}
+      BFS(self._graph, src, discovered)
+      return discovered
+    return self._lookup('bfs', src, compute)
+
+  def topological_sort(self):
+    """Return the cached result of topological_sort(g)."""
+    return self._lookup('topological_sort', None, lambda: topological_sort(self._graph))
+
+  #------------------------- bookkeeping -------------------------
+  def graph(self):
+    """Return the cached graph."""
+    return self._graph
+
+  def __len__(self):
+    """Return the number of cached results."""
+    return len(self._entries)
+
+  def memory_usage(self):
+    """Return the estimated number of bytes held by the cached results."""
+    return self._bytes
+
+  def clear(self):
+    """Drop every cached result."""
+    self._entries.clear()
+    self._bytes = 0
+
+  def stats(self):
+    """Return a dictionary of hits, misses, evictions, invalidations, entries and bytes."""
+    return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+            'invalidations': self._invalidations, 'entries': len(self._entries),
+            'bytes': self._bytes}
@@ -19,7 +19,46 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from ..priority_queue.heap_priority_queue import HeapPriorityQueue
 from ..priority_queue.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ..priority_queue.bucket_priority_queue import BucketPriorityQueue
+from ..priority_queue.radix_heap_priority_queue import RadixHeapPriorityQueue
+from .csr_graph import CSRGraph
+
+MAX_BUCKET_SPAN = 256         # largest integer weight served by Dial's buckets
+
+def _max_integer_weight(g):
+  """Return the largest edge weight if every weight is a non-negative int, else None."""
+  if isinstance(g, CSRGraph):
+    offsets, targets, weights = g.arrays()
+    if weights is None or g.weight_type() != 'q' or min(weights, default=0) < 0:
+      return None
+    return max(weights, default=0)
+  top = 0
+  for u in g.vertices():
+    for e in g.incident_edges(u):
+      wgt = e.element()
+      if type(wgt) is not int or wgt < 0:
+        return None
+      if wgt > top:
+        top = wgt
+  return top
+
+def _monotone_queue(g):
+  """Return a monotone integer priority queue suited to the weights of g, or None.
+
+  Dial's buckets are used only when the largest weight is at most
+  MAX_BUCKET_SPAN, since each remove_min may scan that many empty buckets and
+  a run costs O(m + total distance); a radix heap, whose cost depends only on
+  the bit width of the keys, serves larger integers. None means the weights
+  are not all non-negative integers.
+  """
+  top = _max_integer_weight(g)
+  if top is None:
+    return None
+  if top <= MAX_BUCKET_SPAN:
+    return BucketPriorityQueue(top)
+  return RadixHeapPriorityQueue()
 
 def shortest_path_lengths(g, src):
   """Compute shortest-path distances from src to reachable vertices of g.
@@ -28,7 +67,21 @@ def shortest_path_lengths(g, src):
   e.element() returns a numeric weight for each edge e.
 
   Return dictionary mapping each reachable vertex to its distance from src.
+
+  g may also be a weighted CSRGraph snapshot, in which case src is a vertex id.
+  When every weight is a non-negative integer, the search uses a monotone
+  bucket queue (see _monotone_queue) instead of the adaptable heap.
   """
+  pq = _monotone_queue(g)
+  if pq is not None:
+    search = _lazy_search_csr if isinstance(g, CSRGraph) else _lazy_search
+    cloud, tree = search(g, src, None, pq)
+    for v in g.vertices():
+      if v not in cloud:
+        cloud[v] = float('inf')                 # as reported by the heap-based search
+    return cloud
+  if isinstance(g, CSRGraph):
+    return _shortest_path_lengths_csr(g, src)
   d = {}                                        # d[v] is upper bound from s to v
   cloud = {}                                    # map reachable v to its d[v] value
   pq = AdaptableHeapPriorityQueue()             # vertex v will have key d[v]
@@ -37,7 +90,7 @@ def shortest_path_lengths(g, src):
   # for each vertex v of the graph, add an entry to the priority queue, with
   # the source having distance 0 and all others having infinite distance
   for v in g.vertices():
-    if v is src:
+    if v == src:
       d[v] = 0
     else:
       d[v] = float('inf')                       # syntax for positive infinity
@@ -58,18 +111,253 @@ def shortest_path_lengths(g, src):
 
   return cloud                                  # only includes reachable vertices
 
+def _shortest_path_lengths_csr(g, src):
+  """Dijkstra's algorithm over the arrays of CSRGraph g."""
+  offsets, targets, weights = g.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  d = [float('inf')] * g.vertex_count()         # d[v] is upper bound from s to v
+  d[src] = 0
+  cloud = {}
+  pq = AdaptableHeapPriorityQueue()
+  pqlocator = [pq.add(d[v], v) for v in g.vertices()]   # None once v leaves pq
+
+  while not pq.is_empty():
+    key, u = pq.remove_min()
+    cloud[u] = key
+    pqlocator[u] = None
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if pqlocator[v] is not None:
+        wgt = key + weights[k]
+        if wgt < d[v]:
+          d[v] = wgt
+          pq.update(pqlocator[v], wgt, v)
+
+  return cloud
+
 def shortest_path_tree(g, s, d):
   """Reconstruct shortest-path tree rooted at vertex s, given distance map d.
 
   Return tree as a map from each reachable vertex v (other than s) to the
   edge e=(u,v) that is used to reach v from its parent u in the tree.
   """
+  if isinstance(g, CSRGraph):
+    return _shortest_path_tree_csr(g, s, d)
   tree = {}
   for v in d:
-    if v is not s:
+    if v != s:
       for e in g.incident_edges(v, False):       # consider INCOMING edges
         u = e.opposite(v)
         wgt = e.element()
         if d[v] == d[u] + wgt:
           tree[v] = e                            # edge e is used to reach v
   return tree
+
+def _shortest_path_tree_csr(g, s, d):
+  """Shortest-path tree reconstruction over the arrays of CSRGraph g."""
+  offsets, sources, weights = g.arrays(outgoing=False)
+  tree = {}
+  for v in d:
+    if v != s:
+      for k in range(offsets[v], offsets[v+1]):  # consider INCOMING edges
+        u = sources[k]
+        if d[v] == d[u] + weights[k]:
+          tree[v] = g.edge_at(v, k, False)
+  return tree
+
+def _target_set(targets):
+  """Return targets (None, a single vertex or an iterable of vertices) as a set."""
+  if targets is None:
+    return None
+  if hasattr(targets, '__iter__'):
+    return set(targets)
+  return {targets}
+
+def shortest_path_search(g, src, targets=None):
+  """Run Dijkstra's algorithm from src, stopping once all targets are settled.
+
+  Graph g can be undirected or directed, but must be weighted such that
+  e.element() returns a numeric weight for each edge e; it may also be a
+  weighted CSRGraph snapshot. targets is a vertex, an iterable of vertices
+  or None (search the whole graph).
+
+  Unlike shortest_path_lengths, vertices enter the priority queue only when
+  they are reached, and outdated entries are skipped when removed (lazy
+  deletion). Predecessors are recorded during the search. Integer weights
+  are served by a monotone bucket queue, other weights by a binary heap.
+
+  Return a pair (cloud, tree): cloud maps each settled vertex to its distance
+  from src, and tree maps each settled vertex v (other than src) to the edge
+  used to reach v, in the format of shortest_path_tree.
+  """
+  remaining = _target_set(targets)
+  pq = _monotone_queue(g)
+  if pq is None:
+    pq = HeapPriorityQueue()
+  if isinstance(g, CSRGraph):
+    return _lazy_search_csr(g, src, remaining, pq)
+  return _lazy_search(g, src, remaining, pq)
+
+def _lazy_search(g, src, remaining, pq):
+  """Lazy-deletion Dijkstra from src using the empty priority queue pq."""
+  d = {src: 0}                                  # best known distance of reached vertices
+  pred = {}                                     # edge giving d[v]
+  cloud = {}
+  tree = {}
+  pq.add(0, src)
+  while not pq.is_empty():
+    key, u = pq.remove_min()
+    if u in cloud:
+      continue                                  # outdated entry of a settled vertex
+    cloud[u] = key
+    if u in pred:
+      tree[u] = pred[u]
+    if remaining is not None:
+      remaining.discard(u)
+      if len(remaining) == 0:
+        break                                   # every target is settled
+    for e in g.incident_edges(u):
+      v = e.opposite(u)
+      if v not in cloud:
+        wgt = key + e.element()
+        if v not in d or wgt < d[v]:
+          d[v] = wgt
+          pred[v] = e
+          pq.add(wgt, v)                        # older entries of v become outdated
+  return cloud, tree
+
+def _lazy_search_csr(g, src, remaining, pq):
+  """_lazy_search over the arrays of CSRGraph g."""
+  offsets, targets, weights = g.arrays()
+  if weights is None:
+    raise ValueError('graph must be weighted')
+  n = g.vertex_count()
+  d = [None] * n
+  d[src] = 0
+  pred = [None] * n                             # (u, k) edge slot giving d[v]
+  settled = bytearray(n)
+  cloud = {}
+  pq.add(0, src)
+  while not pq.is_empty():
+    key, u = pq.remove_min()
+    if settled[u]:
+      continue
+    settled[u] = 1
+    cloud[u] = key
+    if remaining is not None:
+      remaining.discard(u)
+      if len(remaining) == 0:
+        break
+    for k in range(offsets[u], offsets[u+1]):
+      v = targets[k]
+      if not settled[v]:
+        wgt = key + weights[k]
+        if d[v] is None or wgt < d[v]:
+          d[v] = wgt
+          pred[v] = (u, k)
+          pq.add(wgt, v)
+  tree = {v: g.edge_at(*pred[v]) for v in cloud if v != src}
+  return cloud, tree
+
+def _tree_path(tree, s, v):
+  """Return the list of vertices from s to v following the tree edges back from v."""
+  path = [v]
+  while v != s:
+    v = tree[v].opposite(v)
+    path.append(v)
+  path.reverse()
+  return path
+
+def bidirectional_shortest_path(g, src, dst):
+  """Compute a shortest path from src to dst with bidirectional Dijkstra.
+
+  A forward search from src (over outgoing edges) and a backward search from
+  dst (over incoming edges) run alternately, always advancing the side with
+  the smaller tentative distance, and stop once no path through unsettled
+  vertices can beat the best src-dst path found. Graph g must be weighted as
+  for shortest_path_lengths; it may also be a CSRGraph snapshot.
+
+  Return a tuple (path, cost, settled) where path is the list of vertices
+  from src to dst, cost its length and settled the number of vertices
+  settled by both searches. If dst is not reachable, path is empty and cost
+  is infinite.
+  """
+  if src == dst:
+    return [src], 0, 0
+  d = ({src: 0}, {dst: 0})                      # tentative distances, forward and backward
+  tree = ({}, {})                               # edge giving each tentative distance
+  cloud = (set(), set())                        # settled vertices of each side
+  pq = (HeapPriorityQueue(), HeapPriorityQueue())
+  pq[0].add(0, src)
+  pq[1].add(0, dst)
+  best = float('inf')                           # length of best src-dst path found
+  meet = None                                   # vertex where that path joins the searches
+  settled = 0
+  while True:
+    for side in (0, 1):                         # drop outdated entries
+      while not pq[side].is_empty() and pq[side].min()[1] in cloud[side]:
+        pq[side].remove_min()
+    if pq[0].is_empty() or pq[1].is_empty():
+      break
+    top = (pq[0].min()[0], pq[1].min()[0])
+    if top[0] + top[1] >= best:
+      break                                     # no shorter path remains
+    side = 0 if top[0] <= top[1] else 1
+    key, u = pq[side].remove_min()
+    cloud[side].add(u)
+    settled += 1
+    for e in g.incident_edges(u, side == 0):    # backward search uses INCOMING edges
+      v = e.opposite(u)
+      if v in cloud[side]:
+        continue
+      wgt = key + e.element()
+      if v not in d[side] or wgt < d[side][v]:
+        d[side][v] = wgt
+        tree[side][v] = e
+        pq[side].add(wgt, v)
+      if v in d[1-side] and d[side][v] + d[1-side][v] < best:
+        best = d[side][v] + d[1-side][v]
+        meet = v
+
+  if meet is None:
+    return [], float('inf'), settled
+  path = _tree_path(tree[0], src, meet)
+  path.extend(reversed(_tree_path(tree[1], dst, meet)[:-1]))
+  return path, best, settled
+
+def astar_shortest_path(g, src, dst, heuristic):
+  """Compute a shortest path from src to dst with the A* search.
+
+  heuristic(v) must return a lower bound on the distance from v to dst (for
+  example a straight-line distance computed from coordinates stored in the
+  vertex elements). Vertices are expanded in order of distance from src plus
+  heuristic estimate; an expanded vertex is expanded again if a shorter path
+  to it is found later, so the result is exact for any admissible heuristic.
+  Graph g must be weighted as for shortest_path_lengths; it may also be a
+  CSRGraph snapshot.
+
+  Return a tuple (path, cost, settled) as for bidirectional_shortest_path,
+  where settled counts the vertex expansions.
+  """
+  d = {src: 0}
+  tree = {}
+  pq = HeapPriorityQueue()                      # key is d[v] + heuristic(v)
+  pq.add(heuristic(src), (0, src))
+  settled = 0
+  while not pq.is_empty():
+    key, value = pq.remove_min()
+    dist, u = value
+    if dist > d[u]:
+      continue                                  # outdated entry
+    settled += 1
+    if u == dst:
+      return _tree_path(tree, src, dst), dist, settled
+    for e in g.incident_edges(u):
+      v = e.opposite(u)
+      wgt = dist + e.element()
+      if v not in d or wgt < d[v]:
+        d[v] = wgt
+        tree[v] = e
+        pq.add(wgt + heuristic(v), (wgt, v))
+  return [], float('inf'), settled
@@ -0,0 +1,110 @@
+from array import array
+from .csr_graph import CSRGraph
+
+def _tarjan(g):
+  """Iterative Tarjan algorithm over the arrays of CSRGraph g."""
+  offsets, targets, _ = g.arrays()
+  n = g.vertex_count()
+  index = array('q', [-1]) * n              # DFS discovery order
+  low = array('q', [0]) * n                 # smallest index reachable within the DFS subtree
+  component = array('q', [-1]) * n
+  on_stack = bytearray(n)
+  stack = []                                # vertices of unfinished components
+  counter = count = 0
+  for root in range(n):
+    if index[root] >= 0:
+      continue
+    index[root] = low[root] = counter
+    counter += 1
+    stack.append(root)
+    on_stack[root] = 1
+    call = [(root, offsets[root])]          # explicit recursion stack: (vertex, next slot)
+    while len(call) > 0:
+      v, k = call[-1]
+      end = offsets[v+1]
+      while k < end:
+        w = targets[k]
+        k += 1
+        if index[w] < 0:                    # tree edge: descend into w
+          call[-1] = (v, k)
+          index[w] = low[w] = counter
+          counter += 1
+          stack.append(w)
+          on_stack[w] = 1
+          call.append((w, offsets[w]))
+          break
+        elif on_stack[w] and index[w] < low[v]:
+          low[v] = index[w]
+      else:
+        call.pop()                          # v is finished
+        if low[v] == index[v]:              # v is the root of a component
+          while True:
+            w = stack.pop()
+            on_stack[w] = 0
+            component[w] = count
+            if w == v:
+              break
+          count += 1
+        if len(call) > 0:
+          u = call[-1][0]
+          if low[v] < low[u]:
+            low[u] = low[v]
+  return component, count
+
+def strong_components(g):
+  """Compute the strongly connected components of directed graph g.
+
+  g may be a Graph or a CSRGraph snapshot; the search uses an explicit stack,
+  so it runs in O(V+E) time without recursion limits. Components are
+  numbered in reverse topological order of the condensation: every edge
+  between two components goes from a higher id to a lower one.
+
+  Return a pair (component, count). For a CSRGraph, component is an array
+  indexed by vertex id; for a Graph, it is a dictionary mapping each vertex
+  to its component id. An undirected graph yields its connected components.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  component, count = _tarjan(csr)
+  if csr is g:
+    return component, count
+  return {csr.vertex(v): component[v] for v in csr.vertices()}, count
+
+def condensation(g):
+  """Return the condensation DAG of directed graph g and its component map.
+
+  Return a pair (dag, component): component is as for strong_components, and
+  dag is a directed CSRGraph with one vertex per strongly connected component
+  and one edge between two components joined by at least one edge of g. If
+  g is weighted, each DAG edge carries the smallest weight of those edges.
+  dag.vertex(c) returns the list of (original) vertices of component c.
+  """
+  csr = g if isinstance(g, CSRGraph) else g.freeze()
+  component, count = _tarjan(csr)
+  members = [[] for c in range(count)]
+  for v in csr.vertices():
+    members[component[v]].append(v)
+  offsets, targets, weights = csr.arrays()
+  dag_offsets = array('q', [0])
+  dag_targets = array('q')
+  dag_weights = [] if weights is not None else None
+  for c in range(count):
+    best = {}                                 # successor component -> smallest weight
+    for u in members[c]:
+      for k in range(offsets[u], offsets[u+1]):
+        d = component[targets[k]]
+        if d != c:
+          wgt = weights[k] if weights is not None else None
+          if d not in best or (wgt is not None and wgt < best[d]):
+            best[d] = wgt
+    for d in sorted(best):
+      dag_targets.append(d)
+      if dag_weights is not None:
+        dag_weights.append(best[d])
+    dag_offsets.append(len(dag_targets))
+  if dag_weights is not None:
+    dag_weights = array(csr.weight_type(), dag_weights)
+  labels = [[csr.vertex(v) for v in group] for group in members]
+  dag = CSRGraph(dag_offsets, dag_targets, dag_weights, True, labels)
+  if csr is not g:
+    component = {csr.vertex(v): component[v] for v in csr.vertices()}
+  return dag, component
@@ -0,0 +1,30 @@
+import random
+from TdPCollections.graphs.graph import Graph
+
+def random_weights(lo, hi):
+    """Return a weight function for random_graph drawing integers in [lo, hi]."""
+    return lambda rng, u, v: rng.randint(lo, hi)
+
+def random_graph(n, m, directed=False, seed=0, weight=None, labels=None, path=False, acyclic=False):
+    """Return a random Graph with n vertices and m edges, and the list of its vertices.
+
+    Edges join random pairs drawn with random.Random(seed), skipping pairs
+    that are already adjacent. weight(rng, u, v) gives the element of each
+    edge (None if omitted) and labels(i) the element of vertex i (i if
+    omitted). If path is True, a path through all vertices is inserted
+    first so that most pairs are connected; if acyclic is True, edges only
+    go from smaller to larger vertex elements.
+    """
+    rng = random.Random(seed)
+    g = Graph(directed)
+    verts = [g.insert_vertex(labels(i) if labels else i) for i in range(n)]
+    def insert(u, v):
+        g.insert_edge(u, v, weight(rng, u, v) if weight else None)
+    if path:
+        for u, v in zip(verts, verts[1:]):
+            insert(u, v)
+    while g.edge_count() < m:
+        u, v = rng.sample(verts, 2)
+        if g.get_edge(u, v) is None and (not acyclic or u.element() < v.element()):
+            insert(u, v)
+    return g, verts
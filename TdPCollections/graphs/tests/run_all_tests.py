@@ -0,0 +1,49 @@
+import unittest
+
+# Import test modules
+from TdPCollections.graphs.tests.test_csr_graph import TestCSRGraph
+from TdPCollections.graphs.tests.test_graph import TestGraph
+from TdPCollections.graphs.tests.test_dfs import TestDFS
+from TdPCollections.graphs.tests.test_bfs import TestBFS
+from TdPCollections.graphs.tests.test_components import TestComponents
+from TdPCollections.graphs.tests.test_shortest_paths import TestShortestPaths
+from TdPCollections.graphs.tests.test_contraction_hierarchy import TestContractionHierarchy
+from TdPCollections.graphs.tests.test_transitive_closure import TestTransitiveClosure
+from TdPCollections.graphs.tests.test_strong_components import TestStrongComponents
+from TdPCollections.graphs.tests.test_dynamic_topological_order import TestDynamicTopologicalOrder
+from TdPCollections.graphs.tests.test_topological_sort import TestTopologicalSort
+from TdPCollections.graphs.tests.test_mst import TestMST
+from TdPCollections.graphs.tests.test_partition import TestPartition
+from TdPCollections.graphs.tests.test_int_graph import TestIntGraph
+from TdPCollections.graphs.tests.test_graph_file import TestGraphFile
+from TdPCollections.graphs.tests.test_graph_views import TestGraphViews
+from TdPCollections.graphs.tests.test_centrality import TestCentrality
+from TdPCollections.graphs.tests.test_query_cache import TestQueryCache
+from TdPCollections.graphs.tests.test_landmarks import TestLandmarks
+
+if __name__ == '__main__':
+    # Create a test suite combining all test cases
+    test_suite = unittest.TestSuite([
+        unittest.TestLoader().loadTestsFromTestCase(TestCSRGraph),
+        unittest.TestLoader().loadTestsFromTestCase(TestGraph),
+        unittest.TestLoader().loadTestsFromTestCase(TestDFS),
+        unittest.TestLoader().loadTestsFromTestCase(TestBFS),
+        unittest.TestLoader().loadTestsFromTestCase(TestComponents),
+        unittest.TestLoader().loadTestsFromTestCase(TestShortestPaths),
+        unittest.TestLoader().loadTestsFromTestCase(TestContractionHierarchy),
+        unittest.TestLoader().loadTestsFromTestCase(TestTransitiveClosure),
+        unittest.TestLoader().loadTestsFromTestCase(TestStrongComponents),
+        unittest.TestLoader().loadTestsFromTestCase(TestDynamicTopologicalOrder),
+        unittest.TestLoader().loadTestsFromTestCase(TestTopologicalSort),
+        unittest.TestLoader().loadTestsFromTestCase(TestMST),
+        unittest.TestLoader().loadTestsFromTestCase(TestPartition),
+        unittest.TestLoader().loadTestsFromTestCase(TestIntGraph),
+        unittest.TestLoader().loadTestsFromTestCase(TestGraphFile),
+        unittest.TestLoader().loadTestsFromTestCase(TestGraphViews),
+        unittest.TestLoader().loadTestsFromTestCase(TestCentrality),
+        unittest.TestLoader().loadTestsFromTestCase(TestQueryCache),
+        unittest.TestLoader().loadTestsFromTestCase(TestLandmarks)
+    ])
+
+    # Run the combined test suite
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,69 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.bfs import BFS, BFS_levels
+from TdPCollections.graphs.tests.helpers import random_graph
+
+def reference_levels(g, sources):
+    """Levels of a plain level-by-level BFS from several sources."""
+    discovered = {s: None for s in sources}
+    levels = {s: 0 for s in sources}
+    frontier = list(sources)
+    depth = 0
+    while frontier:
+        nxt = []
+        for u in frontier:
+            for e in g.incident_edges(u):
+                v = e.opposite(u)
+                if v not in discovered:
+                    discovered[v] = e
+                    levels[v] = depth + 1
+                    nxt.append(v)
+        frontier = nxt
+        depth += 1
+    return levels
+
+class TestBFS(unittest.TestCase):
+    def test_modes_agree_with_classic_bfs(self):
+        for directed in (False, True):
+            g, verts = random_graph(300, 1500, directed, 1)
+            csr = g.freeze()
+            expected = reference_levels(g, [verts[0]])
+            for mode in ('auto', 'top-down', 'bottom-up'):
+                level, parent = BFS_levels(csr, 0, mode=mode)
+                got = {csr.vertex(i): x for i, x in enumerate(level) if x >= 0}
+                self.assertEqual(got, expected)
+                for v in range(csr.vertex_count()):
+                    if level[v] > 0:
+                        self.assertEqual(level[parent[v]], level[v] - 1)
+                        self.assertIsNotNone(csr.get_edge(parent[v], v))
+                self.assertEqual(parent[0], -1)
+
+    def test_single_source_matches_BFS(self):
+        g, verts = random_graph(100, 300, seed=1)
+        discovered = {verts[0]: None}
+        BFS(g, verts[0], discovered)
+        level, parent = BFS_levels(g.freeze(), 0)
+        self.assertEqual(sum(1 for x in level if x >= 0), len(discovered))
+
+    def test_multi_source_and_unreachable(self):
+        g = Graph(directed=True)
+        a, b, c, d, e = (g.insert_vertex(x) for x in 'abcde')
+        g.insert_edge(a, b)
+        g.insert_edge(b, c)
+        g.insert_edge(d, c)
+        csr = g.freeze()
+        ids = [csr.index(x) for x in (a, b, c, d, e)]
+        level, parent = BFS_levels(csr, [ids[0], ids[3]])
+        self.assertEqual([level[i] for i in ids], [0, 1, 1, 0, -1])
+        self.assertEqual(parent[ids[2]], ids[3])
+        self.assertEqual(parent[ids[4]], -1)
+
+    def test_requires_snapshot(self):
+        g, verts = random_graph(5, 4, seed=1)
+        with self.assertRaises(TypeError):
+            BFS_levels(g, verts[0])
+        with self.assertRaises(ValueError):
+            BFS_levels(g.freeze(), 0, mode='sideways')
+
+if __name__ == '__main__':
+    unittest.main()
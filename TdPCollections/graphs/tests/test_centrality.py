@@ -0,0 +1,153 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs import centrality
+from TdPCollections.graphs.centrality import (pagerank, personalized_pagerank, degree_centrality,
+                                              eigenvector_centrality, betweenness_centrality,
+                                              betweenness_sample_size)
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+def reference_pagerank(g, damping=0.85, iterations=200):
+    """Plain power iteration over the Graph interface, with uniform jumps."""
+    n = g.vertex_count()
+    x = {v: 1 / n for v in g.vertices()}
+    for _ in range(iterations):
+        dangling = sum(x[v] for v in g.vertices() if g.degree(v) == 0)
+        y = {v: (1 - damping) / n + damping * dangling / n for v in g.vertices()}
+        for u in g.vertices():
+            for e in g.incident_edges(u):
+                y[e.opposite(u)] += damping * x[u] / g.degree(u)
+        x = y
+    return x
+
+def reference_betweenness(g):
+    """Unnormalized betweenness from pairwise distances and path counts."""
+    dist, sigma = {}, {}
+    for s in g.vertices():
+        dist[s] = shortest_path_lengths(g, s)
+        sigma[s] = {s: 1}
+        for v in sorted(dist[s], key=dist[s].get):
+            if v is not s and dist[s][v] != float('inf'):
+                sigma[s][v] = sum(sigma[s][e.opposite(v)] for e in g.incident_edges(v, False)
+                                  if dist[s][e.opposite(v)] + e.element() == dist[s][v])
+    score = {v: 0.0 for v in g.vertices()}
+    for s in g.vertices():
+        for t in sigma[s]:
+            for v in g.vertices():
+                if v is not s and v is not t and t is not s and v in sigma[s] and t in sigma[v] \
+                   and dist[s][v] + dist[v][t] == dist[s][t]:
+                    score[v] += sigma[s][v] * sigma[v][t] / sigma[s][t]
+    if not g.is_directed():
+        score = {v: x / 2 for v, x in score.items()}
+    return score
+
+class TestCentrality(unittest.TestCase):
+    def setUp(self):
+        self.g, self.verts = random_graph(120, 400, True, 27, random_weights(1, 5))
+
+    def assert_close(self, a, b, places=7):
+        self.assertEqual(set(a), set(b))
+        for v in a:
+            self.assertAlmostEqual(a[v], b[v], places)
+
+    def test_pagerank_matches_reference(self):
+        expected = reference_pagerank(self.g)
+        for numpy in (centrality.np, None):
+            saved, centrality.np = centrality.np, numpy
+            try:
+                scores = pagerank(self.g, tol=1e-12)
+                self.assert_close(scores, expected)
+                self.assertAlmostEqual(sum(scores.values()), 1)
+                csr = self.g.freeze()
+                self.assert_close(csr.translate(dict(enumerate(pagerank(csr, tol=1e-12)))), expected)
+            finally:
+                centrality.np = saved
+
+    def test_residuals_and_warm_start(self):
+        cold = []
+        scores = pagerank(self.g, tol=1e-10, residuals=cold)
+        self.assertLess(cold[-1], 1e-10)
+        self.assertLess(cold[-1], cold[0])
+        warm = []
+        again = pagerank(self.g, tol=1e-10, start=scores, residuals=warm)
+        self.assertLess(len(warm), len(cold))
+        self.assert_close(again, scores)
+        capped = []
+        pagerank(self.g, tol=0, max_iter=5, residuals=capped)
+        self.assertEqual(len(capped), 5)
+
+    def test_personalized_and_weighted(self):
+        src = self.verts[0]
+        scores = personalized_pagerank(self.g, src, tol=1e-10)
+        self.assertAlmostEqual(sum(scores.values()), 1)
+        self.assertEqual(max(scores, key=scores.get), src)
+        same = pagerank(self.g, personalization={src: 3}, tol=1e-10)
+        self.assert_close(same, scores)
+        weighted = pagerank(self.g, weighted=True, tol=1e-10)
+        self.assertAlmostEqual(sum(weighted.values()), 1)
+        with self.assertRaises(ValueError):
+            pagerank(self.g, damping=1)
+
+    def test_degree_and_eigenvector(self):
+        g = Graph()
+        hub = g.insert_vertex('hub')
+        leaves = [g.insert_vertex(i) for i in range(5)]
+        for v in leaves:
+            g.insert_edge(hub, v)
+        degree = degree_centrality(g)
+        self.assertEqual(degree[hub], 1.0)
+        self.assertEqual(degree[leaves[0]], 0.2)
+        residuals = []
+        scores = eigenvector_centrality(g, tol=1e-10, residuals=residuals)
+        self.assertLess(residuals[-1], 1e-10)
+        self.assertAlmostEqual(sum(x * x for x in scores.values()), 1)
+        self.assertAlmostEqual(scores[hub] / scores[leaves[0]], 5 ** 0.5, 6)   # star: sqrt(k)
+        for numpy in (centrality.np, None):
+            saved, centrality.np = centrality.np, numpy
+            try:
+                self.assert_close(eigenvector_centrality(g, tol=1e-10), scores)
+            finally:
+                centrality.np = saved
+
+    def test_betweenness_exact(self):
+        g, verts = random_graph(40, 120, True, 28, random_weights(1, 5))
+        expected = reference_betweenness(g)
+        self.assert_close(betweenness_centrality(g, weighted=True, normalized=False), expected)
+        undirected = Graph()
+        copy = {v: undirected.insert_vertex(v.element()) for v in g.vertices()}
+        for e in g.edges():
+            u, v = e.endpoints()
+            if undirected.get_edge(copy[u], copy[v]) is None:
+                undirected.insert_edge(copy[u], copy[v], 1)
+        expected = reference_betweenness(undirected)
+        stats = {}
+        scores = betweenness_centrality(undirected, normalized=False, workers=2, stats=stats)
+        self.assert_close(scores, expected)
+        self.assertEqual(stats, {'sources': 40, 'error_bound': 0.0})
+        self.assert_close(betweenness_centrality(undirected, normalized=False, workers=None), expected)
+        normalized = betweenness_centrality(undirected.freeze(), chunks=3)
+        self.assertAlmostEqual(max(normalized), max(expected.values()) / (39 * 38 / 2))
+
+    def test_betweenness_path(self):
+        g = Graph()
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        for u, v in ((a, b), (b, c), (c, d)):
+            g.insert_edge(u, v, 1)
+        self.assertEqual(betweenness_centrality(g, normalized=False), {a: 0, b: 2, c: 2, d: 0})
+        self.assertEqual(betweenness_centrality(g), {a: 0, b: 2 / 3, c: 2 / 3, d: 0})
+
+    def test_betweenness_sampling(self):
+        g, verts = random_graph(150, 600, True, 29, random_weights(1, 5))
+        exact = betweenness_centrality(g)
+        stats = {}
+        approx = betweenness_centrality(g, epsilon=0.2, seed=3, stats=stats)
+        self.assertEqual(stats['sources'], min(150, betweenness_sample_size(150, 0.2)))
+        stats = {}
+        approx = betweenness_centrality(g, k=60, seed=3, stats=stats, workers=2)
+        self.assertEqual(stats['sources'], 60)
+        self.assertGreater(stats['error_bound'], 0)
+        for v in verts:
+            self.assertLessEqual(abs(approx[v] - exact[v]), stats['error_bound'])
+
+if __name__ == '__main__':
+    unittest.main()
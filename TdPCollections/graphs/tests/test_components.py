@@ -0,0 +1,53 @@
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.bfs import BFS_complete
+from TdPCollections.graphs.components import connected_components
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.g = Graph()
+        self.verts = [self.g.insert_vertex(i) for i in range(400)]
+        for _ in range(300):             # sparse: many small components
+            u, v = rng.sample(self.verts, 2)
+            if self.g.get_edge(u, v) is None:
+                self.g.insert_edge(u, v)
+
+    def expected_partition(self):
+        forest = BFS_complete(self.g)
+        root = {}
+        for v in self.g.vertices():       # walk tree edges up to the BFS root
+            w = v
+            while forest[w] is not None:
+                w = forest[w].opposite(w)
+            root[v] = w
+        return root
+
+    def assert_same_partition(self, component, sizes):
+        root = self.expected_partition()
+        pairs = {(root[v], component[v]) for v in root}
+        self.assertEqual(len(pairs), len(set(root.values())))
+        self.assertEqual(len(pairs), len(sizes))
+        self.assertEqual(sum(sizes), self.g.vertex_count())
+
+    def test_sequential(self):
+        component, sizes = connected_components(self.g, workers=1, chunks=7)
+        self.assert_same_partition(component, sizes)
+
+    def test_process_pool(self):
+        component, sizes = connected_components(self.g, workers=2)
+        self.assert_same_partition(component, sizes)
+
+    def test_snapshot_and_directed(self):
+        g = Graph(directed=True)
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b)
+        g.insert_edge(c, b)
+        csr = g.freeze()
+        component, sizes = connected_components(csr, workers=1)
+        self.assertEqual(list(component), [0, 0, 0, 1])
+        self.assertEqual(sizes, [3, 1])
+
+if __name__ == '__main__':
+    unittest.main()
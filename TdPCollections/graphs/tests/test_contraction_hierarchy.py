@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths
+from TdPCollections.graphs.contraction_hierarchy import ContractionHierarchy
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+class TestContractionHierarchy(unittest.TestCase):
+    def check_against_dijkstra(self, g, verts, ch, sources):
+        for s in sources:
+            oracle = shortest_path_lengths(g, s)
+            for t in verts:
+                self.assertEqual(ch.distance(s, t), oracle[t])
+                path, cost = ch.path(s, t)
+                if cost == float('inf'):
+                    self.assertEqual(path, [])
+                else:
+                    self.assertEqual((path[0], path[-1]), (s, t))
+                    self.assertEqual(sum(g.get_edge(a, b).element()
+                                         for a, b in zip(path, path[1:])), cost)
+
+    def test_undirected(self):
+        g, verts = random_graph(80, 200, False, 11, random_weights(1, 9), path=True)
+        ch = ContractionHierarchy(g)
+        self.check_against_dijkstra(g, verts, ch, verts[:8])
+
+    def test_directed(self):
+        g, verts = random_graph(80, 240, True, 12, random_weights(1, 9), path=True)
+        ch = ContractionHierarchy(g, max_settle=5)
+        self.assertGreater(ch.shortcut_count(), 0)
+        self.check_against_dijkstra(g, verts, ch, verts[::10])
+
+    def test_process_pool_and_save(self):
+        g, verts = random_graph(60, 150, True, 13, random_weights(1, 9), path=True)
+        ch = ContractionHierarchy(g, workers=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'ch.bin')
+            ch.save(filename)
+            loaded = ContractionHierarchy.load(filename)
+        oracle = shortest_path_lengths(g, verts[0])
+        for i, v in enumerate(verts):
+            self.assertEqual(loaded.distance(0, i), oracle[v])
+        self.assertEqual(loaded.path(0, 5)[1], oracle[verts[5]])
+        with self.assertRaises(TypeError):
+            loaded.distance(verts[0], verts[1])
+
+    def test_unweighted_rejected(self):
+        g = Graph()
+        a, b = g.insert_vertex('a'), g.insert_vertex('b')
+        g.insert_edge(a, b)
+        with self.assertRaises(ValueError):
+            ContractionHierarchy(g)
+
+if __name__ == '__main__':
+    unittest.main()
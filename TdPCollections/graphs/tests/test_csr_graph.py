@@ -0,0 +1,99 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.csr_graph import CSRGraph
+from TdPCollections.graphs.bfs import BFS_complete
+from TdPCollections.graphs.dfs import DFS, DFS_complete, construct_path
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths, shortest_path_tree
+from TdPCollections.graphs.mst import MST_PrimJarnik, MST_Kruskal
+
+def build_graph(edges, directed=False):
+    """Build a Graph from (u, v, weight) triples and return it with its vertex map."""
+    g = Graph(directed)
+    verts = {}
+    for u, v, w in edges:
+        for x in (u, v):
+            if x not in verts:
+                verts[x] = g.insert_vertex(x)
+        g.insert_edge(verts[u], verts[v], w)
+    return g, verts
+
+WEIGHTED = [('A', 'B', 4), ('A', 'C', 2), ('B', 'C', 5), ('B', 'D', 10),
+            ('C', 'E', 3), ('E', 'D', 4), ('D', 'F', 11)]
+
+class TestCSRGraph(unittest.TestCase):
+    def setUp(self):
+        self.g, self.v = build_graph(WEIGHTED)
+        self.csr = self.g.freeze()
+
+    def test_counts_and_degrees(self):
+        self.assertEqual(self.csr.vertex_count(), self.g.vertex_count())
+        self.assertEqual(self.csr.edge_count(), self.g.edge_count())
+        for x, vert in self.v.items():
+            i = self.csr.index(vert)
+            self.assertIs(self.csr.vertex(i), vert)
+            self.assertEqual(self.csr.degree(i), self.g.degree(vert))
+        self.assertTrue(self.csr.is_weighted())
+        self.assertFalse(self.csr.is_directed())
+
+    def test_edges_and_get_edge(self):
+        self.assertEqual({e.original() for e in self.csr.edges()}, self.g.edges())
+        a, d = self.csr.index(self.v['A']), self.csr.index(self.v['D'])
+        b = self.csr.index(self.v['B'])
+        self.assertIsNone(self.csr.get_edge(a, d))
+        self.assertEqual(self.csr.get_edge(a, b), self.csr.get_edge(b, a))
+        self.assertEqual(self.csr.get_edge(a, b).element(), 4)
+
+    def test_directed_incoming(self):
+        g, v = build_graph(WEIGHTED, directed=True)
+        csr = g.freeze()
+        self.assertEqual(csr.edge_count(), g.edge_count())
+        d = csr.index(v['D'])
+        incoming = {csr.translate([e.opposite(d)])[0] for e in csr.incident_edges(d, False)}
+        self.assertEqual(incoming, {v['B'], v['E']})
+        self.assertEqual(csr.degree(d, False), g.degree(v['D'], False))
+
+    def test_invalid_arrays(self):
+        with self.assertRaises(ValueError):
+            CSRGraph([0, 2], [1])
+        with self.assertRaises(ValueError):
+            CSRGraph([0, 1, 2], [1, 0], [1])
+
+    def test_bfs_and_dfs(self):
+        for complete in (BFS_complete, DFS_complete):
+            forest = self.csr.translate(complete(self.csr))
+            self.assertEqual(set(forest), set(self.g.vertices()))
+            self.assertEqual(sum(1 for e in forest.values() if e is None), 1)
+        a, f = self.csr.index(self.v['A']), self.csr.index(self.v['F'])
+        discovered = {a: None}
+        DFS(self.csr, a, discovered)
+        path = self.csr.translate(construct_path(a, f, discovered))
+        self.assertEqual(path[0], self.v['A'])
+        self.assertEqual(path[-1], self.v['F'])
+
+    def test_shortest_paths_match_graph(self):
+        for directed in (False, True):
+            g, v = build_graph(WEIGHTED, directed)
+            csr = g.freeze()
+            src = csr.index(v['A'])
+            expected = shortest_path_lengths(g, v['A'])
+            d = shortest_path_lengths(csr, src)
+            self.assertEqual(csr.translate(d), expected)
+            tree = csr.translate(shortest_path_tree(csr, src, d))
+            self.assertEqual(tree, shortest_path_tree(g, v['A'], expected))
+
+    def test_mst_matches_graph(self):
+        expected = sum(e.element() for e in MST_Kruskal(self.g))
+        for mst in (MST_PrimJarnik, MST_Kruskal):
+            tree = self.csr.translate(mst(self.csr))
+            self.assertEqual(len(tree), self.g.vertex_count() - 1)
+            self.assertEqual(sum(e.element() for e in tree), expected)
+
+    def test_unweighted_graph(self):
+        g, v = build_graph([('a', 'b', None), ('b', 'c', None)])
+        csr = g.freeze()
+        self.assertFalse(csr.is_weighted())
+        with self.assertRaises(ValueError):
+            shortest_path_lengths(csr, 0)
+
+if __name__ == '__main__':
+    unittest.main()
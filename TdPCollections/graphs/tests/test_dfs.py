@@ -0,0 +1,72 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.dfs import (DFS, DFS_complete, DFS_events, DFS_events_complete,
+                                       construct_path, PRE_VISIT, POST_VISIT, TREE_EDGE,
+                                       BACK_EDGE, FORWARD_EDGE, CROSS_EDGE)
+
+class TestDFS(unittest.TestCase):
+    def path_graph(self, n, directed=False):
+        g = Graph(directed)
+        verts = [g.insert_vertex(i) for i in range(n)]
+        for i in range(n - 1):
+            g.insert_edge(verts[i], verts[i + 1])
+        return g, verts
+
+    def test_deep_path_does_not_recurse(self):
+        g, verts = self.path_graph(20000)
+        discovered = {verts[0]: None}
+        DFS(g, verts[0], discovered)
+        self.assertEqual(len(discovered), 20000)
+        self.assertEqual(len(construct_path(verts[0], verts[-1], discovered)), 20000)
+        csr = g.freeze()
+        forest = DFS_complete(csr)
+        self.assertEqual(len(forest), 20000)
+        self.assertEqual(len(construct_path(0, 19999, forest)), 20000)
+
+    def test_events_and_times_on_directed_graph(self):
+        g = Graph(directed=True)
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b)
+        g.insert_edge(b, c)
+        g.insert_edge(c, a)        # back edge closing a cycle
+        g.insert_edge(a, c)        # forward edge (c is explored through b first)
+        g.insert_edge(d, a)        # cross edge from a later tree
+        discovery, finish = {}, {}
+        events = list(DFS_events_complete(g, discovery, finish))
+        kinds = [event for x, event in events]
+        self.assertEqual(kinds.count(PRE_VISIT), 4)
+        self.assertEqual(kinds.count(POST_VISIT), 4)
+        self.assertEqual(kinds.count(TREE_EDGE), 2)
+        back = [x for x, event in events if event == BACK_EDGE]
+        self.assertEqual([e.endpoints() for e in back], [(c, a)])
+        self.assertEqual([x.endpoints() for x, event in events if event == FORWARD_EDGE], [(a, c)])
+        self.assertEqual([x.endpoints() for x, event in events if event == CROSS_EDGE], [(d, a)])
+        self.assertEqual(set(discovery.values()) | set(finish.values()), set(range(8)))
+        self.assertTrue(discovery[a] < discovery[b] < discovery[c] < finish[c] < finish[b] < finish[a])
+
+    def test_undirected_bridges(self):
+        # triangle a-b-c plus bridge c-d: only c-d is a bridge
+        g = Graph()
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        for u, v in ((a, b), (b, c), (c, a), (c, d)):
+            g.insert_edge(u, v)
+        discovered = {a: None}
+        discovery = {}
+        low = {}
+        bridges = []
+        for x, event in DFS_events(g, a, discovered, discovery):
+            if event == PRE_VISIT:
+                low[x] = discovery[x]
+            elif event == BACK_EDGE:
+                u, v = x.endpoints()
+                low[u] = min(low[u], discovery[v])
+                low[v] = min(low[v], discovery[u])
+            elif event == POST_VISIT and discovered[x] is not None:
+                parent = discovered[x].opposite(x)
+                low[parent] = min(low[parent], low[x])
+                if low[x] > discovery[parent]:
+                    bridges.append(discovered[x])
+        self.assertEqual([set(e.endpoints()) for e in bridges], [{c, d}])
+
+if __name__ == '__main__':
+    unittest.main()
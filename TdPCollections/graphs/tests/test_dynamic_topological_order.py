@@ -0,0 +1,93 @@
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.dfs import find_cycle
+from TdPCollections.graphs.dynamic_topological_order import DynamicTopologicalOrder, CycleError
+
+class TestDynamicTopologicalOrder(unittest.TestCase):
+    def assert_valid(self, dto):
+        g = dto.graph()
+        self.assertEqual(len(dto), g.vertex_count())
+        self.assertEqual(sorted(dto.position(v) for v in g.vertices()), list(range(len(dto))))
+        for e in g.edges():
+            u, v = e.endpoints()
+            self.assertLess(dto.position(u), dto.position(v))
+        self.assertEqual(dto.order(), sorted(g.vertices(), key=dto.position))
+
+    def test_random_insertions(self):
+        rng = random.Random(21)
+        dto = DynamicTopologicalOrder(Graph(directed=True))
+        verts = [dto.insert_vertex(i) for i in range(60)]
+        rejected = 0
+        for _ in range(400):
+            u, v = rng.sample(verts, 2)
+            if dto.graph().get_edge(u, v) is not None:
+                continue
+            try:
+                e = dto.insert_edge(u, v, 'w')
+                self.assertEqual(e.endpoints(), (u, v))
+            except CycleError as err:
+                rejected += 1
+                cycle = err.cycle
+                self.assertEqual((cycle[0], cycle[-1]), (v, u))
+                for a, b in zip(cycle, cycle[1:]):
+                    self.assertIsNotNone(dto.graph().get_edge(a, b))
+                self.assertIsNone(dto.graph().get_edge(u, v))
+            self.assert_valid(dto)
+        self.assertGreater(rejected, 0)
+
+    def test_existing_graph_and_errors(self):
+        g = Graph(directed=True)
+        a, b, c = (g.insert_vertex(x) for x in 'abc')
+        g.insert_edge(b, a)
+        dto = DynamicTopologicalOrder(g)
+        dto.insert_edge(a, c)
+        self.assert_valid(dto)
+        with self.assertRaises(CycleError) as ctx:
+            dto.insert_edge(c, b)
+        self.assertEqual(ctx.exception.cycle, [b, a, c])
+        with self.assertRaises(CycleError):
+            dto.insert_edge(a, a)
+        with self.assertRaises(ValueError):
+            dto.insert_edge(a, c)          # already adjacent
+        g.insert_edge(c, b)                # bypass the structure to create a cycle
+        self.assertEqual(set(find_cycle(g)), {a, b, c})
+        with self.assertRaises(CycleError):
+            DynamicTopologicalOrder(g)
+        with self.assertRaises(ValueError):
+            DynamicTopologicalOrder(Graph())
+
+    def test_find_cycle_acyclic(self):
+        g = Graph(directed=True)
+        a, b = g.insert_vertex('a'), g.insert_vertex('b')
+        g.insert_edge(a, b)
+        self.assertIsNone(find_cycle(g))
+        g.insert_edge(b, b)
+        self.assertEqual(find_cycle(g), [b])
+
+    def assert_cycle(self, g, cycle, vertices):
+        self.assertEqual(sorted(cycle, key=str), sorted(vertices, key=str))
+        for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertIsNotNone(g.get_edge(a, b))
+
+    def test_find_cycle_undirected_and_reversed(self):
+        g = Graph()
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b)
+        g.insert_edge(b, c)
+        g.insert_edge(c, d)
+        self.assertIsNone(find_cycle(g))     # a tree has no cycle
+        g.insert_edge(a, c)                  # the back edge is found from its destination
+        self.assert_cycle(g, find_cycle(g), [a, b, c])
+        g = Graph(directed=True)
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b)
+        g.insert_edge(b, c)
+        g.insert_edge(c, a)
+        g.insert_edge(d, a)
+        view = g.reversed()                  # edges scanned from their destination
+        self.assert_cycle(view, find_cycle(view), [a, b, c])
+        self.assertIsNone(find_cycle(g.subgraph([a, b, d]).reversed()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import random
+import tempfile
+import unittest
+from TdPCollections.graphs.graph import Graph
+
+class TestGraph(unittest.TestCase):
+    def test_from_edge_list_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'edges.txt')
+            with open(path, 'w') as f:
+                f.write('# comment\na b\nb c\n\nc a')   # no trailing newline
+            labels, stats = {}, {}
+            g = Graph.from_edge_list(path, directed=True, labels=labels,
+                                     stats=stats, chunk_size=3)
+        self.assertEqual(g.vertex_count(), 3)
+        self.assertEqual(g.edge_count(), 3)
+        self.assertIsNotNone(g.get_edge(labels['c'], labels['a']))
+        self.assertIsNone(g.get_edge(labels['a'], labels['c']))
+        self.assertEqual(stats['edges'], 3)
+        self.assertEqual(stats['vertices'], 3)
+        self.assertEqual(stats['lines'], 5)
+        self.assertGreater(stats['lines_per_second'], 0)
+
+    def test_from_edge_list_weighted(self):
+        labels = {}
+        g = Graph.from_edge_list(['x y 2', 'y z 1.5', ('z', 'x', 7)],
+                                 weighted=True, labels=labels)
+        self.assertFalse(g.is_directed())
+        self.assertEqual(g.get_edge(labels['y'], labels['x']).element(), 2)
+        self.assertEqual(g.get_edge(labels['z'], labels['y']).element(), 1.5)
+        self.assertEqual(g.get_edge(labels['x'], labels['z']).element(), 7)
+        with self.assertRaises(ValueError):
+            Graph.from_edge_list(['x y'], weighted=True)
+        with self.assertRaisesRegex(ValueError, 'line 2: invalid weight'):
+            Graph.from_edge_list(['x y 2', 'y z heavy'], weighted=True)
+        with self.assertRaises(ValueError):
+            Graph.from_edge_list(['x y'], labels=labels)  # vertices of another graph
+
+    def test_duplicate_policies(self):
+        lines = ['a b 5', 'b a 3', 'a b 4']
+        with self.assertRaises(ValueError):
+            Graph.from_edge_list(lines, weighted=True)
+        for policy, expected in (('first', 5), ('min', 3)):
+            labels, stats = {}, {}
+            g = Graph.from_edge_list(lines, weighted=True, duplicates=policy,
+                                     labels=labels, stats=stats)
+            self.assertEqual(g.edge_count(), 1)
+            self.assertEqual(stats['duplicates'], 2)
+            self.assertEqual(g.get_edge(labels['a'], labels['b']).element(), expected)
+        g = Graph.from_edge_list(lines, directed=True, weighted=True, duplicates='min')
+        self.assertEqual(g.edge_count(), 2)
+        with self.assertRaises(ValueError):
+            Graph.from_edge_list(lines, duplicates='last')
+
+    def assert_statistics(self, g):
+        """Compare the incremental statistics with values recomputed from scratch."""
+        edges = set()
+        for v in g.vertices():
+            edges.update(g.incident_edges(v))
+        self.assertEqual(g.edge_count(), len(edges))
+        self.assertEqual(set(g.iter_edges()), edges)
+        self.assertEqual(len(list(g.iter_edges())), len(edges))
+        for outgoing in (True, False):
+            degrees = [g.degree(v, outgoing) for v in g.vertices()]
+            histogram = {}
+            for d in degrees:
+                histogram[d] = histogram.get(d, 0) + 1
+            self.assertEqual(g.degree_histogram(outgoing), histogram)
+            self.assertEqual(g.max_degree(outgoing), max(degrees, default=0))
+            self.assertAlmostEqual(g.average_degree(outgoing), sum(degrees) / len(degrees) if degrees else 0)
+
+    def test_bulk_mutation_and_statistics(self):
+        rng = random.Random(30)
+        for directed in (False, True):
+            g = Graph(directed)
+            verts = g.insert_vertices(range(60))
+            self.assertEqual([v.element() for v in verts], list(range(60)))
+            pairs = set()
+            while len(pairs) < 200:
+                u, v = rng.sample(verts, 2)
+                if (u, v) not in pairs and (directed or (v, u) not in pairs):
+                    pairs.add((u, v))
+            edges = g.insert_edges((u, v, rng.randint(1, 9)) for u, v in pairs)
+            self.assertEqual(len(edges), 200)
+            g.insert_edge(verts[0], verts[0], 'loop')
+            self.assert_statistics(g)
+            for e in edges[:70]:
+                self.assertEqual(g.remove_edge(e), e.element())
+            self.assert_statistics(g)
+            for v in verts[:10]:
+                self.assertEqual(g.remove_vertex(v), v.element())
+            self.assertEqual(g.vertex_count(), 50)
+            self.assert_statistics(g)
+            for v in verts[10:]:
+                g.remove_vertex(v)
+            self.assertEqual((g.edge_count(), g.max_degree(), g.average_degree()), (0, 0, 0))
+            self.assertEqual(g.degree_histogram(), {})
+            loaded = Graph.from_edge_list(['a a', 'a b', 'b c', 'c a'], directed=directed)
+            self.assert_statistics(loaded)
+
+    def test_mutation_errors(self):
+        g = Graph()
+        a, b, c = g.insert_vertices('abc')
+        e = g.insert_edge(a, b)
+        with self.assertRaises(ValueError):
+            g.insert_edges([(b, c), (b, a)])          # already adjacent
+        self.assertIsNotNone(g.get_edge(c, b))        # earlier records stay inserted
+        self.assert_statistics(g)
+        with self.assertRaises(ValueError):
+            g.insert_edges([(a, Graph().insert_vertex())])
+        with self.assertRaises(TypeError):
+            g.insert_edges([(a, 'c')])
+        g.remove_edge(e)
+        with self.assertRaises(ValueError):
+            g.remove_edge(e)
+        g.insert_edge(a, b, 'ab')
+        self.assertEqual(g.remove_edge(b, a), 'ab')   # by endpoints, as IntGraph does
+        with self.assertRaises(ValueError):
+            g.remove_edge(a, b)
+        with self.assertRaises(TypeError):
+            g.remove_edge(c)                            # a vertex alone is not an edge
+        g.remove_edge(c, b)
+        g.remove_vertex(c)
+        with self.assertRaises(ValueError):
+            g.remove_vertex(c)
+        self.assertEqual((g.vertex_count(), g.edge_count()), (2, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import pickle
+import tempfile
+import unittest
+from array import array
+from TdPCollections.graphs.csr_graph import CSRGraph, FILE_VERSION
+from TdPCollections.graphs.components import connected_components
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths
+from TdPCollections.graphs.strong_components import strong_components
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+class TestGraphFile(unittest.TestCase):
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.csr')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def assert_same_snapshot(self, a, b):
+        self.assertEqual((a.vertex_count(), a.edge_count()), (b.vertex_count(), b.edge_count()))
+        self.assertEqual(a.is_directed(), b.is_directed())
+        self.assertEqual(a.weight_type(), b.weight_type())
+        for outgoing in (True, False):
+            for x, y in zip(a.arrays(outgoing), b.arrays(outgoing)):
+                self.assertEqual(list(x) if x is not None else None, list(y) if y is not None else None)
+        self.assertEqual(a.edges(), b.edges())
+
+    def test_round_trip(self):
+        for directed in (False, True):
+            g = random_graph(120, 400, directed, 22, random_weights(1, 30), str)[0]
+            csr = g.freeze()
+            csr.save(self.filename)
+            for memory_map in (True, False):
+                loaded = CSRGraph.load(self.filename, memory_map)
+                self.assert_same_snapshot(loaded, csr)
+                self.assertEqual([loaded.vertex(i) for i in loaded.vertices()],
+                                 [v.element() for v in g.vertices()])
+                self.assertEqual(loaded.vertex(loaded.index('17')), '17')
+                self.assertEqual(shortest_path_lengths(loaded, 0), shortest_path_lengths(csr, 0))
+                self.assertEqual(strong_components(loaded), strong_components(csr))
+                del loaded
+
+    def test_labels_and_unweighted(self):
+        g = random_graph(30, 60, False, 23, random_weights(1, 30), lambda i: i * 1000)[0]
+        for e in g.edges():
+            e._element = None
+        g.freeze().save(self.filename)
+        loaded = CSRGraph.load(self.filename)
+        self.assertIsNone(loaded.weight_type())
+        self.assertEqual([loaded.vertex(i) for i in range(30)], [v.element() for v in g.vertices()])
+        self.assertEqual(loaded.translate({0: 1}), {next(iter(g.vertices())).element(): 1})
+        CSRGraph([0, 1, 1], [1]).save(self.filename)                  # no labels at all
+        self.assertEqual(CSRGraph.load(self.filename).vertex(1), 1)
+
+    def test_pickle_and_workers(self):
+        g = random_graph(200, 150, False, 24, random_weights(1, 30), str)[0]
+        g.freeze().save(self.filename)
+        loaded = CSRGraph.load(self.filename)
+        self.assertLess(len(pickle.dumps(loaded)), 200)                # only the file name
+        self.assert_same_snapshot(pickle.loads(pickle.dumps(loaded)), loaded)
+        private = CSRGraph.load(self.filename, memory_map=False)
+        self.assert_same_snapshot(pickle.loads(pickle.dumps(private)), loaded)
+        self.assertEqual(connected_components(loaded, workers=2),
+                         connected_components(loaded, workers=1))
+
+    def test_narrow_typecodes(self):
+        offsets, targets = array('i', [0, 2, 3, 3]), array('i', [1, 2, 2])
+        csr = CSRGraph(offsets, targets, array('f', [0.5, 1.5, 2.5]), directed=True)
+        csr.save(self.filename)
+        loaded = CSRGraph.load(self.filename)
+        self.assertEqual(loaded.weight_type(), 'd')
+        self.assertEqual(list(loaded.arrays()[2]), [0.5, 1.5, 2.5])
+        self.assertEqual(shortest_path_lengths(loaded, 0), shortest_path_lengths(csr, 0))
+        csr = CSRGraph(array('i', [0, 1, 2]), array('i', [1, 0]), array('h', [7, 7]))
+        csr.save(self.filename)
+        self.assertEqual(CSRGraph.load(self.filename).weight_type(), 'q')
+        huge = CSRGraph([0, 1, 1], [1], array('Q', [(1 << 64) - 1]), directed=True)
+        with self.assertRaisesRegex(ValueError, "typecode 'Q'"):
+            huge.save(self.filename)
+
+    def test_pickle_views_of_a_mapped_file(self):
+        random_graph(50, 80, True, 25, random_weights(1, 30), str)[0].freeze().save(self.filename)
+        loaded = CSRGraph.load(self.filename)
+        copy = CSRGraph(*loaded.arrays(), directed=True)    # memoryviews, no file name
+        self.assert_same_snapshot(pickle.loads(pickle.dumps(copy)), loaded)
+
+    def test_bad_files(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a graph' * 10)
+        with self.assertRaises(ValueError):
+            CSRGraph.load(self.filename)
+        CSRGraph([0, 1, 2], [1, 0]).save(self.filename)
+        with open(self.filename, 'r+b') as f:
+            f.seek(8)
+            f.write((FILE_VERSION + 1).to_bytes(4, 'little'))
+        with self.assertRaises(ValueError):
+            CSRGraph.load(self.filename)
+        CSRGraph([0, 1, 2], [1, 0]).save(self.filename)
+        with open(self.filename, 'r+b') as f:
+            f.truncate(70)
+        with self.assertRaises(ValueError):
+            CSRGraph.load(self.filename)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.graph_views import SubgraphView, EdgeFilterView, ReversedView
+from TdPCollections.graphs.bfs import BFS_complete
+from TdPCollections.graphs.dfs import DFS_complete
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths
+from TdPCollections.graphs.topological_sort import topological_sort
+from TdPCollections.graphs.mst import MST_Kruskal, MST_PrimJarnik
+from TdPCollections.graphs.components import connected_components
+from TdPCollections.graphs.strong_components import strong_components
+from TdPCollections.graphs.transitive_closure import floyd_warshall
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+def materialize(view):
+    """Copy a view into a new Graph; return it with the map from old to new vertices."""
+    g = Graph(view.is_directed())
+    copy = {v: g.insert_vertex(v.element()) for v in view.vertices()}
+    for e in view.edges():
+        u, v = e.endpoints()
+        if view.get_edge(u, v) is None:         # reversed view
+            u, v = v, u
+        g.insert_edge(copy[u], copy[v], e.element())
+    return g, copy
+
+def by_element(result):
+    return {v.element(): x for v, x in result.items()}
+
+class TestGraphViews(unittest.TestCase):
+    def setUp(self):
+        self.g, self.verts = random_graph(150, 450, False, 25, random_weights(1, 40))
+        self.dag, self.dverts = random_graph(120, 300, True, 26, random_weights(1, 40), acyclic=True)
+
+    def assert_same_results(self, view):
+        g, copy = materialize(view)
+        self.assertEqual((view.vertex_count(), view.edge_count()), (g.vertex_count(), g.edge_count()))
+        for v, w in copy.items():
+            self.assertEqual(view.degree(v), g.degree(w))
+            self.assertEqual(view.degree(v, False), g.degree(w, False))
+        src = next(iter(view.vertices()))
+        self.assertEqual(by_element(shortest_path_lengths(view, src)),
+                         by_element(shortest_path_lengths(g, copy[src])))
+        self.assertEqual(set(BFS_complete(view)), set(copy))
+        self.assertEqual(set(DFS_complete(view)), set(copy))
+        component, sizes = connected_components(view, workers=1)
+        self.assertEqual(sorted(sizes), sorted(connected_components(g, workers=1)[1]))
+        self.assertEqual(view.freeze().edge_count(), g.edge_count())
+        return g, copy
+
+    def test_subgraph(self):
+        keep = self.verts[:60]
+        view = self.g.subgraph(keep)
+        self.assertIsInstance(view, SubgraphView)
+        g, copy = self.assert_same_results(view)
+        self.assertAlmostEqual(sum(e.element() for e in MST_Kruskal(view)),
+                               sum(e.element() for e in MST_Kruskal(g)))
+        outside = self.verts[100]
+        with self.assertRaises(ValueError):
+            list(view.incident_edges(outside))
+        with self.assertRaises(ValueError):
+            Graph().subgraph([outside])
+
+    def test_edge_filter(self):
+        view = EdgeFilterView(self.g, lambda e: e.element() < 20)
+        g, copy = self.assert_same_results(view)
+        self.assertTrue(all(e.element() < 20 for e in view.edges()))
+        self.assertEqual(sum(e.element() for e in MST_PrimJarnik(view)),
+                         sum(e.element() for e in MST_PrimJarnik(g)))
+        a, b = self.verts[0], self.verts[1]
+        before = view.edge_count()
+        if self.g.get_edge(a, b) is None:
+            self.g.insert_edge(a, b, 1)              # changes show through the view
+            self.assertEqual(view.edge_count(), before + 1)
+            self.assertIsNotNone(view.get_edge(b, a))
+
+    def test_reversed(self):
+        view = self.dag.reversed()
+        self.assertIsInstance(view, ReversedView)
+        self.assert_same_results(view)
+        order = topological_sort(view)
+        position = {v: i for i, v in enumerate(order)}
+        for e in self.dag.edges():
+            u, v = e.endpoints()
+            self.assertLess(position[v], position[u])
+        self.assertEqual(strong_components(view)[1], self.dag.vertex_count())
+        u, v = next(iter(self.dag.edges())).endpoints()
+        self.assertIsNotNone(ReversedView(view).get_edge(u, v))     # reversed twice
+        self.assertIsNone(view.get_edge(u, v))
+        with self.assertRaises(ValueError):
+            self.g.reversed()
+
+    def test_composed_views(self):
+        view = self.dag.reversed().subgraph(self.dverts[::2])
+        self.assert_same_results(EdgeFilterView(view, lambda e: e.element() % 3 != 0))
+
+    def test_floyd_warshall(self):
+        def pairs(g):
+            return {tuple(x.element() for x in e.endpoints()) for e in g.edges()}
+        for view in (self.dag.reversed().subgraph(self.dverts[:40]),
+                     EdgeFilterView(self.g.subgraph(self.verts[:40]), lambda e: e.element() < 30)):
+            closure = floyd_warshall(view)
+            self.assertIsInstance(closure, Graph)
+            expected = floyd_warshall(materialize(view)[0])
+            self.assertEqual(closure.edge_count(), expected.edge_count())
+            if view.is_directed():
+                self.assertEqual(pairs(closure), pairs(expected))
+                self.assertTrue(all(a > b for a, b in pairs(closure)))   # reversed edges
+        self.assertEqual(self.dag.edge_count(), 300)   # the base graph is untouched
+
+if __name__ == '__main__':
+    unittest.main()
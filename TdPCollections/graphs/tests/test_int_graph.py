@@ -0,0 +1,142 @@
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.int_graph import IntGraph
+from TdPCollections.graphs.bfs import BFS_complete
+from TdPCollections.graphs.dfs import DFS_complete
+from TdPCollections.graphs.topological_sort import topological_sort
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths
+from TdPCollections.graphs.mst import MST_Kruskal, MST_PrimJarnik
+from TdPCollections.graphs.transitive_closure import floyd_warshall, ReachabilityIndex
+from TdPCollections.graphs.dynamic_topological_order import DynamicTopologicalOrder, CycleError
+
+def random_pairs(n, m, seed):
+    rng = random.Random(seed)
+    pairs = {}
+    while len(pairs) < m:
+        u, v = rng.sample(range(n), 2)
+        if (u, v) not in pairs and (v, u) not in pairs:
+            pairs[(u, v)] = rng.randint(1, 50)
+    return pairs
+
+class TestIntGraph(unittest.TestCase):
+    def setUp(self):
+        self.pairs = random_pairs(500, 1500, 21)
+        self.g = IntGraph(500, weights='q')
+        self.ref = Graph()
+        self.verts = [self.ref.insert_vertex(i) for i in range(500)]
+        for (u, v), w in self.pairs.items():
+            self.g.insert_edge(u, v, w)
+            self.ref.insert_edge(self.verts[u], self.verts[v], w)
+
+    def test_basic_interface(self):
+        g = self.g
+        self.assertEqual((g.vertex_count(), g.edge_count()), (500, 1500))
+        self.assertEqual(len(g.edges()), 1500)
+        (u, v), w = next(iter(self.pairs.items()))
+        self.assertEqual(g.get_edge(v, u).element(), w)
+        self.assertEqual(g.get_edge(u, v).endpoints(), (min(u, v), max(u, v)))
+        for x in range(500):
+            self.assertEqual(g.degree(x), self.ref.degree(self.verts[x]))
+        with self.assertRaises(ValueError):
+            g.insert_edge(v, u, 1)
+        with self.assertRaises(ValueError):
+            g.insert_edge(u, 500, 1)
+        with self.assertRaises(ValueError):
+            g.insert_edge(0, 0)                     # weight required
+        free = next(x for x in range(1, 500) if g.get_edge(0, x) is None)
+        with self.assertRaises(TypeError):
+            g.insert_edge(0, free, 2.5)             # not a 'q' weight: graph left unchanged
+        self.assertEqual((g.edge_count(), g.degree(0)), (1500, self.ref.degree(self.verts[0])))
+        self.assertEqual(g.insert_edge(0, free, 7).element(), 7)
+
+    def test_remove_edge(self):
+        for (u, v) in list(self.pairs)[:500]:
+            self.assertEqual(self.g.remove_edge(v, u), self.pairs[(u, v)])
+            self.assertIsNone(self.g.get_edge(u, v))
+        (a, b), w = list(self.pairs.items())[500]
+        self.assertEqual(self.g.remove_edge(self.g.get_edge(a, b)), w)  # an Edge, as Graph takes
+        self.g.insert_edge(a, b, w)
+        self.assertEqual(self.g.edge_count(), 1000)
+        self.assertEqual(sum(self.g.degree(x) for x in self.g.vertices()), 2000)
+        with self.assertRaises(ValueError):
+            self.g.remove_edge(u, v)
+        with self.assertRaises(TypeError):
+            self.g.remove_edge(u)                   # a vertex alone is not an edge
+        rest = {(min(u, v), max(u, v)): w for (u, v), w in list(self.pairs.items())[500:]}
+        self.assertEqual({e.endpoints(): e.element() for e in self.g.edges()}, rest)
+
+    def test_directed(self):
+        g = IntGraph(3, directed=True)
+        g.insert_edge(0, 1)
+        g.insert_edge(2, 1)
+        g.insert_edge(1, 1)
+        self.assertEqual((g.degree(1), g.degree(1, False)), (1, 3))
+        self.assertEqual({e.endpoints() for e in g.incident_edges(1, False)}, {(0, 1), (2, 1), (1, 1)})
+        g.remove_edge(1, 1)
+        self.assertEqual(g.degree(1, False), 2)
+        self.assertEqual(topological_sort(g)[-1], 1)
+        self.assertEqual(g.insert_vertex(), 3)
+        with self.assertRaises(ValueError):
+            g.insert_edge(0, 3, 5)                  # unweighted graph takes no weight
+        self.assertEqual(g.degree(0), 1)
+
+    def test_algorithms_match_graph(self):
+        g, ref, verts = self.g, self.ref, self.verts
+        self.assertEqual(set(BFS_complete(g)), set(range(500)))
+        self.assertEqual(set(DFS_complete(g)), set(range(500)))
+        lengths = shortest_path_lengths(g, 0)
+        expected = shortest_path_lengths(ref, verts[0])
+        self.assertEqual({verts[v]: d for v, d in lengths.items()}, expected)
+        total = sum(e.element() for e in MST_Kruskal(ref))
+        self.assertEqual(sum(e.element() for e in MST_Kruskal(g)), total)
+        self.assertEqual(sum(e.element() for e in MST_PrimJarnik(g)), total)
+        csr = g.freeze()
+        self.assertEqual(csr.edge_count(), 1500)
+        self.assertEqual(shortest_path_lengths(csr, 0), lengths)
+
+    def test_closure_and_topological_order(self):
+        g = IntGraph(30, directed=True, weights='q')
+        ref = Graph(directed=True)
+        verts = [ref.insert_vertex(i) for i in range(30)]
+        for (u, v), w in random_pairs(30, 60, 22).items():
+            u, v = min(u, v), max(u, v)             # acyclic: edges go up
+            g.insert_edge(u, v, w)
+            ref.insert_edge(verts[u], verts[v], w)
+        index = ReachabilityIndex(g)
+        closure = floyd_warshall(g)
+        expected = floyd_warshall(ref)
+        copies = list(expected.vertices())          # vertices of the copied graph
+        self.assertEqual(closure.edge_count(), expected.edge_count())
+        for u in range(30):
+            self.assertEqual(set(index.descendants(u)),
+                             {e.opposite(copies[u]).element() for e in expected.incident_edges(copies[u])})
+            for v in range(30):
+                self.assertEqual(index.reachable(u, v), u == v or closure.get_edge(u, v) is not None)
+        with self.assertRaises(ValueError):
+            index.reachable(0, 30)
+        for e in closure.edges():                   # original weights, or shortest distances
+            u, v = e.endpoints()
+            original = g.get_edge(u, v)
+            self.assertEqual(e.element(), original.element() if original is not None
+                             else shortest_path_lengths(g, u)[v])
+        dto = DynamicTopologicalOrder(g)
+        x = dto.insert_vertex()
+        dto.insert_edge(x, 0, 1)
+        self.assertLess(dto.position(x), dto.position(0))
+        with self.assertRaises(CycleError):
+            dto.insert_edge(0, x, 1)
+        with self.assertRaises(ValueError):
+            g.insert_vertex('label')
+
+    def test_memory_usage(self):
+        g = IntGraph(1000)
+        base = g.memory_usage()
+        for u in range(1000):
+            for v in range(u + 1, u + 21):
+                g.insert_edge(u, v % 1000)
+        per_edge = (g.memory_usage() - base) / g.edge_count()
+        self.assertLess(per_edge, 24)               # two 8-byte slots plus growth slack
+
+if __name__ == '__main__':
+    unittest.main()
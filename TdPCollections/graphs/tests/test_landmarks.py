@@ -0,0 +1,95 @@
+import random
+import unittest
+from TdPCollections.graphs.int_graph import IntGraph
+from TdPCollections.graphs import landmarks
+from TdPCollections.graphs.landmarks import LandmarkIndex
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths, astar_shortest_path
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+class TestLandmarks(unittest.TestCase):
+    def check_bounds(self, g, verts, index):
+        for u in verts[:15]:
+            exact = shortest_path_lengths(g, u)
+            for v in verts:
+                lower, upper = index.lower_bound(u, v), index.upper_bound(u, v)
+                self.assertLessEqual(lower, exact[v])
+                self.assertGreaterEqual(upper, exact[v])
+
+    def test_bounds_undirected(self):
+        g, verts = random_graph(150, 400, False, 32, random_weights(1, 20))
+        for numpy in (landmarks.np, None):
+            saved, landmarks.np = landmarks.np, numpy
+            try:
+                index = LandmarkIndex(g, k=6, seed=1)
+                self.assertEqual(index.landmark_count(), 6)
+                self.assertEqual(len(set(index.landmarks())), 6)
+                self.check_bounds(g, verts, index)
+                landmark = index.landmarks()[0]
+                for v in verts[:20]:                       # exact through a landmark
+                    self.assertEqual(index.lower_bound(landmark, v), index.upper_bound(landmark, v))
+                self.assertEqual(index.memory_usage(), 150 * 6 * 8)
+            finally:
+                landmarks.np = saved
+
+    def test_bounds_directed_and_unreachable(self):
+        g, verts = random_graph(120, 300, True, 33, random_weights(1, 20))
+        island = g.insert_vertex('island')
+        verts.append(island)
+        index = LandmarkIndex(g, k=5, strategy='degree', workers=2)
+        self.check_bounds(g, verts, index)
+        self.assertEqual(index.lower_bound(verts[0], island), float('inf'))
+        self.assertEqual(index.memory_usage(), 121 * 5 * 8 * 2)
+        farthest = LandmarkIndex(g, k=5, workers=2, seed=4)
+        first, second = farthest.landmarks()[:2]                 # unreached vertices come first
+        lengths = shortest_path_lengths(g, first)
+        if float('inf') in lengths.values():
+            self.assertEqual(lengths[second], float('inf'))
+        self.check_bounds(g, verts, farthest)
+
+    def test_astar_heuristic(self):
+        g, verts = random_graph(300, 900, False, 34, random_weights(1, 20))
+        index = LandmarkIndex(g, k=8, seed=2)
+        src = verts[0]
+        exact = shortest_path_lengths(g, src)
+        guided = plain = 0
+        for dst in verts[1:30]:
+            path, cost, settled = index.shortest_path(src, dst)
+            self.assertEqual(cost, exact[dst])
+            self.assertEqual(sum(g.get_edge(a, b).element() for a, b in zip(path, path[1:])), cost)
+            guided += settled
+            plain += astar_shortest_path(g, src, dst, lambda v: 0)[2]
+        self.assertLess(guided, plain)
+        csr = g.freeze()
+        snapshot = LandmarkIndex(csr, k=4, strategy='degree')
+        path, cost, settled = snapshot.shortest_path(0, 7)
+        self.assertEqual(cost, exact[csr.vertex(7)])
+        with self.assertRaises(ValueError):
+            LandmarkIndex(g, strategy='random')
+
+    def test_int_graph_matches_brute_force(self):
+        rng = random.Random(35)
+        for directed in (False, True):
+            g = IntGraph(60, directed=directed, weights='q')
+            while g.edge_count() < 120:
+                u, v = rng.sample(range(60), 2)
+                if g.get_edge(u, v) is None:
+                    g.insert_edge(u, v, rng.randint(1, 20))
+            exact = [shortest_path_lengths(g, u) for u in range(60)]
+            for numpy in (landmarks.np, None):
+                saved, landmarks.np = landmarks.np, numpy
+                try:
+                    for strategy in ('farthest', 'degree'):
+                        for workers in (1, 2):
+                            index = LandmarkIndex(g, k=4, strategy=strategy, workers=workers, seed=5)
+                            self.assertTrue(all(isinstance(x, int) for x in index.landmarks()))
+                            for u in range(0, 60, 7):
+                                for v in range(60):
+                                    self.assertLessEqual(index.lower_bound(u, v), exact[u][v])
+                                    self.assertGreaterEqual(index.upper_bound(u, v), exact[u][v])
+                                    if exact[u][v] < float('inf') and v % 5 == 0:
+                                        self.assertEqual(index.shortest_path(u, v)[1], exact[u][v])
+                finally:
+                    landmarks.np = saved
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+from fractions import Fraction
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs import mst
+from TdPCollections.graphs.mst import (MST_Kruskal, MST_PrimJarnik, MST_Kruskal_sorted, MST_Boruvka,
+                                      MST_PrimJarnik_dense)
+from TdPCollections.graphs.partition import ArrayPartition
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+def float_weights(rng, u, v):
+    return rng.random()
+
+class TestMST(unittest.TestCase):
+    def test_sorted_kruskal_matches_existing(self):
+        for floats in (False, True):
+            g, verts = random_graph(150, 600, seed=17, weight=float_weights if floats else random_weights(1, 1000))
+            expected = sum(e.element() for e in MST_Kruskal(g))
+            tree, total = MST_Kruskal_sorted(g)
+            self.assertAlmostEqual(total, expected)
+            self.assertEqual(len(tree), 149)
+            self.assertTrue(all(e in g.edges() for e in tree))
+            self.assertAlmostEqual(sum(e.element() for e in MST_PrimJarnik(g)), expected)
+            csr_tree, csr_total = MST_Kruskal_sorted(g.freeze())
+            self.assertAlmostEqual(csr_total, expected)
+
+    def test_sorted_kruskal_without_numpy(self):
+        saved, mst.np = mst.np, None
+        try:
+            g, verts = random_graph(80, 200, seed=18, weight=random_weights(1, 1000))
+            self.assertEqual(MST_Kruskal_sorted(g)[1], sum(e.element() for e in MST_Kruskal(g)))
+        finally:
+            mst.np = saved
+
+    def test_forest_and_errors(self):
+        g = Graph()
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b, 3)
+        g.insert_edge(c, d, 1)
+        tree, total = MST_Kruskal_sorted(g)
+        self.assertEqual((len(tree), total), (2, 4))
+        g.insert_edge(b, c)
+        with self.assertRaises(ValueError):
+            MST_Kruskal_sorted(g)
+
+    def test_boruvka_matches_kruskal(self):
+        g, verts = random_graph(200, 700, seed=19, weight=float_weights)   # distinct weights
+        expected = set(MST_Kruskal(g))
+        for workers in (1, 2):
+            tree, total = MST_Boruvka(g, workers=workers, chunks=5)
+            self.assertEqual(set(tree), expected)
+            self.assertAlmostEqual(total, sum(e.element() for e in expected))
+        csr = g.freeze()
+        tree, total = MST_Boruvka(csr, workers=1)
+        self.assertEqual(set(csr.translate(tree)), expected)
+
+    def test_boruvka_ties_and_forest(self):
+        g = Graph()
+        a, b, c, d, e = (g.insert_vertex(x) for x in 'abcde')
+        for u, v in ((a, b), (b, c), (c, a), (d, e)):
+            g.insert_edge(u, v, 1)                # equal weights must not close a cycle
+        tree, total = MST_Boruvka(g, workers=1)
+        self.assertEqual((len(tree), total), (3, 3))
+        self.assertEqual(MST_Boruvka(Graph(), workers=1), ([], 0))
+
+    def test_dense_prim(self):
+        g, verts = random_graph(40, 700, seed=20, weight=float_weights)   # about 90% of all pairs
+        expected = set(MST_Kruskal(g))
+        for numpy in (mst.np, None):
+            saved, mst.np = mst.np, numpy
+            try:
+                self.assertEqual(set(MST_PrimJarnik_dense(g)), expected)
+                self.assertEqual(set(MST_PrimJarnik(g)), expected)    # chosen by density
+                csr = g.freeze()
+                self.assertEqual(set(csr.translate(MST_PrimJarnik_dense(csr))), expected)
+            finally:
+                mst.np = saved
+
+    def test_dense_graph_with_fraction_weights(self):
+        g = Graph()
+        verts = [g.insert_vertex(i) for i in range(6)]
+        for i, u in enumerate(verts):
+            for v in verts[i+1:]:
+                g.insert_edge(u, v, Fraction(u.element() + v.element(), 3))   # complete graph
+        tree = MST_PrimJarnik(g)                   # non-numeric weights keep the heap
+        self.assertEqual(set(tree), set(MST_Kruskal(g)))
+        self.assertEqual(sum(e.element() for e in tree), Fraction(15, 3))
+
+    def test_dense_prim_matrix(self):
+        inf = float('inf')
+        w = [[0, 4, 1, inf, inf],
+             [4, 0, 2, inf, inf],
+             [1, 2, 0, inf, inf],
+             [inf, inf, inf, 0, 7],
+             [inf, inf, inf, 7, 0]]
+        tree = MST_PrimJarnik_dense(w)
+        self.assertEqual(sorted(sorted(e[:2]) + [e[2]] for e in tree), [[0, 2, 1], [1, 2, 2], [3, 4, 7]])
+        if mst.np is not None:
+            self.assertEqual(MST_PrimJarnik_dense(mst.np.array(w)), tree)
+
+    def test_array_partition(self):
+        forest = ArrayPartition(5)
+        self.assertTrue(forest.union(0, 1))
+        self.assertTrue(forest.union(3, 4))
+        self.assertFalse(forest.union(1, 0))
+        self.assertEqual(forest.find(0), forest.find(1))
+        self.assertNotEqual(forest.find(0), forest.find(3))
+        self.assertEqual(forest.group_count(), 3)
+        self.assertEqual(forest.make_group(), 5)
+        self.assertEqual((len(forest), forest.group_count()), (6, 4))
+
+if __name__ == '__main__':
+    unittest.main()
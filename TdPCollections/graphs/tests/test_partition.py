@@ -0,0 +1,40 @@
+import random
+import unittest
+from TdPCollections.graphs.partition import Partition, ArrayPartition
+
+class TestPartition(unittest.TestCase):
+    def test_long_chain_find(self):
+        p = Partition()
+        positions = [p.make_group(i) for i in range(5000)]
+        for a, b in zip(positions, positions[1:]):
+            b._parent = a                 # worst case chain, no union by size
+        leader = p.find(positions[-1])    # recursive find would overflow the stack
+        self.assertIs(leader, positions[0])
+        self.assertTrue(all(x._parent is leader for x in positions))
+
+    def test_bulk_operations(self):
+        rng = random.Random(8)
+        n = 300
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(200)]
+        bulk = ArrayPartition(n)
+        single = ArrayPartition(n)
+        merges = bulk.union_many(pairs)
+        self.assertEqual(merges, sum(single.union(i, j) for i, j in pairs))
+        self.assertEqual(bulk.group_count(), n - merges)
+        self.assertEqual(list(bulk.find_many(range(n))), [single.find(i) for i in range(n)])
+        label = bulk.labels()
+        self.assertEqual(label[0], 0)
+        self.assertEqual(len(set(label)), bulk.group_count())
+        for i, j in pairs:
+            self.assertEqual(label[i], label[j])
+        first = {}
+        for i, c in enumerate(label):     # groups numbered by smallest element
+            first.setdefault(c, i)
+        self.assertEqual(sorted(first, key=first.get), list(range(bulk.group_count())))
+        histogram = bulk.size_histogram()
+        self.assertEqual(sum(histogram.values()), bulk.group_count())
+        self.assertEqual(sum(s * c for s, c in histogram.items()), n)
+        self.assertEqual(bulk.group_size(pairs[0][0]), label.count(label[pairs[0][0]]))
+
+if __name__ == '__main__':
+    unittest.main()
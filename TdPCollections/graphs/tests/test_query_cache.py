@@ -0,0 +1,133 @@
+import copy
+import gc
+import pickle
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.int_graph import IntGraph
+from TdPCollections.graphs.query_cache import QueryCache
+from TdPCollections.graphs.shortest_paths import shortest_path_lengths, shortest_path_tree
+from TdPCollections.graphs.topological_sort import topological_sort
+
+def random_dag(n, m, seed):
+    rng = random.Random(seed)
+    g = Graph(directed=True)
+    verts = [g.insert_vertex(i) for i in range(n)]
+    while g.edge_count() < m:
+        u, v = sorted(rng.sample(range(n), 2))
+        if g.get_edge(verts[u], verts[v]) is None:
+            g.insert_edge(verts[u], verts[v], rng.randint(1, 10))
+    return g, verts
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.g, self.verts = random_dag(80, 250, 31)
+
+    def test_hits_and_results(self):
+        cache = QueryCache(self.g)
+        src = self.verts[0]
+        lengths = cache.shortest_path_lengths(src)
+        self.assertEqual(lengths, shortest_path_lengths(self.g, src))
+        self.assertIs(cache.shortest_path_lengths(src), lengths)
+        tree = cache.shortest_path_tree(src)
+        self.assertEqual(tree, shortest_path_tree(self.g, src, lengths))
+        self.assertEqual(cache.bfs(src)[src], None)
+        self.assertEqual(cache.topological_sort(), topological_sort(self.g))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 4, 4))
+        self.assertGreater(cache.memory_usage(), 0)
+
+    def test_invalidation_on_mutation(self):
+        cache = QueryCache(self.g)
+        src = self.verts[0]
+        before = self.g.version()
+        cache.shortest_path_lengths(src)
+        v = self.g.insert_vertex('new')
+        self.assertGreater(self.g.version(), before)
+        self.assertEqual((len(cache), cache.memory_usage()), (0, 0))   # dropped immediately
+        self.assertEqual(cache.shortest_path_lengths(src)[v], float('inf'))
+        e = self.g.insert_edge(src, v, 1)
+        self.assertEqual(cache.shortest_path_lengths(src)[v], 1)
+        self.g.remove_edge(e)
+        self.assertEqual(cache.shortest_path_lengths(src)[v], float('inf'))
+        self.g.remove_vertex(v)
+        self.assertNotIn(v, cache.shortest_path_lengths(src))
+        self.assertEqual(cache.stats()['invalidations'], 4)
+
+    def test_one_notification_per_mutator(self):
+        g = self.g
+        calls = []
+        class Observer:
+            def _graph_changed(self, graph):
+                calls.append((graph.version(), graph.edge_count(), len(list(graph.iter_edges()))))
+        observer = Observer()
+        g._observe(observer)
+        v = g.insert_vertex('hub')
+        g.insert_edges([(v, w) for w in self.verts[:20]])
+        g.remove_vertex(v)
+        added = g.insert_vertices(range(50))
+        self.assertEqual(len(added), 50)
+        self.assertEqual(len(calls), 4)
+        for version, count, listed in calls:
+            self.assertEqual(count, listed)              # the graph is consistent when notified
+        self.assertEqual([c[0] for c in calls], list(range(calls[0][0], calls[0][0] + 4)))
+
+    def test_int_graph_and_views(self):
+        g = IntGraph(4, directed=True, weights='q')
+        g.insert_edge(0, 1, 1)
+        cache = QueryCache(g)
+        self.assertEqual(cache.shortest_path_lengths(0)[2], float('inf'))
+        g.insert_edge(1, 2, 1)
+        self.assertEqual(cache.shortest_path_lengths(0)[2], 2)
+        g.remove_edge(0, 1)
+        self.assertEqual(cache.shortest_path_lengths(0)[2], float('inf'))
+        src, a, b = self.verts[0], self.verts[1], self.verts[2]
+        for e in list(self.g.incident_edges(src)):
+            self.g.remove_edge(e)
+        view = self.g.subgraph([src, a, b])
+        cache = QueryCache(view)
+        self.assertEqual(cache.shortest_path_lengths(src)[a], float('inf'))
+        self.g.insert_edge(src, a, 5)
+        self.assertEqual(len(cache), 0)                    # the view forwards changes
+        self.assertEqual(cache.shortest_path_lengths(src)[a], 5)
+        self.assertEqual(QueryCache(view.reversed()).shortest_path_lengths(a)[src], 5)
+        with self.assertRaises(TypeError):
+            QueryCache(object())
+
+    def test_lru_eviction_and_memory_bound(self):
+        cache = QueryCache(self.g, max_entries=3)
+        for v in self.verts[:3]:
+            cache.shortest_path_lengths(v)
+        cache.shortest_path_lengths(self.verts[0])        # most recently used
+        cache.shortest_path_lengths(self.verts[3])        # evicts verts[1]
+        self.assertEqual(cache.stats()['evictions'], 1)
+        misses = cache.stats()['misses']
+        cache.shortest_path_lengths(self.verts[0])
+        self.assertEqual(cache.stats()['misses'], misses)
+        cache.shortest_path_lengths(self.verts[1])
+        self.assertEqual(cache.stats()['misses'], misses + 1)
+        one = cache.memory_usage() / len(cache)
+        small = QueryCache(self.g, max_entries=100, max_bytes=2.5 * one)
+        for v in self.verts[:10]:
+            small.shortest_path_lengths(v)
+        self.assertLessEqual(small.memory_usage(), 2.5 * one)
+        self.assertEqual(len(small), 2)
+        with self.assertRaises(ValueError):
+            QueryCache(self.g, max_entries=0)
+
+    def test_graph_copies_and_snapshots(self):
+        cache = QueryCache(self.g)
+        clone = copy.deepcopy(self.g)                      # the copy has no observers
+        clone.insert_vertex('x')
+        self.assertEqual(pickle.loads(pickle.dumps(self.g)).vertex_count(), 80)
+        cache.topological_sort()
+        del cache
+        gc.collect()
+        self.g.insert_vertex('y')                          # dead observers are skipped
+        self.assertEqual(self.g._observers, [])
+        csr = self.g.freeze()
+        snapshot = QueryCache(csr)
+        self.assertIs(snapshot.shortest_path_lengths(0), snapshot.shortest_path_lengths(0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.dfs import construct_path
+from TdPCollections.graphs import shortest_paths
+from TdPCollections.graphs.shortest_paths import (shortest_path_lengths, shortest_path_search,
+                                                  bidirectional_shortest_path, astar_shortest_path)
+from TdPCollections.priority_queue.bucket_priority_queue import BucketPriorityQueue
+from TdPCollections.priority_queue.radix_heap_priority_queue import RadixHeapPriorityQueue
+from TdPCollections.graphs.tests.helpers import random_graph, random_weights
+
+def grid_graph(size, seed=4):
+    """Undirected grid whose vertex elements are (x, y) and whose weights are >= 1."""
+    rng = random.Random(seed)
+    g = Graph()
+    cell = {(x, y): g.insert_vertex((x, y)) for x in range(size) for y in range(size)}
+    for (x, y), v in cell.items():
+        for nxt in ((x + 1, y), (x, y + 1)):
+            if nxt in cell:
+                g.insert_edge(v, cell[nxt], rng.randint(1, 3))
+    return g, cell
+
+def path_cost(g, path):
+    return sum(g.get_edge(a, b).element() for a, b in zip(path, path[1:]))
+
+class TestShortestPaths(unittest.TestCase):
+    def setUp(self):
+        self.g, self.verts = random_graph(200, 600, True, 3, random_weights(1, 20))
+        self.src = self.verts[0]
+        lengths = shortest_path_lengths(self.g, self.src)
+        self.expected = {v: x for v, x in lengths.items() if x != float('inf')}
+
+    def test_search_matches_shortest_path_lengths(self):
+        cloud, tree = shortest_path_search(self.g, self.src)
+        self.assertEqual(cloud, self.expected)
+        self.assertEqual(set(tree), set(cloud) - {self.src})
+        for v, e in tree.items():
+            u = e.opposite(v)
+            self.assertEqual(cloud[v], cloud[u] + e.element())
+
+    def test_early_exit(self):
+        target = max(self.expected, key=self.expected.get)   # farthest vertex
+        near = min((v for v in self.expected if v is not self.src), key=self.expected.get)
+        cloud, tree = shortest_path_search(self.g, self.src, near)
+        self.assertEqual(cloud[near], self.expected[near])
+        self.assertLess(len(cloud), len(self.expected))
+        cloud, tree = shortest_path_search(self.g, self.src, [near, target])
+        self.assertEqual(cloud[target], self.expected[target])
+        path = construct_path(self.src, target, tree)
+        self.assertEqual(path[0], self.src)
+        self.assertEqual(sum(self.g.get_edge(a, b).element() for a, b in zip(path, path[1:])),
+                         self.expected[target])
+
+    def test_snapshot(self):
+        csr = self.g.freeze()
+        cloud, tree = shortest_path_search(csr, csr.index(self.src))
+        self.assertEqual(csr.translate(cloud), self.expected)
+        self.assertEqual(set(csr.translate(tree)), set(self.expected) - {self.src})
+        target = csr.index(self.verts[5])
+        cloud, tree = shortest_path_search(csr, csr.index(self.src), target)
+        if self.verts[5] in self.expected:
+            self.assertEqual(cloud[target], self.expected[self.verts[5]])
+
+    def test_bidirectional(self):
+        for v in self.verts[1:40]:
+            path, cost, settled = bidirectional_shortest_path(self.g, self.src, v)
+            if v in self.expected:
+                self.assertEqual(cost, self.expected[v])
+                self.assertEqual((path[0], path[-1]), (self.src, v))
+                self.assertEqual(path_cost(self.g, path), cost)
+            else:
+                self.assertEqual((path, cost), ([], float('inf')))
+        self.assertEqual(bidirectional_shortest_path(self.g, self.src, self.src)[:2], ([self.src], 0))
+
+    def test_astar_and_search_space(self):
+        g, cell = grid_graph(15)
+        src, dst = cell[(0, 0)], cell[(14, 14)]
+        expected = shortest_path_lengths(g, src)[dst]
+        def manhattan(v):
+            (x, y), (tx, ty) = v.element(), dst.element()
+            return abs(x - tx) + abs(y - ty)
+        path, cost, astar_settled = astar_shortest_path(g, src, dst, manhattan)
+        self.assertEqual(cost, expected)
+        self.assertEqual(path_cost(g, path), cost)
+        path, cost, zero_settled = astar_shortest_path(g, src, dst, lambda v: 0)
+        self.assertEqual(cost, expected)
+        self.assertLessEqual(astar_settled, zero_settled)
+        path, cost, bidir_settled = bidirectional_shortest_path(g.freeze(), 0, g.vertex_count() - 1)
+        self.assertEqual(cost, expected)
+
+    def test_integer_weights_use_monotone_queues(self):
+        self.assertIsInstance(shortest_paths._monotone_queue(self.g), BucketPriorityQueue)
+        self.assertIsInstance(shortest_paths._monotone_queue(self.g.freeze()), BucketPriorityQueue)
+        g = Graph(directed=True)
+        verts = [g.insert_vertex(i) for i in range(4)]
+        g.insert_edge(verts[0], verts[1], 10 ** 9)
+        g.insert_edge(verts[1], verts[2], 3)
+        g.insert_edge(verts[0], verts[2], 2 * 10 ** 9)
+        self.assertIsInstance(shortest_paths._monotone_queue(g), RadixHeapPriorityQueue)
+        expected = {verts[0]: 0, verts[1]: 10 ** 9, verts[2]: 10 ** 9 + 3, verts[3]: float('inf')}
+        self.assertEqual(shortest_path_lengths(g, verts[0]), expected)
+        g.insert_edge(verts[2], verts[3], 0.5)
+        self.assertIsNone(shortest_paths._monotone_queue(g))
+        # float weights take the heap path and must give the same distances
+        floats, fverts = random_graph(200, 600, True, 3, random_weights(1, 20))
+        for u in floats.vertices():
+            for e in floats.incident_edges(u):
+                e._element = float(e._element)
+        lengths = shortest_path_lengths(floats, fverts[0])
+        self.assertEqual({v.element(): x for v, x in lengths.items() if x != float('inf')},
+                         {v.element(): x for v, x in self.expected.items()})
+
+    def test_large_integer_weights_use_radix_heap(self):
+        # a long path of heavy edges would make Dial's buckets scan O(total distance)
+        g = Graph(directed=True)
+        verts = [g.insert_vertex(i) for i in range(1000)]
+        for u, v in zip(verts, verts[1:]):
+            g.insert_edge(u, v, 60000)
+        self.assertIsInstance(shortest_paths._monotone_queue(g), RadixHeapPriorityQueue)
+        self.assertIsInstance(shortest_paths._monotone_queue(g.freeze()), RadixHeapPriorityQueue)
+        lengths = shortest_path_lengths(g, verts[0])
+        self.assertEqual(lengths, {v: 60000 * v.element() for v in verts})
+        csr = g.freeze()
+        self.assertEqual(shortest_path_lengths(csr, 0)[999], 60000 * 999)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.dfs import DFS
+from TdPCollections.graphs.strong_components import strong_components, condensation
+
+def reachable_sets(g):
+    result = {}
+    for u in g.vertices():
+        discovered = {u: None}
+        DFS(g, u, discovered)
+        result[u] = set(discovered)
+    return result
+
+class TestStrongComponents(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(9)
+        self.g = Graph(directed=True)
+        self.verts = [self.g.insert_vertex(i) for i in range(60)]
+        while self.g.edge_count() < 90:
+            u, v = rng.sample(self.verts, 2)
+            if self.g.get_edge(u, v) is None:
+                self.g.insert_edge(u, v, rng.randint(1, 9))
+
+    def test_matches_mutual_reachability(self):
+        component, count = strong_components(self.g)
+        reach = reachable_sets(self.g)
+        for u in self.verts:
+            for v in self.verts:
+                mutual = v in reach[u] and u in reach[v]
+                self.assertEqual(component[u] == component[v], mutual)
+        self.assertEqual(count, len(set(component.values())))
+
+    def test_condensation_is_dag(self):
+        dag, component = condensation(self.g)
+        self.assertEqual(dag.vertex_count(), len(set(component.values())))
+        self.assertTrue(dag.is_directed())
+        for c in dag.vertices():
+            self.assertEqual({component[v] for v in dag.vertex(c)}, {c})
+            for e in dag.incident_edges(c):
+                a, b = e.endpoints()
+                self.assertGreater(a, b)          # reverse topological numbering
+                lightest = min(e2.element() for e2 in self.g.edges()
+                               if component[e2.endpoints()[0]] == a
+                               and component[e2.endpoints()[1]] == b)
+                self.assertEqual(e.element(), lightest)
+        pairs = {(component[u], component[v]) for u, v in (e.endpoints() for e in self.g.edges())
+                 if component[u] != component[v]}
+        self.assertEqual(dag.edge_count(), len(pairs))
+
+    def test_long_cycle_on_snapshot(self):
+        g = Graph(directed=True)
+        verts = [g.insert_vertex(i) for i in range(30000)]
+        for i in range(30000):
+            g.insert_edge(verts[i], verts[(i + 1) % 30000])
+        extra = g.insert_vertex('tail')
+        g.insert_edge(verts[0], extra)
+        component, count = strong_components(g.freeze())
+        self.assertEqual(count, 2)
+        self.assertEqual(len(set(component[:30000])), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.topological_sort import (topological_sort, topological_levels,
+                                                    critical_path, parallel_schedule)
+
+class TestTopologicalSort(unittest.TestCase):
+    def setUp(self):
+        # a -> b -> d, a -> c -> d, c -> e
+        self.g = Graph(directed=True)
+        self.v = {x: self.g.insert_vertex(x) for x in 'abcde'}
+        for u, w, delay in (('a', 'b', 1), ('b', 'd', 1), ('a', 'c', 5), ('c', 'd', 1), ('c', 'e', 2)):
+            self.g.insert_edge(self.v[u], self.v[w], delay)
+
+    def test_levels(self):
+        levels = [sorted(x.element() for x in level) for level in topological_levels(self.g)]
+        self.assertEqual(levels, [['a'], ['b', 'c'], ['d', 'e']])
+        self.assertEqual(sum(len(level) for level in levels), len(topological_sort(self.g)))
+
+    def test_critical_path(self):
+        length, path = critical_path(self.g)
+        self.assertEqual(length, 7)
+        self.assertEqual([x.element() for x in path], ['a', 'c', 'e'])
+        duration = {'a': 2, 'b': 10, 'c': 1, 'd': 1, 'e': 1}
+        length, path = critical_path(self.g, lambda x: duration[x.element()], lambda e: 0)
+        self.assertEqual(length, 13)
+        self.assertEqual([x.element() for x in path], ['a', 'b', 'd'])
+        self.g.insert_edge(self.v['d'], self.v['a'], 1)
+        with self.assertRaises(ValueError):
+            critical_path(self.g)
+
+    def test_parallel_schedule(self):
+        finished = []
+        lock = threading.Lock()
+        def task(x):
+            time.sleep(0.01)
+            with lock:
+                finished.append(x)
+            return x.element().upper()
+        results = parallel_schedule(self.g, task, max_workers=3)
+        self.assertEqual({x.element(): r for x, r in results.items()},
+                         {x: x.upper() for x in 'abcde'})
+        order = {x: i for i, x in enumerate(finished)}
+        for e in self.g.edges():
+            u, w = e.endpoints()
+            self.assertLess(order[u], order[w])
+
+    def test_parallel_schedule_errors(self):
+        def task(x):
+            if x.element() == 'c':
+                raise RuntimeError('boom')
+            return x
+        with self.assertRaises(RuntimeError):
+            parallel_schedule(self.g, task)
+        self.g.insert_edge(self.v['d'], self.v['b'], 1)
+        with self.assertRaises(ValueError):
+            parallel_schedule(self.g, lambda x: x)
+
+if __name__ == '__main__':
+    unittest.main()
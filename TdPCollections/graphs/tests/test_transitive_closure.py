@@ -0,0 +1,67 @@
+import unittest
+from TdPCollections.graphs.graph import Graph
+from TdPCollections.graphs.transitive_closure import (floyd_warshall, transitive_closure,
+                                                      ReachabilityIndex)
+from TdPCollections.graphs.tests.helpers import random_graph
+
+def edge_pairs(g):
+    return {(e.endpoints()[0].element(), e.endpoints()[1].element()) for e in g.edges()}
+
+class TestTransitiveClosure(unittest.TestCase):
+    def test_matches_floyd_warshall(self):
+        for directed in (True, False):
+            g, verts = random_graph(30, 40, directed, 2, lambda rng, u, v: (u.element(), v.element()))
+            expected = floyd_warshall(g)
+            closure = transitive_closure(g, materialize=True)
+            self.assertEqual(closure.edge_count(), expected.edge_count())
+            if directed:
+                self.assertEqual(edge_pairs(closure), edge_pairs(expected))
+            index = transitive_closure(g)
+            for u in expected.vertices():
+                for v in expected.vertices():
+                    if u is not v:
+                        self.assertEqual(index.reachable(verts[u.element()], verts[v.element()]),
+                                         expected.get_edge(u, v) is not None)
+
+    def test_components_and_descendants(self):
+        g = Graph(directed=True)
+        a, b, c, d = (g.insert_vertex(x) for x in 'abcd')
+        g.insert_edge(a, b, 1)
+        g.insert_edge(b, a, 2)      # a and b form a cycle
+        g.insert_edge(b, c, 3)
+        index = ReachabilityIndex(g)
+        self.assertEqual(index.component_count(), 3)
+        self.assertEqual(index.component(a), index.component(b))
+        self.assertEqual(set(index.descendants(a)), {b, c})
+        self.assertFalse(index.reachable(c, a))
+        self.assertTrue(index.reachable(d, d))
+        self.assertEqual(len(index.matrix()), 3)
+        closure = index.closure_graph()
+        self.assertEqual(closure.edge_count(), 3 + 1)   # adds a->c
+        elements = {(u.element(), v.element()): e.element()
+                    for e in closure.edges() for u, v in [e.endpoints()]}
+        self.assertEqual(elements, {('a', 'b'): 1, ('b', 'a'): 2, ('b', 'c'): 3, ('a', 'c'): None})
+
+    def test_self_loops_are_kept(self):
+        for directed in (True, False):
+            g = Graph(directed)
+            a, b = g.insert_vertex('a'), g.insert_vertex('b')
+            g.insert_edge(a, a, 'loop')
+            g.insert_edge(a, b, 'ab')
+            closure = transitive_closure(g, materialize=True)
+            self.assertEqual(closure.edge_count(), 2)
+            self.assertEqual(closure.edge_count(), floyd_warshall(g).edge_count())
+            self.assertEqual(sorted(str(e.element()) for e in closure.edges()), ['ab', 'loop'])
+
+    def test_snapshot_and_long_chain(self):
+        g = Graph(directed=True)
+        verts = [g.insert_vertex(i) for i in range(5000)]
+        for i in range(4999):
+            g.insert_edge(verts[i], verts[i + 1])
+        index = ReachabilityIndex(g.freeze())
+        self.assertTrue(index.reachable(0, 4999))
+        self.assertFalse(index.reachable(4999, 0))
+        self.assertEqual(index.component_count(), 5000)
+
+if __name__ == '__main__':
+    unittest.main()
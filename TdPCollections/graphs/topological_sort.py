@@ -19,13 +19,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from tkinter import N
-
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 def topological_sort(g):
   """Return a list of verticies of directed acyclic graph g in topological order.
 
-  If graph g has a cycle, the result will be incomplete.
+  If graph g has a cycle, the result will be incomplete (dfs.find_cycle
+  reports one of the cycles).
   """
   topo = []             # a list of vertices placed in topological order
   ready = []            # list of vertices that have no remaining constraints
@@ -44,6 +44,115 @@ def topological_sort(g):
         ready.append(v)
   return topo
 
+def topological_levels(g):
+  """Generate the vertices of directed acyclic graph g in batches (Kahn levels).
+
+  The first batch holds the vertices without incoming edges; each later batch
+  holds the vertices whose predecessors all appear in earlier batches, so the
+  vertices of a batch are mutually independent. If graph g has a cycle, the
+  vertices on or after it are never generated.
+  """
+  incount = {}
+  level = []
+  for u in g.vertices():
+    incount[u] = g.degree(u, False)
+    if incount[u] == 0:
+      level.append(u)
+  while len(level) > 0:
+    yield level
+    next_level = []
+    for u in level:
+      for e in g.incident_edges(u):
+        v = e.opposite(u)
+        incount[v] -= 1
+        if incount[v] == 0:
+          next_level.append(v)
+    level = next_level
+
+def critical_path(g, vertex_weight=None, edge_weight=None):
+  """Return (length, path) for a longest weighted path of directed acyclic graph g.
+
+  vertex_weight(v) gives the duration of vertex v (0 by default) and
+  edge_weight(e) the delay along edge e (e.element() by default). The length
+  of a path is the sum of its vertex and edge weights; path is the list of
+  its vertices. Raise a ValueError if g has a cycle.
+  """
+  if vertex_weight is None:
+    vertex_weight = lambda v: 0
+  if edge_weight is None:
+    edge_weight = lambda e: e.element()
+  topo = topological_sort(g)
+  if len(topo) != g.vertex_count():
+    raise ValueError('graph has a cycle')
+  finish = {}                      # length of the longest path ending at v
+  pred = {}                        # previous vertex on that path
+  for v in topo:
+    best, walk = 0, None
+    for e in g.incident_edges(v, False):   # predecessors are already finished
+      u = e.opposite(v)
+      length = finish[u] + edge_weight(e)
+      if walk is None or length > best:
+        best, walk = length, u
+    finish[v] = best + vertex_weight(v)
+    pred[v] = walk
+  if len(topo) == 0:
+    return 0, []
+  end = max(topo, key=finish.get)
+  path = [end]
+  while pred[path[-1]] is not None:
+    path.append(pred[path[-1]])
+  path.reverse()
+  return finish[end], path
+
+def parallel_schedule(g, task, executor=None, max_workers=None):
+  """Run task(v) for every vertex of directed acyclic graph g in dependency order.
+
+  Each vertex is submitted to the concurrent.futures executor as soon as all
+  of its predecessors have finished, so independent tasks run in parallel.
+  If executor is None, a ThreadPoolExecutor with max_workers threads is used
+  (with a ProcessPoolExecutor, task and the vertices must be picklable and
+  task receives copies of the vertices).
+
+  Return a dictionary mapping each vertex to the result of its task. If a
+  task raises, no further tasks are submitted and the exception propagates
+  once the running tasks end. Raise a ValueError if g has a cycle.
+  """
+  own = executor is None
+  if own:
+    executor = ThreadPoolExecutor(max_workers)
+  try:
+    incount = {}
+    ready = []
+    for u in g.vertices():
+      incount[u] = g.degree(u, False)
+      if incount[u] == 0:
+        ready.append(u)
+    results = {}
+    running = {}                   # future -> vertex
+    while len(ready) > 0 or len(running) > 0:
+      for u in ready:
+        running[executor.submit(task, u)] = u
+      ready = []
+      done, pending = wait(running, return_when=FIRST_COMPLETED)
+      for future in done:
+        u = running.pop(future)
+        error = future.exception()
+        if error is not None:
+          wait(running)            # let the tasks in flight finish
+          raise error
+        results[u] = future.result()
+        for e in g.incident_edges(u):
+          v = e.opposite(u)
+          incount[v] -= 1
+          if incount[v] == 0:
+            ready.append(v)
+    if len(results) != g.vertex_count():
+      raise ValueError('graph has a cycle')
+    return results
+  finally:
+    if own:
+      executor.shutdown()
+
 if __name__ == '__main__':
   # from .graph_examples import figure_14_12 as example
   # g = example()
@@ -56,21 +165,11 @@ if __name__ == '__main__':
   from pathlib import Path
 
   input_file = Path(__file__).parent / "./graph_example/topological_sort_2021.txt"
-  
-  G = Graph(directed=True)
-  vertexMap = {}
-
-  with input_file.open() as f:
-    for line in f:
-      u,v = line.split()
-
-      if u not in vertexMap:     
-        vertexMap[u] = G.insert_vertex(u)
-
-      if v not in vertexMap:
-        vertexMap[v] = G.insert_vertex(v)
 
-      G.insert_edge(vertexMap[u], vertexMap[v])
+  stats = {}
+  G = Graph.from_edge_list(input_file, directed=True, stats=stats)
+  print("Parsed {0} lines in {1:.4f}s ({2:.0f} lines/s)".format(
+        stats['lines'], stats['seconds'], stats['lines_per_second']))
 
   print("Number of vertices is", G.vertex_count())
   print("Number of edges is", G.edge_count())
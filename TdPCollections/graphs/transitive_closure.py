@@ -20,10 +20,48 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from copy import deepcopy
+from .csr_graph import CSRGraph
+from .graph import Graph
+from .int_graph import IntGraph
+from .strong_components import strong_components
+
+def _copy_graph(g):
+  """Return a new Graph with a vertex for each vertex of g and a copy of each edge.
+
+  g may be any graph or view; the new vertices carry the elements of the
+  original ones (or the vertex ids of a snapshot without vertex objects).
+  """
+  closure = Graph(g.is_directed())
+  copy = {}
+  for v in g.vertices():
+    copy[v] = closure.insert_vertex(v.element() if isinstance(v, Graph.Vertex) else v)
+  for u in g.vertices():
+    for e in g.incident_edges(u):
+      v = e.opposite(u)                      # orientation as seen through g
+      if g.is_directed() or closure.get_edge(copy[u], copy[v]) is None:
+        closure.insert_edge(copy[u], copy[v], e.element())
+  return closure
 
 def floyd_warshall(g):
-  """Return a new graph that is the transitive closure of g."""
-  closure = deepcopy(g)                      # imported from copy module
+  """Return a new graph that is the transitive closure of g.
+
+  g may be a Graph, a view of one or a snapshot, and the result is a new
+  Graph whose vertices carry the same elements; an IntGraph is copied into
+  an IntGraph. Original edges keep their elements and added edges have
+  element None, except in a weighted IntGraph, which cannot store None:
+  there an added edge (i,j) gets the length of a shortest path from i to j
+  (assuming there is no negative cycle).
+  """
+  closure = deepcopy(g) if isinstance(g, IntGraph) else _copy_graph(g)
+  weighted = isinstance(closure, IntGraph) and closure.is_weighted()
+  dist = {}                                  # (i,j) -> shortest distance, if weighted
+  if weighted:
+    for e in closure.iter_edges():
+      i, j = e.endpoints()
+      dist[i,j] = e.element()
+      if not closure.is_directed():
+        dist[j,i] = e.element()
+  added = []                                 # edges (i,j) not in g
   verts = list(closure.vertices())           # make indexable list
   n = len(verts)
   for k in range(n):
@@ -33,11 +71,121 @@ def floyd_warshall(g):
         for j in range(n):
           # verify that edge (k,j) exists in the partial closure
           if i != j != k and closure.get_edge(verts[k],verts[j]) is not None:
+            if weighted:                     # relax the distance through k
+              d = dist[i,k] + dist[k,j]
+              if (i,j) not in dist or d < dist[i,j]:
+                dist[i,j] = d
             # if (i,j) not yet included, add it to the closure
             if closure.get_edge(verts[i],verts[j]) is None:
-              closure.insert_edge(verts[i],verts[j])
+              closure.insert_edge(verts[i],verts[j],dist.get((i,j)))
+              added.append((i,j))
+  if weighted:
+    for i, j in added:                       # replace provisional weights by final distances
+      if closure.get_edge(i,j).element() != dist[i,j]:
+        closure.remove_edge(i,j)
+        closure.insert_edge(i,j,dist[i,j])
   return closure
 
+class ReachabilityIndex:
+  """Transitive closure of a graph stored as one bitset per strong component.
+
+  Strongly connected components are collapsed first; the row of component c
+  is a Python int whose bit d is set when component d is reachable from c.
+  Rows are computed in reverse topological order of the condensation, each
+  as the bitwise OR of the rows of its successors, in O(V+E) big-integer
+  operations and about C*C/8 bytes for C components.
+  """
+
+  def __init__(self, g):
+    """Build the index of g (a Graph or a CSRGraph snapshot)."""
+    self._source = g
+    self._csr = g if isinstance(g, CSRGraph) else g.freeze()
+    self._component, count = strong_components(self._csr)
+    members = [[] for c in range(count)]
+    for v in range(self._csr.vertex_count()):
+      members[self._component[v]].append(v)
+    offsets, targets, _ = self._csr.arrays()
+    rows = []
+    for c in range(count):                  # successors always have smaller ids
+      bits = 1 << c
+      for u in members[c]:
+        for k in range(offsets[u], offsets[u+1]):
+          d = self._component[targets[k]]
+          if d != c:
+            bits |= rows[d]
+      rows.append(bits)
+    self._rows = rows
+    self._members = members
+
+  def _id(self, v):
+    return v if self._csr is self._source else self._csr.index(v)
+
+  def component_count(self):
+    """Return the number of strongly connected components."""
+    return len(self._rows)
+
+  def component(self, v):
+    """Return the id of the strongly connected component containing v."""
+    return self._component[self._id(v)]
+
+  def reachable(self, u, v):
+    """Return True if there is a path from u to v (always True when u is v)."""
+    return (self._rows[self.component(u)] >> self.component(v)) & 1 == 1
+
+  def descendants(self, u):
+    """Generate every vertex other than u that is reachable from u."""
+    u = self._id(u)
+    bits = self._rows[self._component[u]]
+    while bits:
+      low = bits & -bits                    # lowest set bit
+      bits ^= low
+      for v in self._members[low.bit_length() - 1]:
+        if v != u:
+          yield self._csr.vertex(v)
+
+  def matrix(self):
+    """Return the reachability rows as a list of ints indexed by component id."""
+    return list(self._rows)
+
+  def closure_graph(self):
+    """Return a new graph that is the transitive closure of the indexed graph.
+
+    The new graph has one vertex per original vertex (with the same element);
+    original edges keep their elements and added edges have element None.
+    A vertex has a self-loop only if it had one in the original graph, as
+    in floyd_warshall. This materializes every reachable pair and may need O(V^2) space.
+    """
+    csr = self._csr
+    closure = Graph(csr.is_directed())
+    verts = [closure.insert_vertex(self._element(v)) for v in csr.vertices()]
+    offsets, targets, _ = csr.arrays()
+    def pairs():
+      for u in csr.vertices():
+        known = {targets[k]: csr.edge_at(u, k).element() for k in range(offsets[u], offsets[u+1])}
+        bits = self._rows[self._component[u]]
+        while bits:
+          low = bits & -bits
+          bits ^= low
+          for v in self._members[low.bit_length() - 1]:
+            if (v != u or u in known) and (csr.is_directed() or u <= v):
+              yield verts[u], verts[v], known.get(v)
+    closure.insert_edges(pairs())
+    return closure
+
+  def _element(self, v):
+    x = self._csr.vertex(v)
+    return x.element() if isinstance(x, Graph.Vertex) else x
+
+def transitive_closure(g, materialize=False):
+  """Return the reachability closure of g (a Graph or a CSRGraph snapshot).
+
+  By default return a ReachabilityIndex answering reachable(u, v) queries.
+  If materialize is True, return a new Graph holding the closure edges, as
+  floyd_warshall does, but without its O(n^3) cost.
+  """
+  index = ReachabilityIndex(g)
+  return index.closure_graph() if materialize else index
+
 if __name__ == '__main__':
   from graph_examples import figure_14_11 as example
   g = example()
@@ -0,0 +1,70 @@
+from .priority_queue_base import PriorityQueueBase
+
+class Empty(Exception):
+  pass
+
+
+class BucketPriorityQueue(PriorityQueueBase):
+  """A monotone min-oriented priority queue for integer keys (Dial's buckets).
+
+  Keys never decrease below the last removed key and never exceed it by more
+  than the span given at construction, so a circular array of span+1 buckets
+  indexed by key holds every item. add is O(1); remove_min scans forward to
+  the next nonempty bucket, which is amortized O(1) over a Dijkstra run with
+  edge weights bounded by span.
+  """
+
+  #------------------------------ public behaviors ------------------------------
+  def __init__(self, span):
+    """Create a new empty queue accepting keys up to span above the last removed key."""
+    if span < 0:
+      raise ValueError('span must be non-negative')
+    self._buckets = [[] for j in range(span + 1)]
+    self._span = span
+    self._current = 0                  # key of the last removed item (0 at start)
+    self._size = 0
+
+  def __len__(self):
+    """Return the number of items in the priority queue."""
+    return self._size
+
+  def add(self, key, value):
+    """Add a key-value pair.
+
+    Raise ValueError if key lies outside the current monotone window.
+    """
+    if not isinstance(key, int):
+      raise TypeError('key must be an integer')
+    if not self._current <= key <= self._current + self._span:
+      raise ValueError('key outside the monotone window of the queue')
+    self._buckets[key % len(self._buckets)].append(value)
+    self._size += 1
+
+  def _next_key(self):
+    """Return the smallest key in the (nonempty) queue."""
+    key = self._current
+    while not self._buckets[key % len(self._buckets)]:
+      key += 1                         # at most span steps past current
+    return key
+
+  def min(self):
+    """Return but do not remove (k,v) tuple with minimum key.
+
+    Raise Empty exception if empty.
+    """
+    if self.is_empty():
+      raise Empty('Priority queue is empty.')
+    key = self._next_key()
+    return (key, self._buckets[key % len(self._buckets)][-1])
+
+  def remove_min(self):
+    """Remove and return (k,v) tuple with minimum key.
+
+    Raise Empty exception if empty.
+    """
+    if self.is_empty():
+      raise Empty('Priority queue is empty.')
+    key = self._next_key()
+    self._current = key
+    self._size -= 1
+    return (key, self._buckets[key % len(self._buckets)].pop())
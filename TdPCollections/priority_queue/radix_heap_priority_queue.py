@@ -0,0 +1,82 @@
+from .priority_queue_base import PriorityQueueBase
+
+class Empty(Exception):
+  pass
+
+
+class RadixHeapPriorityQueue(PriorityQueueBase):
+  """A monotone min-oriented priority queue for non-negative integer keys.
+
+  Items are kept in buckets according to the highest bit in which their key
+  differs from the last removed key. Removing from an empty bucket 0 takes
+  the first nonempty bucket and redistributes it around its smallest key;
+  each item moves to a lower bucket at most once per bit of its key, so the
+  amortized cost per item is O(log C) for keys within C of each other, with
+  no comparisons between items.
+  """
+
+  #------------------------------ nonpublic behaviors ------------------------------
+  def _bucket(self, key):
+    """Return the index of the bucket for key (relative to the last removed key)."""
+    j = (key ^ self._last).bit_length()
+    while len(self._buckets) <= j:
+      self._buckets.append([])
+    return j
+
+  def _first_bucket(self):
+    """Return the index of the first nonempty bucket (queue must be nonempty)."""
+    j = 0
+    while not self._buckets[j]:
+      j += 1
+    return j
+
+  #------------------------------ public behaviors ------------------------------
+  def __init__(self):
+    """Create a new empty Priority Queue."""
+    self._buckets = [[]]
+    self._last = 0                     # key of the last removed item (0 at start)
+    self._size = 0
+
+  def __len__(self):
+    """Return the number of items in the priority queue."""
+    return self._size
+
+  def add(self, key, value):
+    """Add a key-value pair.
+
+    Raise ValueError if key is smaller than the last removed key.
+    """
+    if not isinstance(key, int):
+      raise TypeError('key must be an integer')
+    if key < self._last:
+      raise ValueError('key smaller than the last removed key')
+    self._buckets[self._bucket(key)].append(self._Item(key, value))
+    self._size += 1
+
+  def min(self):
+    """Return but do not remove (k,v) tuple with minimum key.
+
+    Raise Empty exception if empty.
+    """
+    if self.is_empty():
+      raise Empty('Priority queue is empty.')
+    item = min(self._buckets[self._first_bucket()])
+    return (item._key, item._value)
+
+  def remove_min(self):
+    """Remove and return (k,v) tuple with minimum key.
+
+    Raise Empty exception if empty.
+    """
+    if self.is_empty():
+      raise Empty('Priority queue is empty.')
+    if not self._buckets[0]:
+      j = self._first_bucket()
+      items = self._buckets[j]
+      self._buckets[j] = []
+      self._last = min(items)._key     # new reference point
+      for item in items:               # every item moves to a lower bucket
+        self._buckets[self._bucket(item._key)].append(item)
+    item = self._buckets[0].pop()      # bucket 0 holds keys equal to the last removed
+    self._size -= 1
+    return (item._key, item._value)
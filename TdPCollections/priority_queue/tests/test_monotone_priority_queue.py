@@ -0,0 +1,56 @@
+import random
+import unittest
+from TdPCollections.priority_queue.bucket_priority_queue import BucketPriorityQueue, Empty
+from TdPCollections.priority_queue.radix_heap_priority_queue import RadixHeapPriorityQueue
+from TdPCollections.priority_queue.radix_heap_priority_queue import Empty as RadixEmpty
+
+class TestMonotonePriorityQueue(unittest.TestCase):
+    def simulate(self, pq, span, steps=2000, seed=8):
+        """Interleave adds and removals with monotone keys and check the order."""
+        rng = random.Random(seed)
+        current = 0
+        pending = []
+        for _ in range(steps):
+            if pending and rng.random() < 0.45:
+                key, value = pq.remove_min()
+                self.assertEqual(key, min(pending))
+                pending.remove(key)
+                self.assertGreaterEqual(key, current)
+                current = key
+            else:
+                key = current + rng.randint(0, span)
+                pq.add(key, 'v%d' % key)
+                pending.append(key)
+            self.assertEqual(len(pq), len(pending))
+            if pending:
+                self.assertEqual(pq.min()[0], min(pending))
+
+    def test_bucket_queue(self):
+        self.simulate(BucketPriorityQueue(10), 10)
+        pq = BucketPriorityQueue(3)
+        with self.assertRaises(Empty):
+            pq.remove_min()
+        pq.add(2, 'a')
+        self.assertEqual(pq.remove_min(), (2, 'a'))
+        with self.assertRaises(ValueError):
+            pq.add(1, 'b')              # below the last removed key
+        with self.assertRaises(ValueError):
+            pq.add(6, 'c')              # beyond the window
+        with self.assertRaises(TypeError):
+            pq.add(2.5, 'd')
+
+    def test_radix_heap(self):
+        self.simulate(RadixHeapPriorityQueue(), 10 ** 6)
+        pq = RadixHeapPriorityQueue()
+        with self.assertRaises(RadixEmpty):
+            pq.min()
+        pq.add(5, 'a')
+        pq.add(5, 'b')
+        self.assertEqual(pq.remove_min()[0], 5)
+        with self.assertRaises(ValueError):
+            pq.add(4, 'c')
+        self.assertEqual(pq.remove_min()[0], 5)
+        self.assertTrue(pq.is_empty())
+
+if __name__ == '__main__':
+    unittest.main()